@@ -0,0 +1,128 @@
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+from utils.logger import Logger
+
+try:
+    from PIL import Image
+except ImportError:
+    # Pillow is optional; without it images are written exactly as captured
+    Image = None
+
+logger = Logger.get_logger(__name__)
+
+class ArtifactWriter:
+    """Writes screenshot bytes to disk on a background thread, deduplicated by content hash"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_queue=32, compress=False, max_width=None):
+        """
+        Args:
+            max_queue (int): Pending writes allowed before submit() blocks
+            compress (bool): Re-encode PNGs with maximum compression (needs Pillow)
+            max_width (int): Downscale images wider than this many pixels (needs Pillow)
+        """
+        if (compress or max_width) and Image is None:
+            logger.warning("Pillow is not installed, screenshots are written without compression or scaling")
+        self.compress = compress
+        self.max_width = max_width
+        self.written = {}
+        self.duplicates = {}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def instance(cls):
+        """Return the process-wide writer, creating it with defaults if needed"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def configure(cls, **kwargs):
+        """Replace the process-wide writer with one using the given settings"""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.close()
+            cls._instance = cls(**kwargs)
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls):
+        """Flush and stop the process-wide writer, if one was started"""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.close()
+                cls._instance = None
+
+    def submit(self, data, path):
+        """
+        Queue image bytes for writing; only hashing happens on the calling thread
+        Args:
+            data (bytes): PNG bytes, e.g. from driver.get_screenshot_as_png()
+            path (str): Where the image should be written
+        Returns:
+            str: Path the image will be available at; an earlier file for duplicate content
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            existing = self.written.get(digest)
+            if existing is not None:
+                self.duplicates[path] = existing
+                return existing
+            self.written[digest] = path
+
+        self._queue.put((data, path))
+        return path
+
+    def flush(self):
+        """Block until every queued artifact is on disk"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes, record duplicates next to the images and stop the thread"""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+        if self.duplicates:
+            directories = {os.path.dirname(path) for path in self.duplicates}
+            for directory in directories:
+                entries = {os.path.basename(requested): stored for requested, stored in self.duplicates.items()
+                           if os.path.dirname(requested) == directory}
+                with open(os.path.join(directory, "duplicates.json"), "w") as f:
+                    json.dump(entries, f, indent=2)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                data, path = item
+                self._write(data, path)
+            except Exception as e:
+                logger.error(f"Failed to write artifact: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, data, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if Image is not None and (self.compress or self.max_width) and path.endswith(".png"):
+            image = Image.open(io.BytesIO(data))
+            if self.max_width and image.width > self.max_width:
+                height = round(image.height * self.max_width / image.width)
+                image = image.resize((self.max_width, height))
+            image.save(path, format="PNG", optimize=self.compress)
+            return
+
+        with open(path, "wb") as f:
+            f.write(data)
@@ -0,0 +1,71 @@
+import os
+from datetime import datetime
+
+class Artifacts:
+    """Worker-aware locations for logs, screenshots and reports"""
+
+    # Set by the parallel runner for every worker process it starts
+    WORKER_ENV = "TEST_WORKER_ID"
+    RUN_ENV = "TEST_RUN_ID"
+
+    _run_id = None
+
+    @staticmethod
+    def worker_id():
+        """
+        Return the id of the current worker process
+        Returns:
+            str: "gw0", "gw1", ... for parallel workers, "main" for a serial run
+        """
+        return (os.environ.get(Artifacts.WORKER_ENV)
+                or os.environ.get("PYTEST_XDIST_WORKER")
+                or "main")
+
+    @staticmethod
+    def is_worker():
+        """Check if this process is a worker started by the parallel runner"""
+        return Artifacts.WORKER_ENV in os.environ
+
+    @staticmethod
+    def run_id():
+        """
+        Return the id shared by every process of the current run
+        Returns:
+            str: Timestamp of the run start
+        """
+        if Artifacts._run_id is None:
+            Artifacts._run_id = os.environ.get(Artifacts.RUN_ENV) or Artifacts.timestamp()
+        return Artifacts._run_id
+
+    @staticmethod
+    def timestamp():
+        """Return a timestamp with microsecond resolution, safe for file names"""
+        return datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+
+    @staticmethod
+    def directory(kind):
+        """
+        Return (and create) the directory for one artifact kind of this worker
+        Args:
+            kind (str): Artifact kind, e.g. 'logs', 'screenshots' or 'reports'
+        Returns:
+            str: Path like 'screenshots/gw0'
+        """
+        path = os.path.join(kind, Artifacts.worker_id())
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def path(kind, name, extension):
+        """
+        Build a unique file path for a new artifact
+        Args:
+            kind (str): Artifact kind, e.g. 'screenshots'
+            name (str): Descriptive file name prefix
+            extension (str): File extension without the dot
+        Returns:
+            str: Path like 'screenshots/gw0/FAILED_test_x_20240101_120000_123456.png'
+        """
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        filename = f"{safe_name}_{Artifacts.timestamp()}.{extension}"
+        return os.path.join(Artifacts.directory(kind), filename)
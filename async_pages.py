@@ -0,0 +1,295 @@
+import asyncio
+import time
+from urllib.parse import urljoin
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from pages.home_page import HomePage
+from pages.cart_page import CartPage
+from utils.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+class AsyncBasePage:
+    """
+    Base class for page objects driven through an AsyncWebDriver. Locators, URLs and in-page
+    scripts are the sync page objects' own, so both variants always target the same markup.
+    """
+    
+    TIMEOUT = BasePage.TIMEOUT
+    
+    # Seconds between two checks while waiting; sleeping hands the loop to the other sessions
+    POLL_FREQUENCY = 0.1
+    
+    def __init__(self, driver):
+        self.driver = driver
+    
+    async def wait_for_element(self, locator, state="present", timeout=None):
+        """
+        Wait for an element and log how long it took
+        Args:
+            locator (tuple): Element locator
+            state (str): 'present', 'visible' or 'clickable'
+            timeout (float): Seconds before giving up, defaults to TIMEOUT
+        Returns:
+            AsyncElement: The matching element
+        """
+        timeout = self.TIMEOUT if timeout is None else timeout
+        started = time.perf_counter()
+        while True:
+            try:
+                elements = await self.driver.find_elements(*locator)
+                if elements and await self._has_state(elements[0], state):
+                    logger.debug(f"Wait for {state} {locator} took {time.perf_counter() - started:.3f}s")
+                    return elements[0]
+            except StaleElementReferenceException:
+                pass
+            if time.perf_counter() - started >= timeout:
+                logger.debug(f"Wait for {state} {locator} timed out after {time.perf_counter() - started:.3f}s")
+                raise TimeoutException(f"{state} {locator} not met after {timeout}s")
+            await asyncio.sleep(self.POLL_FREQUENCY)
+    
+    async def find_element(self, locator):
+        """Find and return element"""
+        return await self.wait_for_element(locator, "present")
+    
+    async def find_elements(self, locator):
+        """Find and return multiple elements, waiting for at least one"""
+        await self.wait_for_element(locator, "present")
+        return await self.driver.find_elements(*locator)
+    
+    async def navigate(self, url):
+        """Load a URL"""
+        await self.driver.get(url)
+    
+    async def click(self, locator):
+        """Click on element"""
+        element = await self.wait_for_element(locator, "clickable")
+        await element.click()
+    
+    async def enter_text(self, locator, text):
+        """Enter text into input field"""
+        element = await self.find_element(locator)
+        await element.clear()
+        await element.send_keys(text)
+    
+    async def fill_form(self, values, typed=False):
+        """
+        Fill several fields at once, like BasePage.fill_form
+        Args:
+            values (dict): Locator -> text, in the order the fields should be filled
+            typed (bool): Type every key through enter_text() instead
+        """
+        if typed:
+            for locator, text in values.items():
+                await self.enter_text(locator, text)
+            return
+        
+        fields = [[BasePage._to_query(locator), str(text)] for locator, text in values.items()]
+        missing = await self.driver.execute_script(BasePage.FILL_FORM_SCRIPT, fields)
+        if missing:
+            locators = list(values)
+            for position in missing:
+                await self.find_element(locators[position])
+            await self.driver.execute_script(BasePage.FILL_FORM_SCRIPT, [fields[position] for position in missing])
+    
+    async def get_text(self, locator):
+        """Get text from element"""
+        element = await self.find_element(locator)
+        return await element.text()
+    
+    async def is_displayed(self, locator, timeout=TIMEOUT):
+        """Check if element is displayed"""
+        try:
+            await self.wait_for_element(locator, "visible", timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    async def find_optional(self, locator):
+        """Return the element if it is on the page, None otherwise, without waiting for it"""
+        elements = await self.driver.find_elements(*locator)
+        return elements[0] if elements else None
+    
+    async def read_items(self, item_locator, fields, container_locator=None):
+        """
+        Read structured data for every matching item in one round-trip, like BasePage.read_items
+        Args:
+            item_locator (tuple): Locator of the repeated item elements
+            fields (dict): Field name -> (locator relative to the item, 'text' or attribute name)
+            container_locator (tuple): Element to wait for before reading
+        Returns:
+            list: One dict per item
+        """
+        if container_locator is not None:
+            await self.find_element(container_locator)
+        return await self.driver.execute_script(BasePage.READ_ITEMS_SCRIPT,
+                                                BasePage._items_spec(item_locator, fields))
+    
+    async def get_current_url(self):
+        """Return current page URL"""
+        return await self.driver.current_url()
+    
+    @staticmethod
+    async def _has_state(element, state):
+        if state == "present":
+            return True
+        if not await element.is_displayed():
+            return False
+        return state == "visible" or await element.is_enabled()
+
+
+class AsyncLoginPage(AsyncBasePage):
+    """Async variant of LoginPage"""
+    
+    async def open(self):
+        """Load the login page"""
+        await self.navigate(LoginPage.URL)
+        return self
+    
+    async def login(self, username, password, typed=False):
+        """
+        Complete login process
+        Args:
+            username (str): Login user
+            password (str): Login password
+            typed (bool): Type the credentials key by key instead of filling the form in one script
+        """
+        await self.fill_form({LoginPage.USERNAME_INPUT: username, LoginPage.PASSWORD_INPUT: password}, typed=typed)
+        await self.click(LoginPage.LOGIN_BUTTON)
+    
+    async def get_error_message(self):
+        """Get error message text"""
+        return await self.get_text(LoginPage.ERROR_MESSAGE)
+    
+    async def is_error_displayed(self):
+        """Check if error message is displayed"""
+        return await self.is_displayed(LoginPage.ERROR_MESSAGE)
+    
+    async def is_login_page_loaded(self):
+        """Verify login page is loaded"""
+        return await self.is_displayed(LoginPage.LOGIN_BUTTON)
+
+
+class AsyncHomePage(AsyncBasePage):
+    """Async variant of HomePage"""
+    
+    async def is_home_page_loaded(self):
+        """Verify home page is loaded"""
+        return await self.is_displayed(HomePage.PAGE_TITLE)
+    
+    async def get_page_title(self):
+        """Get page title text"""
+        return await self.get_text(HomePage.PAGE_TITLE)
+    
+    async def get_inventory_snapshot(self):
+        """Get name, price, button id and title link id of every product in one round-trip"""
+        return await self.read_items(
+            HomePage.PRODUCT_ITEMS,
+            {
+                "name": (HomePage.PRODUCT_NAME, "text"),
+                "price": (HomePage.PRODUCT_PRICE, "text"),
+                "button_id": (HomePage.PRODUCT_BUTTON, "id"),
+                "link_id": (HomePage.PRODUCT_TITLE_LINK, "id"),
+            },
+            container_locator=HomePage.INVENTORY_LIST,
+        )
+    
+    async def get_product_index(self):
+        """Map product name to item id, button id, slug and price"""
+        return {row["name"]: HomePage.product_entry(row) for row in await self.get_inventory_snapshot()}
+    
+    async def get_product_names(self):
+        """Get list of all product names"""
+        return [item["name"] for item in await self.get_inventory_snapshot()]
+    
+    async def add_product_to_cart_by_name(self, product_name):
+        """Add specific product to cart by name"""
+        product = (await self.get_product_index()).get(product_name)
+        if product is None:
+            raise ValueError(f"No product named {product_name!r} on the page")
+        await self.click((By.ID, f"add-to-cart-{product['slug']}"))
+    
+    async def get_cart_badge_count(self):
+        """Get shopping cart item count, "0" when the badge is not shown"""
+        badge = await self.find_optional(HomePage.SHOPPING_CART_BADGE)
+        return await badge.text() if badge is not None else "0"
+    
+    async def click_shopping_cart(self):
+        """Click shopping cart icon"""
+        await self.click(HomePage.SHOPPING_CART_LINK)
+    
+    async def logout(self):
+        """Logout from application"""
+        await self.click(HomePage.HAMBURGER_MENU)
+        await self.click(HomePage.LOGOUT_LINK)
+
+
+class AsyncCartPage(AsyncBasePage):
+    """Async variant of CartPage"""
+    
+    async def open(self, path=CartPage.CART_PATH):
+        """Load the cart (or a checkout step) of the current session"""
+        await self.navigate(urljoin(LoginPage.URL, path))
+        return self
+    
+    async def is_cart_page_loaded(self):
+        """Verify cart page is loaded"""
+        return await self.is_displayed(CartPage.PAGE_TITLE)
+    
+    async def get_cart_snapshot(self):
+        """Get name, price, quantity and button id of every cart item in one round-trip"""
+        return await self.read_items(
+            CartPage.CART_ITEMS,
+            {
+                "name": (CartPage.CART_ITEM_NAMES, "text"),
+                "price": (CartPage.CART_ITEM_PRICES, "text"),
+                "quantity": (CartPage.CART_QUANTITY, "text"),
+                "button_id": (CartPage.CART_ITEM_BUTTON, "id"),
+                "link_id": (CartPage.CART_ITEM_LINK, "id"),
+            },
+            container_locator=CartPage.CART_LIST,
+        )
+    
+    async def get_cart_item_names(self):
+        """Get list of item names in cart"""
+        return [item["name"] for item in await self.get_cart_snapshot()]
+    
+    async def remove_item_by_name(self, product_name):
+        """Remove specific item from cart"""
+        items = {row["name"]: HomePage.product_entry(row) for row in await self.get_cart_snapshot()}
+        if product_name not in items:
+            raise ValueError(f"No item named {product_name!r} in the cart")
+        await self.click((By.ID, f"remove-{items[product_name]['slug']}"))
+    
+    async def click_checkout(self):
+        """Click checkout button"""
+        await self.click(CartPage.CHECKOUT_BUTTON)
+    
+    async def fill_checkout_information(self, first_name, last_name, postal_code, typed=False):
+        """Fill checkout information form"""
+        await self.fill_form(
+            {CartPage.FIRST_NAME: first_name, CartPage.LAST_NAME: last_name, CartPage.POSTAL_CODE: postal_code},
+            typed=typed,
+        )
+    
+    async def click_continue_checkout(self):
+        """Click continue button on checkout form"""
+        await self.click(CartPage.CONTINUE_BUTTON)
+    
+    async def get_checkout_error_message(self):
+        """Get checkout form error message"""
+        return await self.get_text(CartPage.ERROR_MESSAGE)
+    
+    async def get_total(self):
+        """Get total from checkout overview"""
+        return await self.get_text(CartPage.TOTAL)
+    
+    async def click_finish(self):
+        """Click finish button"""
+        await self.click(CartPage.FINISH_BUTTON)
+    
+    async def is_checkout_complete(self):
+        """Check if order is complete"""
+        return await self.is_displayed(CartPage.COMPLETE_HEADER)
\ No newline at end of file
@@ -0,0 +1,387 @@
+import asyncio
+import base64
+import json
+import socket
+from urllib.parse import urlparse
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from utils.driver_setup import DriverSetup
+from utils.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+# W3C key of element references in requests and responses
+ELEMENT_KEY = "element-6066-11e4-a6ae-4e4fb5e5b4f7"
+
+def w3c_locator(by, value):
+    """
+    Translate a Selenium (By, value) locator into a W3C location strategy, as the sync client does
+    Returns:
+        tuple: (strategy, value) accepted by the W3C find element endpoints
+    """
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{value}"
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+    return by, value
+
+
+class AsyncConnectionPool:
+    """
+    Keep-alive HTTP/1.1 connections to one WebDriver server, shared by every session on an event loop.
+    Requests wait for a free connection when all of them are busy.
+    """
+
+    # Requests the W3C protocol allows to be sent twice; anything else may already have acted on the page
+    IDEMPOTENT_METHODS = ("GET", "DELETE")
+
+    def __init__(self, host, port, maxsize=32, timeout=120):
+        """
+        Args:
+            host (str): Driver server host
+            port (int): Driver server port
+            maxsize (int): Connections kept open at most
+            timeout (float): Seconds a request may take
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle = []
+        self._slots = asyncio.Semaphore(maxsize)
+
+    async def request(self, method, path, payload=None):
+        """
+        Send one request over a pooled connection
+        Args:
+            method (str): HTTP method
+            path (str): Request path, e.g. /session/<id>/url
+            payload (dict): JSON body
+        Returns:
+            tuple: (HTTP status, response body as text)
+        """
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        async with self._slots:
+            connection = self._take_idle()
+            reused = connection is not None
+            while True:
+                if connection is None:
+                    connection = await self._connect()
+                progress = {"sent": False, "answered": False}
+                try:
+                    status, headers, data = await asyncio.wait_for(
+                        self._exchange(connection, method, path, body, progress), self.timeout)
+                    break
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection[1].close()
+                    connection = None
+                    # The server may have closed an idle connection. Resending is only safe when it cannot
+                    # have run the command: the request never went out, or repeating it changes nothing
+                    repeatable = not progress["sent"] or method.upper() in self.IDEMPOTENT_METHODS
+                    if not reused or progress["answered"] or not repeatable:
+                        raise
+                    reused = False
+                except BaseException:
+                    connection[1].close()
+                    raise
+
+            if headers.get("connection", "").lower() == "close":
+                connection[1].close()
+            else:
+                self._idle.append(connection)
+        return status, data.decode("utf-8")
+
+    async def close(self):
+        """Close every idle connection"""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _take_idle(self):
+        """Pop an idle connection, dropping those the server has already closed"""
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return None
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        # Commands are small request/response pairs; waiting to coalesce them only adds latency
+        writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return reader, writer
+
+    async def _exchange(self, connection, method, path, body, progress):
+        reader, writer = connection
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n".encode("ascii") + body
+        )
+        await writer.drain()
+        progress["sent"] = True
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the driver")
+        progress["answered"] = True
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if not size:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            data = b"".join(chunks)
+        else:
+            data = await reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers, data
+
+
+class AsyncElement:
+    """Element reference of an AsyncWebDriver session"""
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+
+    def _path(self, command=""):
+        return f"/element/{self.id}" + (f"/{command}" if command else "")
+
+    async def click(self):
+        await self.driver.execute("POST", self._path("click"), {})
+
+    async def clear(self):
+        await self.driver.execute("POST", self._path("clear"), {})
+
+    async def send_keys(self, text):
+        text = str(text)
+        await self.driver.execute("POST", self._path("value"), {"text": text, "value": list(text)})
+
+    async def text(self):
+        return await self.driver.execute("GET", self._path("text"))
+
+    async def tag_name(self):
+        return await self.driver.execute("GET", self._path("name"))
+
+    async def get_attribute(self, name):
+        return await self.driver.execute("GET", self._path(f"attribute/{name}"))
+
+    async def get_property(self, name):
+        return await self.driver.execute("GET", self._path(f"property/{name}"))
+
+    async def is_displayed(self):
+        return await self.driver.execute("GET", self._path("displayed"))
+
+    async def is_enabled(self):
+        return await self.driver.execute("GET", self._path("enabled"))
+
+    async def find_element(self, by, value):
+        strategy, selector = w3c_locator(by, value)
+        result = await self.driver.execute("POST", self._path("element"), {"using": strategy, "value": selector})
+        return AsyncElement(self.driver, result[ELEMENT_KEY])
+
+    async def find_elements(self, by, value):
+        strategy, selector = w3c_locator(by, value)
+        result = await self.driver.execute("POST", self._path("elements"), {"using": strategy, "value": selector})
+        return [AsyncElement(self.driver, item[ELEMENT_KEY]) for item in result]
+
+    def __repr__(self):
+        return f"AsyncElement({self.id})"
+
+
+class AsyncWebDriver:
+    """
+    One WebDriver session spoken to over the W3C protocol from asyncio. Every command is a
+    coroutine, so one event loop can drive many sessions while their commands are in flight.
+    Errors are raised as the same selenium exceptions the sync client raises.
+    """
+
+    # Capability flags the page objects check, as on the sync drivers
+    supports_javascript = True
+    supports_async_scripts = True
+
+    def __init__(self, pool, session_id, capabilities):
+        """
+        Args:
+            pool (AsyncConnectionPool): Connections to the driver server
+            session_id (str): Session created by start()
+            capabilities (dict): Capabilities returned by the driver
+        """
+        self.pool = pool
+        self.session_id = session_id
+        self.capabilities = capabilities
+
+    @classmethod
+    async def start(cls, pool, capabilities):
+        """
+        Create a new session
+        Args:
+            pool (AsyncConnectionPool): Connections to the driver server
+            capabilities (dict): W3C capabilities, e.g. from Options.to_capabilities()
+        Returns:
+            AsyncWebDriver: The new session
+        """
+        value = await cls._request(pool, "POST", "/session", {"capabilities": {"alwaysMatch": capabilities}})
+        return cls(pool, value["sessionId"], value["capabilities"])
+
+    async def execute(self, method, command, payload=None):
+        """
+        Run one session command
+        Args:
+            method (str): HTTP method
+            command (str): Path below /session/<id>, e.g. /url
+            payload (dict): JSON body
+        Returns:
+            The command's value, with element references wrapped in AsyncElement
+        """
+        value = await self._request(self.pool, method, f"/session/{self.session_id}{command}", payload)
+        return self._unwrap(value)
+
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def current_url(self):
+        return await self.execute("GET", "/url")
+
+    async def title(self):
+        return await self.execute("GET", "/title")
+
+    async def page_source(self):
+        return await self.execute("GET", "/source")
+
+    async def find_element(self, by, value):
+        strategy, selector = w3c_locator(by, value)
+        return await self.execute("POST", "/element", {"using": strategy, "value": selector})
+
+    async def find_elements(self, by, value):
+        strategy, selector = w3c_locator(by, value)
+        return await self.execute("POST", "/elements", {"using": strategy, "value": selector})
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": self._wrap(list(args))})
+
+    async def execute_async_script(self, script, *args):
+        return await self.execute("POST", "/execute/async", {"script": script, "args": self._wrap(list(args))})
+
+    async def execute_cdp_cmd(self, cmd, params):
+        return await self.execute("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params})
+
+    async def get_cookies(self):
+        return await self.execute("GET", "/cookie")
+
+    async def add_cookie(self, cookie):
+        await self.execute("POST", "/cookie", {"cookie": cookie})
+
+    async def delete_all_cookies(self):
+        await self.execute("DELETE", "/cookie")
+
+    async def get_screenshot_as_png(self):
+        return base64.b64decode(await self.execute("GET", "/screenshot"))
+
+    async def quit(self):
+        await self.execute("DELETE", "")
+
+    @staticmethod
+    async def _request(pool, method, path, payload):
+        status, body = await pool.request(method, path, payload)
+        if status >= 400:
+            # Same mapping of W3C error codes to exceptions as the sync client
+            ErrorHandler().check_response({"status": status, "value": body})
+        return json.loads(body)["value"] if body else None
+
+    def _wrap(self, value):
+        if isinstance(value, AsyncElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value and len(value) == 1:
+                return AsyncElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+
+class AsyncDriverService:
+    """
+    One chromedriver process and a connection pool to it; every session an event loop
+    opens through new_session() shares both.
+    """
+
+    def __init__(self, maxsize=32):
+        """
+        Args:
+            maxsize (int): Connections kept open to chromedriver at most
+        """
+        self.maxsize = maxsize
+        self.service = None
+        self.pool = None
+        self._browser_path = None
+
+    def start(self):
+        """Launch chromedriver"""
+        paths = DriverSetup.resolve_binary_paths()
+        self._browser_path = paths.get("browser_path")
+        self.service = Service(paths["driver_path"])
+        self.service.start()
+        url = urlparse(self.service.service_url)
+        self.pool = AsyncConnectionPool(url.hostname, url.port, maxsize=self.maxsize)
+        logger.info(f"Async driver service listening on {self.service.service_url}")
+        return self
+
+    async def new_session(self, headless=True, fast_startup=False, network_policy="full"):
+        """
+        Open a browser session with the same options as DriverSetup.get_driver
+        Args:
+            headless (bool): Run browser in headless mode
+            fast_startup (bool): Use the trimmed start-up flags
+            network_policy (str): Name from DriverSetup.NETWORK_POLICIES
+        Returns:
+            AsyncWebDriver: The new session
+        """
+        options = DriverSetup.build_options(headless=headless, fast_startup=fast_startup,
+                                            network_policy=network_policy)
+        if fast_startup and self._browser_path:
+            options.binary_location = self._browser_path
+        driver = await AsyncWebDriver.start(self.pool, options.to_capabilities())
+
+        blocked_urls = DriverSetup.NETWORK_POLICIES[network_policy]["blocked_urls"]
+        if blocked_urls:
+            await driver.execute_cdp_cmd("Network.enable", {})
+            await driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+        return driver
+
+    async def close(self):
+        """Close the pooled connections and stop chromedriver"""
+        if self.pool is not None:
+            await self.pool.close()
+        if self.service is not None:
+            self.service.stop()
@@ -1,62 +1,426 @@
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-import os
-from datetime import datetime
-
-class BasePage:
-    """Base class for all page objects"""
-    
-    def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
-    
-    def find_element(self, locator):
-        """Find and return element"""
-        return self.wait.until(EC.presence_of_element_located(locator))
-    
-    def find_elements(self, locator):
-        """Find and return multiple elements"""
-        return self.wait.until(EC.presence_of_all_elements_located(locator))
-    
-    def click(self, locator):
-        """Click on element"""
-        element = self.wait.until(EC.element_to_be_clickable(locator))
-        element.click()
-    
-    def enter_text(self, locator, text):
-        """Enter text into input field"""
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
-    
-    def get_text(self, locator):
-        """Get text from element"""
-        return self.find_element(locator).text
-    
-    def is_displayed(self, locator, timeout=10):
-        """Check if element is displayed"""
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.visibility_of_element_located(locator))
-            return True
-        except TimeoutException:
-            return False
-    
-    def take_screenshot(self, name):
-        """Take screenshot and save to screenshots folder"""
-        if not os.path.exists('screenshots'):
-            os.makedirs('screenshots')
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'screenshots/{name}_{timestamp}.png'
-        self.driver.save_screenshot(filename)
-        return filename
-    
-    def get_current_url(self):
-        """Return current page URL"""
-        return self.driver.current_url
-    
-    def get_page_title(self):
-        """Return page title"""
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from utils.artifacts import Artifacts
+from utils.artifact_writer import ArtifactWriter
+from utils.command_recorder import CommandRecorder
+from utils.element_cache import ElementCache
+from utils.logger import Logger
+from utils.wait_strategy import PollingWaitStrategy, locator_to_query
+import logging
+import time
+
+logger = Logger.get_logger(__name__)
+
+class BasePage:
+    """Base class for all page objects"""
+    
+    # Reads one row per item element in a single script execution.
+    # arguments[0] = {item: query, fields: {name: {query, attribute}}}, where a query is {css} or {xpath}
+    READ_ITEMS_SCRIPT = """
+        var spec = arguments[0];
+        function queryAll(root, query) {
+            if (query.css) {
+                return Array.prototype.slice.call(root.querySelectorAll(query.css));
+            }
+            var result = document.evaluate(query.xpath, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) {
+                nodes.push(result.snapshotItem(i));
+            }
+            return nodes;
+        }
+        return queryAll(document, spec.item).map(function(item) {
+            var row = {};
+            Object.keys(spec.fields).forEach(function(name) {
+                var field = spec.fields[name];
+                var element = queryAll(item, field.query)[0];
+                if (!element) {
+                    row[name] = null;
+                } else if (field.attribute === 'text') {
+                    row[name] = element.innerText.trim();
+                } else {
+                    row[name] = element.getAttribute(field.attribute);
+                }
+            });
+            return row;
+        });
+    """
+    
+    # Returns {token, rows} for index_items(). rows is null while the page still holds the index
+    # the caller has cached under arguments[1]; otherwise the items are read again and the page
+    # is stamped with a new token. Adding or removing items (a new document, or a change to the
+    # items' parent) drops the token, while attribute and text changes inside items keep it.
+    # arguments[0] = index name, arguments[1] = cached token, arguments[2] = READ_ITEMS_SCRIPT spec
+    INDEX_ITEMS_SCRIPT = """
+        var name = arguments[0], cached = arguments[1], spec = arguments[2];
+        var indexes = window.__itemIndexes = window.__itemIndexes || {};
+        var state = indexes[name];
+        if (state && !state.dirty && state.token === cached) {
+            return {token: cached, rows: null};
+        }
+        var rows = (function() {
+    """ + READ_ITEMS_SCRIPT + """
+        }).apply(null, [spec]);
+        var first = queryFirst(spec.item);
+        if (!first) {
+            delete indexes[name];
+            return {token: null, rows: rows};
+        }
+        state = indexes[name] = {token: Date.now().toString(36) + Math.random().toString(36).slice(2), dirty: false};
+        new MutationObserver(function(mutations, observer) {
+            state.dirty = true;
+            observer.disconnect();
+        }).observe(first.parentNode, {childList: true});
+        return {token: state.token, rows: rows};
+        function queryFirst(query) {
+            if (query.css) {
+                return document.querySelector(query.css);
+            }
+            return document.evaluate(query.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+                .singleNodeValue;
+        }
+    """
+    
+    # Sets several form fields in one script execution, the way a user's input would: through the
+    # prototype's value setter (React tracks the instance one) followed by bubbling input and change events.
+    # arguments[0] = [[query, value], ...]; returns the positions of fields that are not on the page yet
+    FILL_FORM_SCRIPT = """
+        var missing = [];
+        arguments[0].forEach(function(field, position) {
+            var query = field[0], value = field[1], element;
+            if (query.css) {
+                element = document.querySelector(query.css);
+            } else {
+                element = document.evaluate(query.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+                    .singleNodeValue;
+            }
+            if (!element) {
+                missing.push(position);
+                return;
+            }
+            var prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+                : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+            element.dispatchEvent(new Event('input', {bubbles: true}));
+            element.dispatchEvent(new Event('change', {bubbles: true}));
+        });
+        return missing;
+    """
+    
+    # Seconds an explicit wait may take before it fails
+    TIMEOUT = 10
+    
+    # Waits taking longer than this many seconds are logged at INFO, so slow waits show in the run log
+    SLOW_WAIT = 1.0
+    
+    # Engine used to wait for single elements; swapped for ObserverWaitStrategy with --wait-strategy observer
+    wait_strategy = PollingWaitStrategy()
+    
+    # Reuse element handles found earlier on the same page; switched off with --no-element-cache
+    cache_elements = True
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.wait = WebDriverWait(driver, self.TIMEOUT)
+    
+    def wait_until(self, condition, description, timeout=None):
+        """
+        Run an explicit wait and log how long it actually took
+        Args:
+            condition (callable): Expected condition taking the driver
+            description (str): What is being waited for, used in the log line
+            timeout (float): Seconds before giving up, defaults to TIMEOUT
+        Returns:
+            The truthy value returned by the condition
+        """
+        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        started = time.perf_counter()
+        try:
+            with CommandRecorder.waiting(self.driver):
+                result = wait.until(condition) if self._has_javascript() else self._check_once(condition, description)
+        except TimeoutException:
+            self._log_wait(f"Wait for {description} timed out after", started)
+            raise
+        self._log_wait(f"Wait for {description} took", started)
+        return result
+    
+    def wait_for_element(self, locator, state="present", timeout=None):
+        """
+        Wait for an element through the configured wait strategy and log how long it took
+        Args:
+            locator (tuple): Element locator
+            state (str): 'present', 'visible' or 'clickable'
+            timeout (float): Seconds before giving up, defaults to TIMEOUT
+        Returns:
+            WebElement: The matching element
+        """
+        if not self._has_javascript():
+            return self.wait_until(PollingWaitStrategy.CONDITIONS[state](locator), f"{state} {locator}", timeout)
+        
+        timeout = self.TIMEOUT if timeout is None else timeout
+        started = time.perf_counter()
+        try:
+            element = self.wait_strategy.wait_for(self.driver, locator, state, timeout)
+        except TimeoutException:
+            self._log_wait(f"Wait for {state} {locator} timed out after", started)
+            raise
+        self._log_wait(f"Wait for {state} {locator} took", started)
+        return element
+    
+    def find_element(self, locator):
+        """Find and return element, reusing the handle found earlier on the same page"""
+        if not self.cache_elements:
+            return self.wait_for_element(locator, "present")
+        cache = ElementCache.for_driver(self.driver)
+        element = cache.get(locator)
+        if element is None:
+            element = self.wait_for_element(locator, "present")
+            cache.put(locator, element)
+        return element
+    
+    def with_element(self, locator, action):
+        """
+        Run an action on the element, looking it up again once if the cached handle went stale
+        Args:
+            locator (tuple): Element locator
+            action (callable): Takes the WebElement
+        Returns:
+            The action's return value
+        """
+        try:
+            return action(self.find_element(locator))
+        except StaleElementReferenceException:
+            if not self.cache_elements:
+                raise
+            ElementCache.for_driver(self.driver).discard(locator)
+            return action(self.find_element(locator))
+    
+    def navigate(self, url):
+        """Load a URL, forgetting the element handles of the previous page"""
+        ElementCache.for_driver(self.driver).clear()
+        self.driver.get(url)
+    
+    def find_elements(self, locator):
+        """Find and return multiple elements"""
+        return self.wait_until(EC.presence_of_all_elements_located(locator), f"presence of all {locator}")
+    
+    def wait_for_page_settled(self):
+        """Wait until the current document has finished loading"""
+        if not self._has_javascript():
+            # The HTTP backend only returns from get() or click() with the whole document parsed
+            return
+        self.wait_until(
+            lambda driver: driver.execute_script("return document.readyState") == "complete",
+            "document ready"
+        )
+    
+    def find_optional(self, locator):
+        """
+        Return the element if it is on the settled page, None otherwise, without waiting for it
+        Args:
+            locator (tuple): Element locator
+        Returns:
+            WebElement: First matching element, or None
+        """
+        with CommandRecorder.waiting(self.driver):
+            self.wait_for_page_settled()
+            elements = self.driver.find_elements(*locator)
+        return elements[0] if elements else None
+    
+    def is_absent(self, locator, timeout=0):
+        """
+        Check that no element matches the locator
+        Args:
+            locator (tuple): Element locator
+            timeout (float): Seconds to wait for the element to go away; 0 checks the settled page once
+        Returns:
+            bool: True if no matching element is present
+        """
+        if not timeout:
+            return self.find_optional(locator) is None
+        try:
+            self.wait_until(lambda driver: not driver.find_elements(*locator), f"absence of {locator}", timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    def click(self, locator):
+        """Click on element"""
+        element = self.wait_for_element(locator, "clickable")
+        # The click may navigate or re-render, so no handle of this page can be trusted afterwards
+        ElementCache.for_driver(self.driver).clear()
+        element.click()
+    
+    def enter_text(self, locator, text):
+        """Enter text into input field"""
+        def _enter(element):
+            element.clear()
+            element.send_keys(text)
+        self.with_element(locator, _enter)
+    
+    def fill_form(self, values, typed=False):
+        """
+        Fill several fields at once
+        Args:
+            values (dict): Locator -> text, in the order the fields should be filled
+            typed (bool): Type every key through enter_text() instead, for tests of input handling
+        """
+        if typed or not self._has_javascript():
+            for locator, text in values.items():
+                self.enter_text(locator, text)
+            return
+        
+        fields = [[self._to_query(locator), str(text)] for locator, text in values.items()]
+        missing = self.driver.execute_script(self.FILL_FORM_SCRIPT, fields)
+        if missing:
+            # The form is still rendering: wait for the missing fields and fill only those
+            locators = list(values)
+            for position in missing:
+                self.find_element(locators[position])
+            self.driver.execute_script(self.FILL_FORM_SCRIPT, [fields[position] for position in missing])
+    
+    def get_text(self, locator):
+        """Get text from element"""
+        return self.with_element(locator, lambda element: element.text)
+    
+    def is_displayed(self, locator, timeout=TIMEOUT):
+        """Check if element is displayed"""
+        if self.cache_elements:
+            element = ElementCache.for_driver(self.driver).get(locator)
+            try:
+                if element is not None and element.is_displayed():
+                    return True
+            except StaleElementReferenceException:
+                ElementCache.for_driver(self.driver).discard(locator)
+        try:
+            element = self.wait_for_element(locator, "visible", timeout)
+        except TimeoutException:
+            return False
+        if self.cache_elements:
+            ElementCache.for_driver(self.driver).put(locator, element)
+        return True
+    
+    def read_items(self, item_locator, fields, container_locator=None):
+        """
+        Read structured data for every matching item in one WebDriver round-trip
+        Args:
+            item_locator (tuple): Locator of the repeated item elements
+            fields (dict): Field name -> (locator relative to the item, 'text' or attribute name)
+            container_locator (tuple): Element to wait for before reading, e.g. the list wrapper
+        Returns:
+            list: One dict per item, with None for fields missing from an item
+        """
+        if container_locator is not None:
+            self.find_element(container_locator)
+        
+        if not self._has_javascript():
+            return [
+                {name: self._read_field(item, locator, attribute) for name, (locator, attribute) in fields.items()}
+                for item in self.driver.find_elements(*item_locator)
+            ]
+        
+        spec = self._items_spec(item_locator, fields)
+        return self.driver.execute_script(self.READ_ITEMS_SCRIPT, spec)
+    
+    def index_items(self, name, item_locator, fields, key, container_locator=None, refresh=False):
+        """
+        Map every item on the current page by one of its fields, reusing the map until the page changes.
+        The map is kept per driver, so page objects created later on the same page share it; it is
+        rebuilt after a navigation or when items are added to or removed from the list.
+        Args:
+            name (str): Index name, e.g. 'products'
+            item_locator (tuple): Locator of the repeated item elements
+            fields (dict): Field name -> (locator relative to the item, 'text' or attribute name)
+            key (str): Field whose value keys the map, e.g. 'name'
+            container_locator (tuple): Element to wait for before the first read of a page
+            refresh (bool): Read the items again even if the cached map is still current
+        Returns:
+            dict: Key -> row dict, as returned by read_items()
+        """
+        indexes = getattr(self.driver, "_item_indexes", None)
+        if indexes is None:
+            indexes = self.driver._item_indexes = {}
+        token, index = indexes.get(name, (None, None))
+        
+        if not self._has_javascript():
+            # The HTTP backend replaces the whole document on every load, and nothing else changes it
+            if refresh or token != self.driver.page_loads:
+                rows = self.read_items(item_locator, fields, container_locator)
+                index = {row[key]: row for row in rows}
+                indexes[name] = (self.driver.page_loads, index)
+            return index
+        
+        spec = self._items_spec(item_locator, fields)
+        state = self.driver.execute_script(self.INDEX_ITEMS_SCRIPT, name, None if refresh else token, spec)
+        if state["token"] is None and container_locator is not None:
+            # Nothing matched yet: the list may still be rendering
+            self.find_element(container_locator)
+            state = self.driver.execute_script(self.INDEX_ITEMS_SCRIPT, name, None, spec)
+        if state["rows"] is not None:
+            index = {row[key]: row for row in state["rows"]}
+            indexes[name] = (state["token"], index)
+        return index
+    
+    def _log_wait(self, message, started):
+        """Log how long a wait took: at DEBUG normally, at INFO once it is slower than SLOW_WAIT"""
+        duration = time.perf_counter() - started
+        level = logging.INFO if duration > self.SLOW_WAIT else logging.DEBUG
+        logger.log(level, f"{message} {duration:.3f}s")
+    
+    def _has_javascript(self):
+        """False for drivers such as the browserless HTTP backend, whose pages never change on their own"""
+        return getattr(self.driver, "supports_javascript", True)
+    
+    def _check_once(self, condition, description):
+        """Evaluate a wait condition a single time, for pages that cannot change while waiting"""
+        try:
+            result = condition(self.driver)
+        except (NoSuchElementException, StaleElementReferenceException):
+            result = False
+        if not result:
+            raise TimeoutException(f"{description} not met on a static page")
+        return result
+    
+    @staticmethod
+    def _read_field(item, locator, attribute):
+        """Read one field of an item element without scripts, like READ_ITEMS_SCRIPT does"""
+        elements = item.find_elements(*locator)
+        if not elements:
+            return None
+        return elements[0].text.strip() if attribute == "text" else elements[0].get_attribute(attribute)
+    
+    @classmethod
+    def _items_spec(cls, item_locator, fields):
+        """Build the READ_ITEMS_SCRIPT argument for an item locator and its fields"""
+        return {
+            "item": cls._to_query(item_locator),
+            "fields": {
+                name: {"query": cls._to_query(locator, relative=True), "attribute": attribute}
+                for name, (locator, attribute) in fields.items()
+            },
+        }
+    
+    @staticmethod
+    def _to_query(locator, relative=False):
+        """Translate a (By, value) locator into a query the read script understands"""
+        query = locator_to_query(locator)
+        if query is None:
+            raise ValueError(f"Unsupported locator strategy for batched reads: {locator[0]}")
+        # Item-relative XPath must start from the item node
+        if relative and query.get("xpath", "").startswith("/"):
+            query["xpath"] = "." + query["xpath"]
+        return query
+    
+    def take_screenshot(self, name):
+        """Take screenshot and save it to this worker's screenshots folder in the background"""
+        filename = Artifacts.path('screenshots', name, 'png')
+        return ArtifactWriter.instance().submit(self.driver.get_screenshot_as_png(), filename)
+    
+    def get_current_url(self):
+        """Return current page URL"""
+        return self.driver.current_url
+    
+    def get_page_title(self):
+        """Return page title"""
         return self.driver.title
\ No newline at end of file
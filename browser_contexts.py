@@ -0,0 +1,99 @@
+import os
+import time
+from selenium.common.exceptions import WebDriverException
+from utils.driver_setup import DriverSetup
+from utils.element_cache import ElementCache
+from utils.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+class BrowserContexts:
+    """
+    Runs tests in isolated browser contexts of one shared Chrome process instead of a browser each.
+    Every pytest process attaches one WebDriver session to the host browser, and each test gets a
+    fresh context (own cookies, storage and cache) in its own window, disposed when the test ends.
+    Page objects keep using the driver they are handed; only the window behind it changes.
+    """
+
+    # Debugger address of the host browser, passed from the parallel runner to its workers
+    HOST_ENV = "TEST_BROWSER_HOST"
+
+    # Seconds to wait for ChromeDriver to list a window created through DevTools
+    WINDOW_TIMEOUT = 5
+
+    def __init__(self, address, network_policy="full", fast_startup=False, host_owner=None):
+        """
+        Args:
+            address (str): host:port of the host browser's DevTools endpoint
+            network_policy (str): Name from DriverSetup.NETWORK_POLICIES
+            fast_startup (bool): Use the cached driver lookup
+            host_owner (int): pid of the process that started the host, defaults to this process
+        """
+        self.address = address
+        self.driver = DriverSetup.attach_driver(address, network_policy=network_policy, fast_startup=fast_startup)
+        # The host is not in the attached chromedriver's process tree; the resource monitor
+        # finds it through the owner pid on its command line instead
+        self.driver._host_owner_pid = host_owner if host_owner is not None else os.getpid()
+        # Contexts are created and disposed from this window, which the test never navigates
+        self._home = self.driver.current_window_handle
+        self._context_id = None
+
+    @staticmethod
+    def start_host(headless=False, fast_startup=False):
+        """
+        Launch the browser that hosts the contexts
+        Returns:
+            tuple: (host WebDriver, to quit at the end of the run; DevTools address to attach to)
+        """
+        driver = DriverSetup.get_driver(headless=headless, fast_startup=fast_startup)
+        address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        logger.info(f"Browser context host listening on {address}")
+        return driver, address
+
+    def open(self):
+        """
+        Switch the driver to a new, empty context
+        Returns:
+            WebDriver: The attached driver, now driving the new context's window
+        """
+        if self._context_id is not None:
+            self.close()
+
+        self.driver.switch_to.window(self._home)
+        # disposeOnDetach cleans the context up even if this process dies mid-test
+        self._context_id = self.driver.execute_cdp_cmd(
+            "Target.createBrowserContext", {"disposeOnDetach": True}
+        )["browserContextId"]
+        target_id = self.driver.execute_cdp_cmd("Target.createTarget", {
+            "url": "about:blank", "browserContextId": self._context_id, "newWindow": True,
+        })["targetId"]
+
+        deadline = time.monotonic() + self.WINDOW_TIMEOUT
+        while target_id not in self.driver.window_handles:
+            if time.monotonic() > deadline:
+                self.close()
+                raise WebDriverException(f"ChromeDriver does not list the window of context {target_id}")
+            time.sleep(0.05)
+        self.driver.switch_to.window(target_id)
+
+        # Per-page state kept on the driver belongs to the previous context
+        ElementCache.for_driver(self.driver).clear()
+        self.driver._item_indexes = {}
+        self.driver._blocked_urls = None
+        return self.driver
+
+    def close(self):
+        """Dispose the current context together with its windows"""
+        if self._context_id is None:
+            return
+        context_id, self._context_id = self._context_id, None
+        try:
+            self.driver.switch_to.window(self._home)
+            self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+        except WebDriverException as e:
+            logger.warning(f"Could not dispose browser context {context_id}: {e}")
+
+    def quit(self):
+        """Detach from the host browser; the host itself is quit by whoever started it"""
+        self.close()
+        self.driver.quit()
@@ -0,0 +1,213 @@
+import threading
+from utils.driver_setup import DriverSetup
+from utils.element_cache import ElementCache
+from utils.logger import Logger
+from utils.resource_monitor import ResourceMonitor, MB
+
+logger = Logger.get_logger(__name__)
+
+
+class PooledSession:
+    """A live WebDriver session owned by a BrowserPool"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class BrowserPool:
+    """Keeps a small set of live WebDriver sessions and hands one out per test"""
+
+    # Script used to wipe client-side state of the page currently loaded
+    CLEAR_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+    def __init__(self, size=1, recycle_after=50, headless=False,
+                 health_timeout=5, reset_timeout=30, reset_url=None, driver_factory=None, memory_budget_mb=None):
+        """
+        Args:
+            size (int): Maximum number of live sessions kept by the pool
+            recycle_after (int): Quit and replace a session after this many tests (0 disables)
+            headless (bool): Launch pooled browsers in headless mode; set it on driver_factory instead when passing one
+            health_timeout (int): Seconds a health check may take before the session is considered wedged
+            reset_timeout (int): Seconds the between-test reset may take
+            reset_url (str): URL every session is sent back to between tests
+            driver_factory (callable): Returns a new WebDriver, defaults to DriverSetup.get_driver
+            memory_budget_mb (float): Quit and replace a session whose browser uses more RSS than this (needs psutil)
+        """
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self.health_timeout = health_timeout
+        self.reset_timeout = reset_timeout
+        self.reset_url = reset_url
+        if driver_factory is not None and headless:
+            raise ValueError("headless is ignored with a driver_factory; launch headless from the factory instead")
+        self.driver_factory = driver_factory or (lambda: DriverSetup.get_driver(headless=headless))
+        self.memory_budget = memory_budget_mb * MB if memory_budget_mb else None
+        if self.memory_budget and not ResourceMonitor.available:
+            logger.warning("psutil is not installed, the pool memory budget is not enforced")
+
+        self._idle = []
+        self._in_use = {}
+        self._lock = threading.Condition()
+        self._closed = False
+        self._launching = 0
+
+    def acquire(self, timeout=None):
+        """
+        Hand out a healthy session, launching a new one if the pool has room
+        Args:
+            timeout (float): Seconds to wait for a free session when the pool is exhausted
+        Returns:
+            WebDriver: Live WebDriver session
+        """
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    session = self._idle.pop()
+                    self._in_use[id(session.driver)] = session
+                    break
+                if len(self._in_use) + self._launching < self.size:
+                    session = None
+                    self._launching += 1
+                    break
+                if not self._lock.wait(timeout):
+                    raise TimeoutError(f"No pooled browser became free within {timeout}s")
+
+        if session is None:
+            # Chrome start-up is slow, so it happens outside the lock
+            try:
+                session = self._launch()
+            finally:
+                with self._lock:
+                    self._launching -= 1
+                    if session is not None:
+                        self._in_use[id(session.driver)] = session
+                    self._lock.notify()
+        elif not self.is_healthy(session.driver):
+            logger.warning("Pooled browser failed health check, replacing it")
+            session = self._replace(session)
+
+        session.uses += 1
+        return session.driver
+
+    def release(self, driver):
+        """
+        Return a session to the pool after resetting its state
+        Args:
+            driver (WebDriver): Session previously handed out by acquire()
+        """
+        with self._lock:
+            session = self._in_use.get(id(driver))
+        if session is None:
+            return
+
+        if self.recycle_after and session.uses >= self.recycle_after:
+            logger.info(f"Recycling pooled browser after {session.uses} tests")
+            self._discard(session)
+        elif self.memory_budget and ResourceMonitor.driver_rss(driver) > self.memory_budget:
+            logger.info(f"Recycling pooled browser over its {self.memory_budget / MB:.0f} MB memory budget")
+            self._discard(session)
+        elif not self.reset(driver):
+            logger.warning("Pooled browser could not be reset, discarding it")
+            self._discard(session)
+        else:
+            with self._lock:
+                del self._in_use[id(driver)]
+                self._idle.append(session)
+                self._lock.notify()
+
+    def discard(self, driver):
+        """Quit a session that must not be reused"""
+        with self._lock:
+            session = self._in_use.get(id(driver))
+        if session is not None:
+            self._discard(session)
+
+    def reset(self, driver):
+        """
+        Clear cookies, localStorage and sessionStorage and go back to the reset URL
+        Returns:
+            bool: True if the session is clean and ready for the next test
+        """
+        def _reset():
+            try:
+                driver.execute_script(self.CLEAR_STORAGE_SCRIPT)
+            except Exception:
+                # Storage is not reachable on about:blank or error pages
+                pass
+            driver.delete_all_cookies()
+            ElementCache.for_driver(driver).clear()
+            if self.reset_url:
+                driver.get(self.reset_url)
+                driver.execute_script(self.CLEAR_STORAGE_SCRIPT)
+
+        return self._run_guarded(_reset, self.reset_timeout)
+
+    def is_healthy(self, driver):
+        """Check that the session still answers commands in time"""
+        return self._run_guarded(lambda: driver.execute_script("return document.readyState"),
+                                 self.health_timeout)
+
+    def close(self):
+        """Quit every session owned by the pool"""
+        with self._lock:
+            self._closed = True
+            sessions = self._idle + list(self._in_use.values())
+            self._idle = []
+            self._in_use = {}
+            self._lock.notify_all()
+
+        for session in sessions:
+            self._quit(session.driver)
+        logger.info(f"Browser pool closed, {len(sessions)} session(s) quit")
+
+    def _launch(self):
+        logger.info("Launching pooled browser")
+        return PooledSession(self.driver_factory())
+
+    def _replace(self, session):
+        # The replacement takes the old session's slot, so it is counted as launching like in acquire()
+        with self._lock:
+            self._in_use.pop(id(session.driver), None)
+            self._launching += 1
+        replacement = None
+        try:
+            self._quit(session.driver)
+            replacement = self._launch()
+        finally:
+            with self._lock:
+                self._launching -= 1
+                if replacement is not None:
+                    self._in_use[id(replacement.driver)] = replacement
+                self._lock.notify()
+        return replacement
+
+    def _discard(self, session):
+        with self._lock:
+            self._in_use.pop(id(session.driver), None)
+            self._lock.notify()
+        self._quit(session.driver)
+
+    def _quit(self, driver):
+        # quit() can hang on a wedged session, so it is bounded like every other pool call
+        if not self._run_guarded(driver.quit, self.health_timeout):
+            logger.warning("Pooled browser did not quit cleanly")
+
+    @staticmethod
+    def _run_guarded(func, timeout):
+        """Run func on a daemon thread so a hung chromedriver cannot block the test thread"""
+        outcome = {}
+
+        def _target():
+            try:
+                func()
+                outcome["ok"] = True
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=_target, name="browser-pool-call", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        return outcome.get("ok", False)
@@ -1,115 +1,213 @@
-from selenium.webdriver.common.by import By
-from pages.base_page import BasePage
-
-class CartPage(BasePage):
-    """Page Object for Shopping Cart Page"""
-    
-    # Locators
-    PAGE_TITLE = (By.CLASS_NAME, "title")
-    CART_ITEMS = (By.CLASS_NAME, "cart_item")
-    CART_ITEM_NAMES = (By.CLASS_NAME, "inventory_item_name")
-    CART_ITEM_PRICES = (By.CLASS_NAME, "inventory_item_price")
-    CONTINUE_SHOPPING = (By.ID, "continue-shopping")
-    CHECKOUT_BUTTON = (By.ID, "checkout")
-    REMOVE_BUTTONS = (By.CSS_SELECTOR, "button[id^='remove']")
-    CART_QUANTITY = (By.CLASS_NAME, "cart_quantity")
-    
-    # Checkout Form Locators
-    FIRST_NAME = (By.ID, "first-name")
-    LAST_NAME = (By.ID, "last-name")
-    POSTAL_CODE = (By.ID, "postal-code")
-    CONTINUE_BUTTON = (By.ID, "continue")
-    CANCEL_BUTTON = (By.ID, "cancel")
-    ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
-    
-    # Checkout Overview Locators
-    SUBTOTAL = (By.CLASS_NAME, "summary_subtotal_label")
-    TAX = (By.CLASS_NAME, "summary_tax_label")
-    TOTAL = (By.CLASS_NAME, "summary_total_label")
-    FINISH_BUTTON = (By.ID, "finish")
-    
-    # Checkout Complete Locators
-    COMPLETE_HEADER = (By.CLASS_NAME, "complete-header")
-    COMPLETE_TEXT = (By.CLASS_NAME, "complete-text")
-    BACK_HOME_BUTTON = (By.ID, "back-to-products")
-    
-    def is_cart_page_loaded(self):
-        """Verify cart page is loaded"""
-        return self.is_displayed(self.PAGE_TITLE)
-    
-    def get_cart_item_count(self):
-        """Get number of items in cart"""
-        try:
-            items = self.find_elements(self.CART_ITEMS)
-            return len(items)
-        except:
-            return 0
-    
-    def get_cart_item_names(self):
-        """Get list of item names in cart"""
-        items = self.find_elements(self.CART_ITEM_NAMES)
-        return [item.text for item in items]
-    
-    def get_cart_item_prices(self):
-        """Get list of item prices in cart"""
-        prices = self.find_elements(self.CART_ITEM_PRICES)
-        return [price.text for price in prices]
-    
-    def remove_item_by_name(self, product_name):
-        """Remove specific item from cart"""
-        remove_button = (By.XPATH, f"//div[text()='{product_name}']/ancestor::div[@class='cart_item']//button")
-        self.click(remove_button)
-    
-    def click_continue_shopping(self):
-        """Click continue shopping button"""
-        self.click(self.CONTINUE_SHOPPING)
-    
-    def click_checkout(self):
-        """Click checkout button"""
-        self.click(self.CHECKOUT_BUTTON)
-    
-    def fill_checkout_information(self, first_name, last_name, postal_code):
-        """Fill checkout information form"""
-        self.enter_text(self.FIRST_NAME, first_name)
-        self.enter_text(self.LAST_NAME, last_name)
-        self.enter_text(self.POSTAL_CODE, postal_code)
-    
-    def click_continue_checkout(self):
-        """Click continue button on checkout form"""
-        self.click(self.CONTINUE_BUTTON)
-    
-    def get_checkout_error_message(self):
-        """Get checkout form error message"""
-        return self.get_text(self.ERROR_MESSAGE)
-    
-    def get_subtotal(self):
-        """Get subtotal from checkout overview"""
-        return self.get_text(self.SUBTOTAL)
-    
-    def get_tax(self):
-        """Get tax from checkout overview"""
-        return self.get_text(self.TAX)
-    
-    def get_total(self):
-        """Get total from checkout overview"""
-        return self.get_text(self.TOTAL)
-    
-    def click_finish(self):
-        """Click finish button"""
-        self.click(self.FINISH_BUTTON)
-    
-    def is_checkout_complete(self):
-        """Check if order is complete"""
-        return self.is_displayed(self.COMPLETE_HEADER)
-    
-    def get_complete_header_text(self):
-        """Get checkout complete header text"""
-        return self.get_text(self.COMPLETE_HEADER)
-    
-    def get_complete_message_text(self):
-        """Get checkout complete message text"""
-        return self.get_text(self.COMPLETE_TEXT)
-    
-    def click_back_home(self):
-        """Click back home button"""
+import json
+from urllib.parse import urljoin
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+from pages.home_page import HomePage
+from pages.login_page import LoginPage
+
+class CartPage(BasePage):
+    """Page Object for Shopping Cart Page"""
+    
+    # Locators
+    PAGE_TITLE = (By.CLASS_NAME, "title")
+    CART_LIST = (By.CLASS_NAME, "cart_list")
+    CART_ITEMS = (By.CLASS_NAME, "cart_item")
+    CART_ITEM_NAMES = (By.CLASS_NAME, "inventory_item_name")
+    CART_ITEM_PRICES = (By.CLASS_NAME, "inventory_item_price")
+    CONTINUE_SHOPPING = (By.ID, "continue-shopping")
+    CHECKOUT_BUTTON = (By.ID, "checkout")
+    REMOVE_BUTTONS = (By.CSS_SELECTOR, "button[id^='remove']")
+    CART_QUANTITY = (By.CLASS_NAME, "cart_quantity")
+    CART_ITEM_BUTTON = (By.TAG_NAME, "button")
+    CART_ITEM_LINK = (By.CSS_SELECTOR, "a[id$='_title_link']")
+    
+    # Checkout Form Locators
+    FIRST_NAME = (By.ID, "first-name")
+    LAST_NAME = (By.ID, "last-name")
+    POSTAL_CODE = (By.ID, "postal-code")
+    CONTINUE_BUTTON = (By.ID, "continue")
+    CANCEL_BUTTON = (By.ID, "cancel")
+    ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
+    
+    # Checkout Overview Locators
+    SUBTOTAL = (By.CLASS_NAME, "summary_subtotal_label")
+    TAX = (By.CLASS_NAME, "summary_tax_label")
+    TOTAL = (By.CLASS_NAME, "summary_total_label")
+    FINISH_BUTTON = (By.ID, "finish")
+    
+    # Checkout Complete Locators
+    COMPLETE_HEADER = (By.CLASS_NAME, "complete-header")
+    COMPLETE_TEXT = (By.CLASS_NAME, "complete-text")
+    BACK_HOME_BUTTON = (By.ID, "back-to-products")
+    
+    # Paths relative to LoginPage.URL
+    CART_PATH = "cart.html"
+    CHECKOUT_INFO_PATH = "checkout-step-one.html"
+    CHECKOUT_OVERVIEW_PATH = "checkout-step-two.html"
+    
+    # localStorage key the storefront keeps the cart under; the local stand-in renders the cart
+    # server-side from a cookie of the same name instead, which the real storefront ignores
+    CART_STORAGE_KEY = "cart-contents"
+    
+    def seed_cart(self, product_names):
+        """
+        Write cart contents straight into the storefront's client-side storage.
+        Must be called on the inventory page of a logged-in session, where the product ids are read from.
+        Args:
+            product_names (list): Names of the products the cart should contain
+        """
+        home_page = HomePage(self.driver)
+        products = home_page.get_product_index()
+        if any(name not in products for name in product_names):
+            products = home_page.get_product_index(refresh=True)
+        unknown = [name for name in product_names if name not in products]
+        if unknown:
+            raise ValueError(f"Unknown products: {unknown}")
+        
+        product_ids = [products[name]["item_id"] for name in product_names]
+        cart_cookie = ",".join(str(pid) for pid in product_ids)
+        if not self._has_javascript():
+            # Only server-rendered storefronts can be driven without a browser
+            self.driver.add_cookie({"name": self.CART_STORAGE_KEY, "value": cart_cookie, "path": "/"})
+            return
+        # Both are written so the cart shows whether the target is the stand-in or the real storefront
+        self.driver.execute_script(
+            "window.localStorage.setItem(arguments[0], arguments[1]);"
+            "document.cookie = arguments[0] + '=' + arguments[2] + '; path=/';",
+            self.CART_STORAGE_KEY, json.dumps(product_ids), cart_cookie
+        )
+    
+    def open_with_items(self, product_names, path=CART_PATH):
+        """
+        Seed the cart and open the cart (or a checkout step) in one navigation
+        Args:
+            product_names (list): Names of the products the cart should contain
+            path (str): Page to open, e.g. CART_PATH or CHECKOUT_OVERVIEW_PATH
+        """
+        self.seed_cart(product_names)
+        self.navigate(urljoin(LoginPage.URL, path))
+    
+    def is_cart_page_loaded(self):
+        """Verify cart page is loaded"""
+        return self.is_displayed(self.PAGE_TITLE)
+    
+    def get_cart_item_count(self):
+        """Get number of items in cart, 0 when no cart list is shown"""
+        # The list wrapper is rendered even for an empty cart; off the cart page it is absent
+        if self.find_optional(self.CART_LIST) is None:
+            return 0
+        return len(self.driver.find_elements(*self.CART_ITEMS))
+    
+    def get_cart_snapshot(self):
+        """Get name, price, quantity and button id of every cart item in one round-trip"""
+        return self.read_items(
+            self.CART_ITEMS,
+            {
+                "name": (self.CART_ITEM_NAMES, "text"),
+                "price": (self.CART_ITEM_PRICES, "text"),
+                "quantity": (self.CART_QUANTITY, "text"),
+                "button_id": (self.CART_ITEM_BUTTON, "id"),
+            },
+            container_locator=self.CART_LIST,
+        )
+    
+    def get_cart_item_names(self):
+        """Get list of item names in cart"""
+        return [item["name"] for item in self.get_cart_snapshot()]
+    
+    def get_cart_item_prices(self):
+        """Get list of item prices in cart"""
+        return [item["price"] for item in self.get_cart_snapshot()]
+    
+    def get_cart_index(self, refresh=False):
+        """
+        Map item name to item id, button id and price for the items in the cart.
+        Read once per page load and reused while the list is unchanged.
+        Args:
+            refresh (bool): Read the items again even if the cached index is still current
+        Returns:
+            dict: Name -> {'item_id', 'button_id', 'slug', 'price'}
+        """
+        rows = self.index_items(
+            "cart",
+            self.CART_ITEMS,
+            {
+                "name": (self.CART_ITEM_NAMES, "text"),
+                "price": (self.CART_ITEM_PRICES, "text"),
+                "button_id": (self.CART_ITEM_BUTTON, "id"),
+                "link_id": (self.CART_ITEM_LINK, "id"),
+            },
+            key="name",
+            container_locator=self.CART_LIST,
+            refresh=refresh,
+        )
+        return {name: HomePage.product_entry(row) for name, row in rows.items()}
+    
+    def remove_item_by_name(self, product_name):
+        """Remove specific item from cart"""
+        item = self.get_cart_index().get(product_name) or self.get_cart_index(refresh=True).get(product_name)
+        if item is None:
+            raise ValueError(f"No item named {product_name!r} in the cart")
+        self.click((By.ID, f"remove-{item['slug']}"))
+    
+    def click_continue_shopping(self):
+        """Click continue shopping button"""
+        self.click(self.CONTINUE_SHOPPING)
+    
+    def click_checkout(self):
+        """Click checkout button"""
+        self.click(self.CHECKOUT_BUTTON)
+    
+    def fill_checkout_information(self, first_name, last_name, postal_code, typed=False):
+        """
+        Fill checkout information form
+        Args:
+            first_name (str): First name
+            last_name (str): Last name
+            postal_code (str): Postal code
+            typed (bool): Type the values key by key instead of filling the form in one script
+        """
+        self.fill_form(
+            {self.FIRST_NAME: first_name, self.LAST_NAME: last_name, self.POSTAL_CODE: postal_code},
+            typed=typed,
+        )
+    
+    def click_continue_checkout(self):
+        """Click continue button on checkout form"""
+        self.click(self.CONTINUE_BUTTON)
+    
+    def get_checkout_error_message(self):
+        """Get checkout form error message"""
+        return self.get_text(self.ERROR_MESSAGE)
+    
+    def get_subtotal(self):
+        """Get subtotal from checkout overview"""
+        return self.get_text(self.SUBTOTAL)
+    
+    def get_tax(self):
+        """Get tax from checkout overview"""
+        return self.get_text(self.TAX)
+    
+    def get_total(self):
+        """Get total from checkout overview"""
+        return self.get_text(self.TOTAL)
+    
+    def click_finish(self):
+        """Click finish button"""
+        self.click(self.FINISH_BUTTON)
+    
+    def is_checkout_complete(self):
+        """Check if order is complete"""
+        return self.is_displayed(self.COMPLETE_HEADER)
+    
+    def get_complete_header_text(self):
+        """Get checkout complete header text"""
+        return self.get_text(self.COMPLETE_HEADER)
+    
+    def get_complete_message_text(self):
+        """Get checkout complete message text"""
+        return self.get_text(self.COMPLETE_TEXT)
+    
+    def click_back_home(self):
+        """Click back home button"""
         self.click(self.BACK_HOME_BUTTON)
\ No newline at end of file
@@ -0,0 +1,193 @@
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from utils.artifacts import Artifacts
+
+class CommandRecorder:
+    """Records every WebDriver command with its duration, locator and issuing page-object method"""
+
+    def __init__(self, log_commands=True):
+        """
+        Args:
+            log_commands (bool): Also append one JSON line per command to commands.jsonl
+        """
+        self.current_test = None
+        self.tests = {}
+        self.methods = {}
+        self._lock = threading.Lock()
+        # Nesting depth of waiting() blocks, per thread
+        self._waits = threading.local()
+        self._log = None
+        if log_commands:
+            self._log = open(os.path.join(Artifacts.directory("reports"), "commands.jsonl"), "w")
+
+    def instrument(self, driver):
+        """
+        Route every command of a driver through the recorder (idempotent)
+        Args:
+            driver (WebDriver): Driver to instrument
+        Returns:
+            WebDriver: The same driver
+        """
+        if getattr(driver, "_command_recorder", None) is self:
+            return driver
+
+        execute = driver.execute
+
+        def recorded_execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.record(driver_command, params, time.perf_counter() - started, sys._getframe(1))
+
+        driver.execute = recorded_execute
+        driver._command_recorder = self
+        return driver
+
+    @staticmethod
+    @contextlib.contextmanager
+    def waiting(driver):
+        """
+        Count the commands a driver issues inside the block as wait time. Called by BasePage and the
+        wait strategies around every explicit wait; a no-op for drivers without a recorder.
+        Args:
+            driver (WebDriver): Driver the wait runs on
+        """
+        recorder = getattr(driver, "_command_recorder", None)
+        if recorder is None:
+            yield
+            return
+        depth = getattr(recorder._waits, "depth", 0)
+        recorder._waits.depth = depth + 1
+        try:
+            yield
+        finally:
+            recorder._waits.depth = depth
+
+    def record(self, command, params, duration, frame):
+        """
+        Account one finished command
+        Args:
+            command (str): WebDriver command name, e.g. 'findElement'
+            params (dict): Command parameters
+            duration (float): Seconds the round-trip took
+            frame: Caller frame, used to find the page-object method
+        """
+        method, primitive = self._inspect(frame)
+        locator = None
+        if params and "using" in params:
+            locator = f"{params['using']}={params.get('value')}"
+        kind = "wait" if getattr(self._waits, "depth", 0) else "action"
+
+        with self._lock:
+            test = self.tests.setdefault(self.current_test or "<no test>", {
+                "round_trips": 0, "wait_time": 0.0, "action_time": 0.0, "commands": {},
+            })
+            test["round_trips"] += 1
+            test[f"{kind}_time"] += duration
+            test["commands"][command] = test["commands"].get(command, 0) + 1
+
+            if method is not None:
+                stats = self.methods.setdefault(method, {"round_trips": 0, "total_time": 0.0, "max_time": 0.0})
+                stats["round_trips"] += 1
+                stats["total_time"] += duration
+                stats["max_time"] = max(stats["max_time"], duration)
+
+            if self._log is not None:
+                self._log.write(json.dumps({
+                    "test_id": self.current_test, "command": command, "locator": locator,
+                    "duration": round(duration, 6), "method": method, "primitive": primitive, "kind": kind,
+                }) + "\n")
+
+    def report(self, path=None):
+        """
+        Write the per-test and per-method summary
+        Args:
+            path (str): Output file, defaults to reports/<worker>/commands.json
+        Returns:
+            dict: The written summary
+        """
+        path = path or os.path.join(Artifacts.directory("reports"), "commands.json")
+        summary = {"tests": self.tests, "methods": self.methods}
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2, sort_keys=True)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        return summary
+
+    def summary_lines(self, limit=5):
+        """
+        Build a short human-readable summary
+        Args:
+            limit (int): Number of entries per section
+        Returns:
+            list: Lines for the terminal
+        """
+        return self.format_summary({"tests": self.tests, "methods": self.methods}, limit)
+
+    @staticmethod
+    def format_summary(summary, limit=5):
+        tests, methods = summary["tests"], summary["methods"]
+        lines = [f"{sum(t['round_trips'] for t in tests.values())} WebDriver round-trips in {len(tests)} tests"]
+
+        lines.append("Chattiest tests (round-trips, wait s / action s):")
+        for name, stats in sorted(tests.items(), key=lambda entry: -entry[1]["round_trips"])[:limit]:
+            lines.append(f"  {stats['round_trips']:6d}  {stats['wait_time']:7.2f} / {stats['action_time']:7.2f}  {name}")
+
+        lines.append("Slowest page-object methods (total s, round-trips):")
+        for name, stats in sorted(methods.items(), key=lambda entry: -entry[1]["total_time"])[:limit]:
+            lines.append(f"  {stats['total_time']:7.2f}  {stats['round_trips']:6d}  {name}")
+        return lines
+
+    @staticmethod
+    def merge_reports(paths, path):
+        """
+        Merge per-worker summaries into one file
+        Args:
+            paths (list): Worker commands.json files; missing ones are skipped
+            path (str): Output file
+        Returns:
+            dict: The merged summary, None if there was nothing to merge
+        """
+        paths = [worker_path for worker_path in paths if os.path.exists(worker_path)]
+        if not paths:
+            return None
+
+        merged = {"tests": {}, "methods": {}}
+        for worker_path in paths:
+            with open(worker_path) as f:
+                summary = json.load(f)
+            merged["tests"].update(summary["tests"])
+            for name, stats in summary["methods"].items():
+                target = merged["methods"].setdefault(name, {"round_trips": 0, "total_time": 0.0, "max_time": 0.0})
+                target["round_trips"] += stats["round_trips"]
+                target["total_time"] += stats["total_time"]
+                target["max_time"] = max(target["max_time"], stats["max_time"])
+
+        with open(path, "w") as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+        return merged
+
+    def _inspect(self, frame):
+        """
+        Return (outermost page-object method, innermost BasePage primitive)
+        """
+        method = primitive = None
+        while frame is not None:
+            owner = frame.f_locals.get("self")
+            if owner is not None and self._is_page_object(owner):
+                qualname = f"{type(owner).__name__}.{frame.f_code.co_name}"
+                if primitive is None:
+                    primitive = qualname
+                method = qualname
+            frame = frame.f_back
+        return method, primitive
+
+    @staticmethod
+    def _is_page_object(obj):
+        return any(cls.__name__ == "BasePage" for cls in type(obj).__mro__)
@@ -1,56 +1,507 @@
-import pytest
-from utils.driver_setup import DriverSetup
-from utils.logger import Logger
-import os
-from datetime import datetime
-
-logger = Logger.get_logger(__name__)
-
-@pytest.fixture(scope="function")
-def driver(request):
-    """
-    Fixture to initialize and quit WebDriver for each test
-    """
-    logger.info(f"Initializing driver for test: {request.node.name}")
-    
-    # Initialize driver
-    driver = DriverSetup.get_driver(headless=False)
-    
-    yield driver
-    
-    # Capture screenshot on failure
-    if request.node.rep_call.failed:
-        logger.error(f"Test failed: {request.node.name}")
-        try:
-            if not os.path.exists('screenshots'):
-                os.makedirs('screenshots')
-            
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            screenshot_name = f"screenshots/FAILED_{request.node.name}_{timestamp}.png"
-            driver.save_screenshot(screenshot_name)
-            logger.info(f"Screenshot saved: {screenshot_name}")
-        except Exception as e:
-            logger.error(f"Failed to capture screenshot: {e}")
-    
-    # Quit driver
-    logger.info(f"Closing driver for test: {request.node.name}")
-    driver.quit()
-
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    """
-    Hook to access test result and store in request object
-    """
-    outcome = yield
-    rep = outcome.get_result()
-    setattr(item, f"rep_{rep.when}", rep)
-
-def pytest_configure(config):
-    """
-    Create necessary directories
-    """
-    directories = ['reports', 'screenshots', 'logs']
-    for directory in directories:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            logger.info(f"Created directory: {directory}")
\ No newline at end of file
+import pytest
+from utils.driver_setup import DriverSetup
+from utils.browser_pool import BrowserPool
+from utils.browser_contexts import BrowserContexts
+from utils.http_driver import HttpDriver
+from utils.scenario_data import ScenarioMatrix, ScenarioSource, parse_shard
+from utils.parallel_runner import ParallelRunner
+from utils.artifacts import Artifacts
+from utils.artifact_writer import ArtifactWriter
+from utils.command_recorder import CommandRecorder
+from utils.resource_monitor import ResourceMonitor
+from utils.duration_history import DurationHistory
+from utils.element_cache import ElementCache
+from utils.impact_map import ImpactMap
+from utils.storefront_server import StorefrontServer
+from utils.wait_strategy import WAIT_STRATEGIES
+from pages.base_page import BasePage
+from utils.logger import Logger
+from pages.login_page import LoginPage
+import os
+
+logger = Logger.get_logger(__name__)
+
+# Loaded in pytest_configure from pytest's rootdir, so runs started in a subdirectory share them
+duration_history = None
+impact_map = None
+
+def pytest_addoption(parser):
+    """
+    Register command line options for driver management
+    """
+    group = parser.getgroup("driver")
+    group.addoption("--headless", action="store_true", default=False,
+                    help="Run browsers in headless mode")
+    group.addoption("--fast-startup", action="store_true", default=False,
+                    help="Launch Chrome on the tuned start-up path (new headless mode, pre-built profile, cached driver)")
+    group.addoption("--network-policy", choices=sorted(DriverSetup.NETWORK_POLICIES), default="full",
+                    help="full: load everything, lean: block images, fonts and analytics and use the eager "
+                         "page-load strategy (opt out per test with @pytest.mark.allow_resources)")
+    group.addoption("--driver-mode", choices=["fresh", "pooled", "contexts"], default="fresh",
+                    help="fresh: new browser per test, pooled: reuse live browsers across tests, "
+                         "contexts: one shared browser, an isolated context per test")
+    group.addoption("--pool-size", type=int, default=1,
+                    help="Maximum number of live browsers kept per worker in pooled mode")
+    group.addoption("--pool-recycle-after", type=int, default=50,
+                    help="Replace a pooled browser after this many tests (0 disables recycling)")
+    group.addoption("--pool-memory-budget", type=float, default=None,
+                    help="Replace a pooled browser whose process tree uses more than this many MB (needs psutil)")
+    group.addoption("--no-element-cache", action="store_true", default=False,
+                    help="Look elements up again on every action instead of reusing handles found on the same page")
+    group.addoption("--wait-strategy", choices=sorted(WAIT_STRATEGIES), default="poll",
+                    help="poll: WebDriverWait polling, observer: in-page MutationObserver with polling fallback")
+    
+    group = parser.getgroup("logging")
+    group.addoption("--console-log-level", default=None,
+                    help="Console verbosity of the framework logger (default: TEST_LOG_CONSOLE_LEVEL or INFO)")
+    group.addoption("--run-log-level", default=None,
+                    help="Level written to the JSON-lines run log (default: TEST_LOG_FILE_LEVEL or INFO)")
+    
+    group = parser.getgroup("instrumentation")
+    group.addoption("--instrument-commands", action="store_true", default=False,
+                    help="Record every WebDriver command and report round-trips per test and page-object method")
+    group.addoption("--monitor-resources", action="store_true", default=False,
+                    help="Sample RSS and CPU of each test's browser process tree (needs psutil)")
+    group.addoption("--memory-growth-limit", type=float, default=100,
+                    help="Flag tests whose browser RSS grows by more than this many MB")
+    group.addoption("--no-reap", action="store_true", default=False,
+                    help="Do not kill orphaned browsers of earlier runs at start, or this run's leftovers at the end")
+    
+    group = parser.getgroup("artifacts")
+    group.addoption("--screenshot-compress", action="store_true", default=False,
+                    help="Re-encode screenshots with maximum PNG compression (needs Pillow)")
+    group.addoption("--screenshot-max-width", type=int, default=None,
+                    help="Downscale screenshots wider than this many pixels (needs Pillow)")
+    
+    group = parser.getgroup("storefront")
+    group.addoption("--browserless", action="store_true", default=False,
+                    help="Run tests marked browserless over plain HTTP instead of Chrome "
+                         "(needs a server-rendered storefront such as --local-storefront)")
+    group.addoption("--storefront-url", default=None,
+                    help="Base URL of the storefront under test (default: LoginPage.URL / STOREFRONT_URL)")
+    group.addoption("--local-storefront", action="store_true", default=False,
+                    help="Start the local stand-in storefront for this run and test against it")
+    group.addoption("--storefront-latency", type=float, default=0.0,
+                    help="Seconds of latency the local storefront adds to every response")
+    group.addoption("--storefront-latency-jitter", type=float, default=0.0,
+                    help="Extra random latency (0..N seconds) the local storefront adds to every response")
+    group.addoption("--storefront-error-rate", type=float, default=0.0,
+                    help="Fraction of requests the local storefront answers with HTTP 500")
+    group.addoption("--storefront-catalog-size", type=int, default=6,
+                    help="Number of products served by the local storefront")
+    
+    group = parser.getgroup("parallel")
+    group.addoption("--workers", type=int, default=1,
+                    help="Number of worker processes to spread the tests across")
+    group.addoption("--schedule", choices=["duration", "collection"], default="duration",
+                    help="duration: run and shard longest tests first using recorded history, "
+                         "collection: keep collection order")
+    
+    group = parser.getgroup("impact")
+    group.addoption("--impact-record", action="store_true", default=False,
+                    help="Record the page-object methods and locators each test uses into " + ImpactMap.FILE)
+    group.addoption("--impact-select", action="store_true", default=False,
+                    help="Run only the tests affected by changes since their coverage was recorded; "
+                         "tests without recorded coverage always run")
+    
+    group = parser.getgroup("scenarios")
+    group.addoption("--scenario-limit", type=int, default=0,
+                    help="Sample at most this many cases per data-driven test (default 0: every combination)")
+    group.addoption("--scenario-rate", type=float, default=None,
+                    help="Fraction of each data-driven matrix to run, e.g. 0.001")
+    group.addoption("--scenario-seed", type=int, default=0,
+                    help="Seed of the deterministic scenario sample")
+    group.addoption("--scenario-shard", default="0/1",
+                    help="Run only shard i/n (zero-based) of every scenario matrix, e.g. 2/8 on the third CI machine")
+
+def pytest_cmdline_main(config):
+    """
+    Hand the run over to the parallel runner when more than one worker is requested
+    """
+    workers = config.getoption("workers")
+    if workers > 1 and not Artifacts.is_worker():
+        Logger.configure(
+            console_level=config.getoption("console_log_level"),
+            file_level=config.getoption("run_log_level"),
+        )
+        host = None
+        if config.getoption("driver_mode") == "contexts":
+            # Every worker attaches to this one browser instead of launching its own
+            host, os.environ[BrowserContexts.HOST_ENV] = BrowserContexts.start_host(
+                headless=config.getoption("headless"), fast_startup=config.getoption("fast_startup")
+            )
+        try:
+            return ParallelRunner(config.invocation_params.args, workers,
+                                  rootdir=str(config.invocation_params.dir),
+                                  state_dir=str(config.rootpath),
+                                  schedule=config.getoption("schedule")).run()
+        finally:
+            if host is not None:
+                host.quit()
+
+def pytest_generate_tests(metafunc):
+    """
+    Parametrize tests marked scenarios(name=path, ...) with references to the selected data rows
+    """
+    marker = metafunc.definition.get_closest_marker("scenarios")
+    if marker is None or "scenario" not in metafunc.fixturenames:
+        return
+    
+    config = metafunc.config
+    matrix = ScenarioMatrix({
+        name: ScenarioSource.open(os.path.join(str(config.rootpath), path))
+        for name, path in marker.kwargs.items()
+    })
+    shard, shards = parse_shard(config.getoption("scenario_shard"))
+    limit = config.getoption("scenario_limit") or None
+    rate = config.getoption("scenario_rate")
+    available = matrix.shard_size(shard, shards)
+    if limit is None and rate is None and available > ScenarioMatrix.FULL_RUN_LIMIT:
+        # Every case becomes a test item, so an unbounded matrix would make collection crawl
+        raise pytest.UsageError(
+            f"{metafunc.definition.nodeid} has {available} scenario cases in this shard, more than "
+            f"{ScenarioMatrix.FULL_RUN_LIMIT} run without sampling; pass --scenario-limit, --scenario-rate "
+            f"or a --scenario-shard that splits it further"
+        )
+    cases = list(matrix.cases(limit=limit, rate=rate, seed=config.getoption("scenario_seed"),
+                              shard=shard, shards=shards))
+    metafunc.parametrize("scenario", cases, indirect=True, ids=[case.id for case in cases])
+    
+    if len(cases) < available:
+        if not hasattr(config, "scenario_sampling"):
+            config.scenario_sampling = {}
+        config.scenario_sampling[metafunc.definition.nodeid] = (len(cases), available)
+
+@pytest.fixture(scope="session")
+def test_data(request):
+    """
+    Fixture to look up one named record of a data set: test_data("data/users.jsonl", "locked_out")
+    """
+    root = str(request.config.rootpath)
+    return lambda path, case: ScenarioSource.open(os.path.join(root, path)).find(case)
+
+@pytest.fixture
+def scenario(request):
+    """
+    Fixture that loads the data rows of the current scenario case
+    """
+    return request.param.load()
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Drop tests unaffected by local changes, restrict a parallel worker to its own shard of the tests
+    and order them longest first
+    """
+    if config.getoption("impact_select") and not Artifacts.is_worker():
+        # Workers receive a shard of the tests that were already selected
+        selected, deselected, reason = impact_map.select(items, _page_classes())
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        logger.info(f"Impact selection: running {len(selected)} of {len(selected) + len(deselected)} tests ({reason})")
+    
+    if Artifacts.is_worker():
+        # Shards arrive already ordered by the runner
+        ParallelRunner.select_shard(items, config)
+    elif config.getoption("schedule") == "duration":
+        predicted = {item.nodeid: duration_history.predict(item.nodeid) for item in items}
+        items.sort(key=lambda item: predicted[item.nodeid], reverse=True)
+
+def pytest_sessionfinish(session):
+    """
+    Flush pending artifacts and persist the durations and commands measured in this run
+    """
+    ArtifactWriter.shutdown()
+    recorder = getattr(session.config, "command_recorder", None)
+    if recorder is not None:
+        recorder.report()
+    monitor = getattr(session.config, "resource_monitor", None)
+    if monitor is not None and monitor.tests:
+        monitor.report()
+    if Artifacts.is_worker():
+        duration_history.save_partial()
+        if impact_map.current:
+            impact_map.save_partial()
+    else:
+        if duration_history.current:
+            duration_history.save()
+        if impact_map.current:
+            impact_map.save()
+
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    """
+    Fixture to keep live WebDriver sessions for the whole worker in pooled mode
+    """
+    config = request.config
+    headless = config.getoption("headless")
+    fast_startup = config.getoption("fast_startup")
+    network_policy = config.getoption("network_policy")
+    pool = BrowserPool(
+        size=config.getoption("pool_size"),
+        recycle_after=config.getoption("pool_recycle_after"),
+        reset_url=LoginPage.URL,
+        driver_factory=lambda: DriverSetup.get_driver(
+            headless=headless, fast_startup=fast_startup, network_policy=network_policy
+        ),
+        memory_budget_mb=config.getoption("pool_memory_budget"),
+    )
+    yield pool
+    pool.close()
+
+@pytest.fixture(scope="session")
+def browser_contexts(request):
+    """
+    Fixture to attach this worker to the shared browser that hosts one context per test
+    """
+    config = request.config
+    host = None
+    address = os.environ.get(BrowserContexts.HOST_ENV)
+    if not address:
+        host, address = BrowserContexts.start_host(
+            headless=config.getoption("headless"), fast_startup=config.getoption("fast_startup")
+        )
+    # A host from the environment was started by the parallel runner, this worker's parent
+    contexts = BrowserContexts(address, network_policy=config.getoption("network_policy"),
+                               fast_startup=config.getoption("fast_startup"),
+                               host_owner=os.getpid() if host is not None else os.getppid())
+    yield contexts
+    contexts.quit()
+    if host is not None:
+        host.quit()
+
+@pytest.fixture(scope="function")
+def driver(request):
+    """
+    Fixture to initialize and quit WebDriver for each test
+    """
+    logger.info(f"Initializing driver for test: {request.node.name}")
+    
+    browserless = (request.config.getoption("browserless")
+                   and request.node.get_closest_marker("browserless") is not None)
+    pooled = request.config.getoption("driver_mode") == "pooled" and not browserless
+    in_context = request.config.getoption("driver_mode") == "contexts" and not browserless
+    
+    # Initialize driver
+    if browserless:
+        driver = HttpDriver()
+    elif pooled:
+        pool = request.getfixturevalue("browser_pool")
+        driver = pool.acquire()
+    elif in_context:
+        contexts = request.getfixturevalue("browser_contexts")
+        driver = contexts.open()
+    else:
+        driver = DriverSetup.get_driver(
+            headless=request.config.getoption("headless"),
+            fast_startup=request.config.getoption("fast_startup"),
+            network_policy=request.config.getoption("network_policy"),
+        )
+    
+    monitor = getattr(request.config, "resource_monitor", None)
+    try:
+        # Pooled sessions and new contexts do not carry the policy over, so it is applied per test there
+        allow_resources = request.node.get_closest_marker("allow_resources") is not None
+        if (pooled or in_context or allow_resources) and not browserless:
+            DriverSetup.apply_network_policy(driver, request.config.getoption("network_policy"), allow_resources)
+        
+        recorder = getattr(request.config, "command_recorder", None)
+        if recorder is not None and not browserless:
+            recorder.instrument(driver)
+        
+        if monitor is not None:
+            monitor.start(request.node.nodeid, driver)
+        
+        yield driver
+        
+        # Capture screenshot on failure, before a pooled session gets reset
+        rep_call = getattr(request.node, "rep_call", None)
+        if rep_call is not None and rep_call.failed:
+            logger.error(f"Test failed: {request.node.name}")
+            try:
+                if browserless:
+                    # No pixels without a browser; the served HTML is the closest equivalent
+                    screenshot_name = Artifacts.path('screenshots', f"FAILED_{request.node.name}", 'html')
+                    content = driver.page_source.encode("utf-8")
+                else:
+                    screenshot_name = Artifacts.path('screenshots', f"FAILED_{request.node.name}", 'png')
+                    content = driver.get_screenshot_as_png()
+                screenshot_name = ArtifactWriter.instance().submit(content, screenshot_name)
+                logger.info(f"Screenshot saved: {screenshot_name}")
+            except Exception as e:
+                logger.error(f"Failed to capture screenshot: {e}")
+    finally:
+        # Runs even when setting the driver up failed, so no browser outlives its test
+        if monitor is not None:
+            monitor.stop(request.node.nodeid)
+        
+        if pooled:
+            logger.info(f"Returning driver to pool for test: {request.node.name}")
+            pool.release(driver)
+        elif in_context:
+            logger.info(f"Disposing browser context for test: {request.node.name}")
+            contexts.close()
+        else:
+            logger.info(f"Closing driver for test: {request.node.name}")
+            driver.quit()
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """
+    Attach log records, recorded commands and impact coverage to the test being set up
+    """
+    Logger.set_test(item.nodeid, "setup")
+    recorder = getattr(item.config, "command_recorder", None)
+    if recorder is not None:
+        recorder.current_test = item.nodeid
+    if item.config.getoption("impact_record"):
+        impact_map.start(item.nodeid, _page_classes(), item.config.impact_commit)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item):
+    """
+    Attach log records to the test body
+    """
+    Logger.set_test(item.nodeid, "call")
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item):
+    """
+    Attach log records to the test being torn down
+    """
+    Logger.set_test(item.nodeid, "teardown")
+
+def pytest_runtest_logfinish(nodeid):
+    """
+    Detach log records and impact coverage from the finished test
+    """
+    Logger.set_test(None)
+    impact_map.stop()
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Hook to access test result, store it in the request object and record its duration
+    """
+    outcome = yield
+    rep = outcome.get_result()
+    setattr(item, f"rep_{rep.when}", rep)
+    duration_history.record(item.nodeid, rep.when, rep.duration)
+    if rep.when in ("setup", "call") and not rep.passed:
+        impact_map.mark_incomplete(item.nodeid)
+
+def _page_classes():
+    """BasePage and every page object derived from it"""
+    classes = [BasePage]
+    for cls in classes:
+        classes.extend(cls.__subclasses__())
+    return classes
+
+def pytest_configure(config):
+    """
+    Create necessary directories, register custom markers and apply run settings
+    """
+    if (config.getoption("browserless") and not config.getoption("local_storefront")
+            and not config.getoption("storefront_url") and not os.environ.get("STOREFRONT_URL")):
+        # The default storefront renders in JavaScript, where HttpDriver finds none of the locators
+        raise pytest.UsageError("--browserless needs a server-rendered storefront: pass --local-storefront, "
+                                "or --storefront-url / STOREFRONT_URL pointing at a running stand-in")
+    
+    global duration_history, impact_map
+    duration_history = DurationHistory(os.path.join(str(config.rootpath), DurationHistory.FILE))
+    impact_map = ImpactMap(os.path.join(str(config.rootpath), ImpactMap.FILE))
+    if config.getoption("impact_record"):
+        config.impact_commit = ImpactMap.head(_page_classes())
+    
+    Logger.configure(
+        console_level=config.getoption("console_log_level"),
+        file_level=config.getoption("run_log_level"),
+    )
+
+    config.addinivalue_line(
+        "markers",
+        "cart_items(*names): products the cart is seeded with before the test starts"
+    )
+    config.addinivalue_line(
+        "markers",
+        "scenarios(**sources): parametrize the scenario fixture with rows of JSONL/CSV files, e.g. "
+        "scenarios(user='data/users.jsonl'); several sources form their cartesian product"
+    )
+    config.addinivalue_line(
+        "markers",
+        "browserless: test only reads server-rendered content and submits forms, so --browserless "
+        "may run it over HTTP without a browser"
+    )
+    config.addinivalue_line(
+        "markers",
+        "allow_resources: load images, fonts and third-party requests even under --network-policy lean"
+    )
+
+    directories = ['reports', 'screenshots', 'logs']
+    for directory in directories:
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+            logger.info(f"Created directory: {directory}")
+    
+    ArtifactWriter.configure(
+        compress=config.getoption("screenshot_compress"),
+        max_width=config.getoption("screenshot_max_width"),
+    )
+    if config.getoption("instrument_commands"):
+        config.command_recorder = CommandRecorder()
+    if config.getoption("monitor_resources"):
+        config.resource_monitor = ResourceMonitor(growth_limit_mb=config.getoption("memory_growth_limit"))
+    if not config.getoption("no_reap") and not Artifacts.is_worker():
+        # Browsers whose owning run was killed; live runs on the same box are left alone
+        ResourceMonitor.reap_orphans()
+    BasePage.wait_strategy = WAIT_STRATEGIES[config.getoption("wait_strategy")]()
+    BasePage.cache_elements = not config.getoption("no_element_cache")
+    
+    if config.getoption("local_storefront"):
+        server = StorefrontServer(
+            latency=config.getoption("storefront_latency"),
+            latency_jitter=config.getoption("storefront_latency_jitter"),
+            error_rate=config.getoption("storefront_error_rate"),
+            catalog_size=config.getoption("storefront_catalog_size"),
+        )
+        config.storefront_server = server
+        LoginPage.URL = server.start()
+        logger.info(f"Local storefront running at {LoginPage.URL}")
+    elif config.getoption("storefront_url"):
+        LoginPage.URL = config.getoption("storefront_url").rstrip("/") + "/"
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Print the WebDriver round-trip summary when commands were recorded, the element cache counters,
+    the scenario cases left out by sampling and the browser resource usage
+    """
+    recorder = getattr(config, "command_recorder", None)
+    if recorder is not None and recorder.tests:
+        terminalreporter.section("WebDriver commands")
+        for line in recorder.summary_lines():
+            terminalreporter.write_line(line)
+    totals = ElementCache.totals()
+    if recorder is not None and totals["hits"] + totals["misses"]:
+        terminalreporter.write_line(ElementCache.format_totals(totals))
+    sampling = getattr(config, "scenario_sampling", None)
+    if sampling:
+        terminalreporter.section("Scenario sampling")
+        for nodeid, (selected, available) in sorted(sampling.items()):
+            terminalreporter.write_line(f"{nodeid}: {selected} of {available} cases, "
+                                        f"{available - selected} skipped by --scenario-limit/--scenario-rate")
+    monitor = getattr(config, "resource_monitor", None)
+    if monitor is not None and monitor.tests:
+        terminalreporter.section("Browser resources")
+        for line in monitor.summary_lines():
+            terminalreporter.write_line(line)
+
+def pytest_unconfigure(config):
+    """
+    Stop the local storefront if this run started one, kill browsers this process leaked and flush the run log
+    """
+    server = getattr(config, "storefront_server", None)
+    if server is not None:
+        server.stop()
+    if not config.getoption("no_reap"):
+        ResourceMonitor.reap_orphans(owner_pid=os.getpid())
+    Logger.shutdown()
\ No newline at end of file
@@ -1,35 +1,261 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-
-class DriverSetup:
-    """Handles browser driver initialization and configuration"""
-    
-    @staticmethod
-    def get_driver(headless=False):
-        """
-        Initialize and return Chrome WebDriver
-        Args:
-            headless (bool): Run browser in headless mode
-        Returns:
-            WebDriver: Configured Chrome WebDriver instance
-        """
-        chrome_options = Options()
-
-        if headless:
-            chrome_options.add_argument('--headless')
-
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--start-maximized')
-
-        chrome_options.add_experimental_option(
-            'excludeSwitches',
-            ['enable-logging']
-        )
-
-        # Selenium 4.20+ automatically downloads and manages the correct driver
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(10)
-        return driver
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.selenium_manager import SeleniumManager
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+class DriverSetup:
+    """Handles browser driver initialization and configuration"""
+
+    # Per-user cache for the resolved driver path and the pre-built profile template
+    CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mini-ecommerce-tester")
+    DRIVER_CACHE_FILE = os.path.join(CACHE_DIR, "driver_paths.json")
+    PROFILE_TEMPLATE_DIR = os.path.join(CACHE_DIR, "chrome-profile-template")
+
+    # Switches that skip work Chrome does on every launch but tests never need
+    FAST_STARTUP_ARGUMENTS = [
+        '--disable-extensions',
+        '--disable-background-networking',
+        '--disable-component-update',
+        '--disable-default-apps',
+        '--disable-sync',
+        '--no-first-run',
+        '--no-default-browser-check',
+        '--disable-features=Translate,OptimizationHints,MediaRouter',
+        '--metrics-recording-only',
+        '--password-store=basic',
+    ]
+
+    # Marks every browser this framework launches with the pid of the process that owns it
+    OWNER_SWITCH = "--tester-owner-pid"
+
+    # Network policies: URL patterns blocked through DevTools and the page-load strategy.
+    # 'lean' is safe for the page objects because they only rely on explicit waits,
+    # never on the load event or on images, fonts or third-party scripts being present
+    NETWORK_POLICIES = {
+        "full": {
+            "blocked_urls": [],
+            "page_load_strategy": "normal",
+        },
+        "lean": {
+            "blocked_urls": [
+                # Images
+                "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+                # Fonts
+                "*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+                # Analytics and error reporting
+                "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                "*backtrace.io*", "*segment.io*", "*hotjar.com*",
+            ],
+            "page_load_strategy": "eager",
+        },
+    }
+
+    _binary_paths = None
+    _template_lock = threading.Lock()
+
+    @staticmethod
+    def get_driver(headless=False, fast_startup=False, network_policy="full"):
+        """
+        Initialize and return Chrome WebDriver
+        Args:
+            headless (bool): Run browser in headless mode
+            fast_startup (bool): Use the tuned start-up path: new headless mode, pre-built
+                profile, trimmed background work and a cached driver lookup
+            network_policy (str): Name from NETWORK_POLICIES
+        Returns:
+            WebDriver: Configured Chrome WebDriver instance
+        """
+        chrome_options = DriverSetup.build_options(
+            headless=headless, fast_startup=fast_startup, network_policy=network_policy
+        )
+
+        # No implicit wait: page objects use explicit waits only, and an implicit
+        # wait would stack with them and make absence checks burn the full timeout
+        if not fast_startup:
+            # Selenium 4.20+ automatically downloads and manages the correct driver
+            driver = webdriver.Chrome(options=chrome_options)
+            DriverSetup._apply_network_policy_or_quit(driver, network_policy)
+            return driver
+
+        paths = DriverSetup.resolve_binary_paths()
+        if paths.get("browser_path"):
+            chrome_options.binary_location = paths["browser_path"]
+
+        profile_dir = DriverSetup._profile_from_template()
+        chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+
+        try:
+            driver = webdriver.Chrome(options=chrome_options, service=Service(paths["driver_path"]))
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+
+        # The profile copy belongs to this session only
+        quit_driver = driver.quit
+        def quit_and_clean_up():
+            try:
+                quit_driver()
+            finally:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+        driver.quit = quit_and_clean_up
+        DriverSetup._apply_network_policy_or_quit(driver, network_policy)
+        return driver
+
+    @staticmethod
+    def attach_driver(debugger_address, network_policy="full", fast_startup=False):
+        """
+        Start a WebDriver session on a Chrome that is already running, e.g. a browser context host
+        Args:
+            debugger_address (str): host:port of the browser's DevTools endpoint
+            network_policy (str): Name from NETWORK_POLICIES, for the page load strategy
+            fast_startup (bool): Use the cached driver lookup
+        Returns:
+            WebDriver: Session attached to the running browser; quitting it leaves the browser running
+        """
+        chrome_options = Options()
+        chrome_options.debugger_address = debugger_address
+        chrome_options.page_load_strategy = DriverSetup.NETWORK_POLICIES[network_policy]["page_load_strategy"]
+        if fast_startup:
+            return webdriver.Chrome(options=chrome_options,
+                                    service=Service(DriverSetup.resolve_binary_paths()["driver_path"]))
+        return webdriver.Chrome(options=chrome_options)
+
+    @staticmethod
+    def build_options(headless=False, fast_startup=False, network_policy="full"):
+        """
+        Build Chrome options for a test session
+        Args:
+            headless (bool): Run browser in headless mode
+            fast_startup (bool): Add the tuned start-up switches (implies the new headless mode)
+            network_policy (str): Name from NETWORK_POLICIES, sets the page-load strategy
+        Returns:
+            Options: Chrome options
+        """
+        chrome_options = Options()
+        chrome_options.page_load_strategy = DriverSetup.NETWORK_POLICIES[network_policy]["page_load_strategy"]
+
+        if fast_startup:
+            chrome_options.add_argument('--headless=new')
+            for argument in DriverSetup.FAST_STARTUP_ARGUMENTS:
+                chrome_options.add_argument(argument)
+        elif headless:
+            chrome_options.add_argument('--headless')
+
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        # Chrome ignores the switch; the reaper reads it to tell whose browser a process is
+        chrome_options.add_argument(f'{DriverSetup.OWNER_SWITCH}={os.getpid()}')
+        if not fast_startup:
+            chrome_options.add_argument('--start-maximized')
+
+        chrome_options.add_experimental_option(
+            'excludeSwitches',
+            ['enable-logging']
+        )
+        return chrome_options
+
+    @staticmethod
+    def apply_network_policy(driver, network_policy, allow_resources=False):
+        """
+        Block the policy's URL patterns in the browser through DevTools
+        Args:
+            driver (WebDriver): Chrome driver
+            network_policy (str): Name from NETWORK_POLICIES
+            allow_resources (bool): Let everything through, e.g. for a test asserting on images
+        """
+        blocked_urls = [] if allow_resources else DriverSetup.NETWORK_POLICIES[network_policy]["blocked_urls"]
+        if not blocked_urls and not getattr(driver, "_blocked_urls", None):
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+        driver._blocked_urls = blocked_urls
+
+    @staticmethod
+    def _apply_network_policy_or_quit(driver, network_policy):
+        """Apply the policy to a driver nobody owns yet, quitting it (and removing its profile copy) on failure"""
+        try:
+            DriverSetup.apply_network_policy(driver, network_policy)
+        except Exception:
+            try:
+                driver.quit()
+            except Exception:
+                # The policy error is the one worth reporting
+                pass
+            raise
+
+    @staticmethod
+    def resolve_binary_paths():
+        """
+        Return the chromedriver (and Chrome) paths, asking Selenium Manager only once
+        The result is cached in memory and on disk, and re-resolved if a cached file disappears
+        or the browser binary changed since, e.g. after Chrome updated itself past the cached driver.
+        Returns:
+            dict: {'driver_path': ..., 'browser_path': ..., 'browser_mtime': ...}
+        """
+        paths = DriverSetup._binary_paths
+        if paths is None and os.path.exists(DriverSetup.DRIVER_CACHE_FILE):
+            try:
+                with open(DriverSetup.DRIVER_CACHE_FILE) as f:
+                    paths = json.load(f)
+            except (OSError, ValueError):
+                paths = None
+
+        if (not paths or not os.path.exists(paths.get("driver_path", ""))
+                or paths.get("browser_mtime") != DriverSetup._browser_mtime(paths.get("browser_path"))):
+            paths = SeleniumManager().binary_paths(["--browser", "chrome"])
+            paths["browser_mtime"] = DriverSetup._browser_mtime(paths.get("browser_path"))
+            os.makedirs(DriverSetup.CACHE_DIR, exist_ok=True)
+            with open(DriverSetup.DRIVER_CACHE_FILE, "w") as f:
+                json.dump(paths, f)
+
+        DriverSetup._binary_paths = paths
+        return paths
+
+    @staticmethod
+    def _browser_mtime(browser_path):
+        """Modification time of the browser binary, None when there is none to check"""
+        try:
+            return os.path.getmtime(browser_path) if browser_path else None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _profile_from_template():
+        """Copy the pre-built profile template (building it on first use) into a fresh directory"""
+        with DriverSetup._template_lock:
+            if not os.path.isdir(DriverSetup.PROFILE_TEMPLATE_DIR):
+                DriverSetup._build_profile_template()
+
+        profile_dir = tempfile.mkdtemp(prefix="chrome-profile-")
+        shutil.copytree(DriverSetup.PROFILE_TEMPLATE_DIR, profile_dir, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns("Singleton*", "*.lock", "Crashpad"))
+        return profile_dir
+
+    @staticmethod
+    def _build_profile_template():
+        """Launch Chrome once so first-run work is done and stored in the template"""
+        paths = DriverSetup.resolve_binary_paths()
+        chrome_options = DriverSetup.build_options(fast_startup=True)
+        if paths.get("browser_path"):
+            chrome_options.binary_location = paths["browser_path"]
+
+        building_dir = DriverSetup.PROFILE_TEMPLATE_DIR + f".building-{os.getpid()}"
+        chrome_options.add_argument(f'--user-data-dir={building_dir}')
+        driver = webdriver.Chrome(options=chrome_options, service=Service(paths["driver_path"]))
+        try:
+            driver.get("about:blank")
+        finally:
+            driver.quit()
+
+        # Another worker may have finished first; either template is fine
+        try:
+            os.rename(building_dir, DriverSetup.PROFILE_TEMPLATE_DIR)
+        except OSError:
+            shutil.rmtree(building_dir, ignore_errors=True)
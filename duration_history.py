@@ -0,0 +1,131 @@
+import glob
+import json
+import os
+import statistics
+from utils.artifacts import Artifacts
+
+class DurationHistory:
+    """Per-test setup/call/teardown durations persisted across runs"""
+
+    FILE = ".test_durations.json"
+    PHASES = ("setup", "call", "teardown")
+
+    # Weight of the newest run in the moving average
+    SMOOTHING = 0.5
+
+    # Predicted duration for a test when there is no history at all
+    DEFAULT_DURATION = 1.0
+
+    def __init__(self, path=FILE):
+        """
+        Args:
+            path (str): History file, created on first save
+        """
+        self.path = path
+        self.entries = self._load(path)
+        self.current = {}
+        self._median = None
+
+    def record(self, node_id, phase, duration):
+        """
+        Record the duration of one test phase in this run
+        Args:
+            node_id (str): pytest node id
+            phase (str): 'setup', 'call' or 'teardown'
+            duration (float): Seconds spent in the phase
+        """
+        self.current.setdefault(node_id, {})[phase] = duration
+
+    def update(self, measurements):
+        """
+        Fold measurements from a run into the history
+        Args:
+            measurements (dict): node id -> {phase: seconds}
+        """
+        for node_id, phases in measurements.items():
+            entry = self.entries.setdefault(node_id, {"runs": 0})
+            for phase, duration in phases.items():
+                previous = entry.get(phase)
+                entry[phase] = duration if previous is None else (
+                    self.SMOOTHING * duration + (1 - self.SMOOTHING) * previous)
+            entry["total"] = sum(entry.get(phase, 0.0) for phase in self.PHASES)
+            entry["runs"] += 1
+        self._median = None
+
+    def save(self):
+        """Merge this run's measurements into the history file"""
+        self.update(self.current)
+        self.current = {}
+        self._write()
+
+    def save_partial(self):
+        """
+        Write this worker's measurements next to its reports, for the parallel runner to merge
+        Returns:
+            str: Path of the partial file
+        """
+        path = os.path.join(Artifacts.directory("reports"), "durations.json")
+        with open(path, "w") as f:
+            json.dump(self.current, f)
+        return path
+
+    def merge_partials(self, pattern=os.path.join("reports", "gw*", "durations.json")):
+        """Fold every worker's partial file into the history and save it"""
+        for path in glob.glob(pattern):
+            with open(path) as f:
+                self.update(json.load(f))
+            os.remove(path)
+        self._write()
+
+    def predict(self, node_id):
+        """
+        Return the expected total duration of a test
+        Unknown tests are predicted at the median of the known ones.
+        """
+        entry = self.entries.get(node_id)
+        if entry is not None:
+            return entry["total"]
+        return self._fallback()
+
+    def longest_first(self, node_ids):
+        """Return node ids ordered by predicted duration, longest first"""
+        return sorted(node_ids, key=self.predict, reverse=True)
+
+    def balance(self, node_ids, workers):
+        """
+        Split node ids into shards of roughly equal predicted time
+        Uses longest-processing-time-first: each test goes to the least loaded shard.
+        Args:
+            node_ids (list): Node ids to distribute
+            workers (int): Number of shards
+        Returns:
+            list: Non-empty shards, each ordered longest first
+        """
+        shards = [[] for _ in range(workers)]
+        loads = [0.0] * workers
+        for node_id in self.longest_first(node_ids):
+            index = loads.index(min(loads))
+            shards[index].append(node_id)
+            loads[index] += self.predict(node_id)
+        return [shard for shard in shards if shard]
+
+    def _fallback(self):
+        if self._median is None:
+            totals = [entry["total"] for entry in self.entries.values()]
+            self._median = statistics.median(totals) if totals else self.DEFAULT_DURATION
+        return self._median
+
+    def _write(self):
+        with open(self.path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def _load(path):
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A corrupt history only costs scheduling quality, never the run
+            return {}
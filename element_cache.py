@@ -0,0 +1,77 @@
+import threading
+
+class ElementCache:
+    """
+    Element handles found on the current page, keyed by locator and kept per driver.
+    Cleared when a page object navigates or clicks; a handle that went stale in between
+    is dropped and looked up again by the caller.
+    """
+
+    # Counters summed over every driver in this process, for the run summary
+    _totals = {"hits": 0, "misses": 0, "stale": 0}
+    _totals_lock = threading.Lock()
+
+    def __init__(self):
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Return the cache attached to a driver, creating it on first use"""
+        cache = getattr(driver, "_element_cache", None)
+        if cache is None:
+            cache = driver._element_cache = cls()
+        return cache
+
+    def get(self, locator):
+        """
+        Args:
+            locator (tuple): Element locator
+        Returns:
+            WebElement: The cached handle, or None (counted as a miss)
+        """
+        element = self._elements.get(locator)
+        self._count("hits" if element is not None else "misses")
+        return element
+
+    def put(self, locator, element):
+        """
+        Keep a handle found on the current page
+        Args:
+            locator (tuple): Element locator
+            element (WebElement): Handle returned for it
+        """
+        self._elements[locator] = element
+
+    def discard(self, locator):
+        """Forget a handle that turned out to be stale"""
+        if self._elements.pop(locator, None) is not None:
+            self._count("stale")
+
+    def clear(self):
+        """Forget every handle, e.g. after a navigation or a click that may have re-rendered the page"""
+        self._elements.clear()
+
+    def _count(self, counter):
+        setattr(self, counter, getattr(self, counter) + 1)
+        with self._totals_lock:
+            self._totals[counter] += 1
+
+    @classmethod
+    def totals(cls):
+        """
+        Returns:
+            dict: Process-wide hits, misses and stale re-resolutions
+        """
+        with cls._totals_lock:
+            return dict(cls._totals)
+
+    @classmethod
+    def format_totals(cls, totals):
+        """Return a one-line summary of totals(), for the terminal and the flow benchmark"""
+        lookups = totals["hits"] + totals["misses"]
+        rate = totals["hits"] / lookups if lookups else 0.0
+        return (f"{lookups} element lookups: {totals['hits']} cache hits ({rate:.0%}), "
+                f"{totals['misses']} misses, {totals['stale']} stale handles re-resolved")
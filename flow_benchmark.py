@@ -0,0 +1,258 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from pages.login_page import LoginPage
+from pages.home_page import HomePage
+from pages.cart_page import CartPage
+from pages.base_page import BasePage
+from utils.browser_pool import BrowserPool
+from utils.driver_setup import DriverSetup
+from utils.element_cache import ElementCache
+from utils.logger import Logger
+from utils.storefront_server import StorefrontServer
+from utils.timing_stats import summarize, regressions
+
+logger = Logger.get_logger(__name__)
+
+class FlowBenchmark:
+    """Runs the canonical storefront flows repeatedly and records latency per flow and per step"""
+
+    def __init__(self, base_url, iterations=10, items=2, warmup=1, username="standard_user",
+                 password="secret_sauce", headless=True, fast_startup=False, network_policy="full"):
+        """
+        Args:
+            base_url (str): Storefront to run against, e.g. a local stand-in
+            iterations (int): Measured runs of the whole flow chain
+            items (int): Products added to the cart in the add_items flow
+            warmup (int): Unmeasured runs before measuring
+            username (str): Login user
+            password (str): Login password
+            headless (bool): Run the browser in headless mode
+            fast_startup (bool): Launch the browser on the tuned start-up path
+            network_policy (str): Name from DriverSetup.NETWORK_POLICIES
+        """
+        if items < 1:
+            raise ValueError("items must be at least 1")
+
+        self.base_url = base_url.rstrip("/") + "/"
+        self.iterations = iterations
+        self.warmup = warmup
+        self.items = items
+        # The first products of the storefront's catalog, read on the first iteration
+        self.products = None
+        self.username = username
+        self.password = password
+        self.driver_factory = lambda: DriverSetup.get_driver(
+            headless=headless, fast_startup=fast_startup, network_policy=network_policy
+        )
+        self.samples = {}
+        self.errors = 0
+        self._recording = False
+
+    def run(self):
+        """
+        Run the warm-up and measured iterations in one reused browser session
+        Returns:
+            dict: Results as produced by results()
+        """
+        LoginPage.URL = self.base_url
+        pool = BrowserPool(size=1, recycle_after=0, reset_url=self.base_url, driver_factory=self.driver_factory)
+        try:
+            for iteration in range(self.warmup + self.iterations):
+                self._recording = iteration >= self.warmup
+                driver = pool.acquire()
+                try:
+                    self.run_iteration(driver)
+                except Exception as e:
+                    logger.error(f"Flow iteration {iteration} failed: {e}")
+                    if self._recording:
+                        self.errors += 1
+                    pool.discard(driver)
+                else:
+                    pool.release(driver)
+        finally:
+            pool.close()
+        return self.results()
+
+    def run_iteration(self, driver):
+        """Run login -> add items -> cart review -> checkout once"""
+        with self._timed("login"):
+            with self._timed("login", "open"):
+                login_page = LoginPage(driver)
+            with self._timed("login", "login"):
+                login_page.login(self.username, self.password)
+                home_page = HomePage(driver)
+                assert home_page.is_home_page_loaded(), "Inventory did not load after login"
+
+        if self.products is None:
+            catalog = list(home_page.get_product_index())
+            if len(catalog) < self.items:
+                raise ValueError(f"items must be between 1 and {len(catalog)}")
+            self.products = catalog[:self.items]
+
+        with self._timed("add_items"):
+            for product in self.products:
+                with self._timed("add_items", "add_product_to_cart_by_name"):
+                    home_page.add_product_to_cart_by_name(product)
+            with self._timed("add_items", "get_cart_badge_count"):
+                assert home_page.get_cart_badge_count() == str(len(self.products)), "Cart badge count is wrong"
+
+        cart_page = CartPage(driver)
+        with self._timed("cart_review"):
+            with self._timed("cart_review", "click_shopping_cart"):
+                home_page.click_shopping_cart()
+            with self._timed("cart_review", "get_cart_snapshot"):
+                assert len(cart_page.get_cart_snapshot()) == len(self.products), "Cart is missing items"
+
+        with self._timed("checkout"):
+            with self._timed("checkout", "click_checkout"):
+                cart_page.click_checkout()
+            with self._timed("checkout", "fill_checkout_information"):
+                cart_page.fill_checkout_information("John", "Doe", "12345")
+            with self._timed("checkout", "click_continue_checkout"):
+                cart_page.click_continue_checkout()
+            with self._timed("checkout", "get_total"):
+                cart_page.get_total()
+            with self._timed("checkout", "click_finish"):
+                cart_page.click_finish()
+                assert cart_page.is_checkout_complete(), "Checkout did not complete"
+
+    def results(self):
+        """
+        Summarize the recorded samples
+        Returns:
+            dict: Run settings, error count and per-flow and per-step latency summaries
+        """
+        flows = {}
+        for flow, samples in self.samples.items():
+            flows[flow] = {
+                "total": summarize(samples["total"]),
+                "steps": {step: summarize(values) for step, values in samples["steps"].items()},
+            }
+        return {
+            "base_url": self.base_url,
+            "iterations": self.iterations,
+            "items": self.items,
+            "errors": self.errors,
+            "flows": flows,
+            "element_cache": ElementCache.totals(),
+        }
+
+    @staticmethod
+    def compare(current, baseline, threshold=0.2):
+        """
+        Compare results against a baseline
+        Args:
+            current (dict): Results of this run
+            baseline (dict): Earlier results
+            threshold (float): Allowed slowdown as a fraction, e.g. 0.2 for 20%
+        Returns:
+            list: One line per flow or step whose p50 or p95 regressed
+        """
+        lines = []
+        for flow, stats in current["flows"].items():
+            before = baseline["flows"].get(flow)
+            if before is None:
+                continue
+            for key, old, new in regressions(stats["total"], before["total"], tolerance=threshold):
+                lines.append(f"{flow} {key}: {old:.3f}s -> {new:.3f}s")
+            for step, step_stats in stats["steps"].items():
+                if step not in before["steps"]:
+                    continue
+                for key, old, new in regressions(step_stats, before["steps"][step], tolerance=threshold):
+                    lines.append(f"{flow}.{step} {key}: {old:.3f}s -> {new:.3f}s")
+        return lines
+
+    @staticmethod
+    def format_results(results):
+        def row(name, stats):
+            if not stats["count"]:
+                return f"{name:45s} {'-':>8s} {'-':>8s} {'-':>8s}"
+            return f"{name:45s} {stats['p50']:8.3f} {stats['p95']:8.3f} {stats['max']:8.3f}"
+
+        lines = [f"{'flow / step':45s} {'p50 s':>8s} {'p95 s':>8s} {'max s':>8s}"]
+        for flow, stats in results["flows"].items():
+            lines.append(row(flow, stats["total"]))
+            for step, step_stats in stats["steps"].items():
+                lines.append(row(f"  {step}", step_stats))
+        lines.append(f"{results['errors']} failed iteration(s) out of {results['iterations']}")
+        if results.get("element_cache"):
+            lines.append(ElementCache.format_totals(results["element_cache"]))
+        return lines
+
+    @contextlib.contextmanager
+    def _timed(self, flow, step=None):
+        """Time a flow (step=None) or one of its steps; nothing is recorded for failed blocks"""
+        with Logger.step(f"{flow}.{step}" if step else flow):
+            started = time.perf_counter()
+            yield
+            duration = time.perf_counter() - started
+
+        if self._recording:
+            samples = self.samples.setdefault(flow, {"total": [], "steps": {}})
+            if step is None:
+                samples["total"].append(duration)
+            else:
+                samples["steps"].setdefault(step, []).append(duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the canonical storefront flows")
+    parser.add_argument("--base-url", default=LoginPage.URL, help="Storefront to run against")
+    parser.add_argument("--local-storefront", action="store_true",
+                        help="Start the local stand-in storefront and run against it")
+    parser.add_argument("--catalog-size", type=int, default=6, help="Products served by the local storefront")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--items", type=int, default=2, help="Products added to the cart per iteration")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--fast-startup", action="store_true")
+    parser.add_argument("--network-policy", choices=sorted(DriverSetup.NETWORK_POLICIES), default="full")
+    parser.add_argument("--no-element-cache", action="store_true", help="Look every element up again")
+    parser.add_argument("--output", default=os.path.join("reports", "flow_benchmark.json"))
+    parser.add_argument("--baseline", help="Earlier output to compare against; exits 1 on a regression")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    BasePage.cache_elements = not args.no_element_cache
+
+    server = None
+    base_url = args.base_url
+    if args.local_storefront:
+        server = StorefrontServer(catalog_size=args.catalog_size)
+        base_url = server.start()
+
+    try:
+        benchmark = FlowBenchmark(
+            base_url, iterations=args.iterations, items=args.items, warmup=args.warmup,
+            headless=not args.headed, fast_startup=args.fast_startup, network_policy=args.network_policy,
+        )
+        results = benchmark.run()
+    finally:
+        if server is not None:
+            server.stop()
+
+    for line in FlowBenchmark.format_results(results):
+        print(line)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        slower = FlowBenchmark.compare(results, baseline, args.threshold)
+        for line in slower:
+            print(f"REGRESSION {line}")
+        if slower:
+            sys.exit(1)
+    if results["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,144 @@
-from selenium.webdriver.common.by import By
-from pages.base_page import BasePage
-
-class HomePage(BasePage):
-    """Page Object for Home/Products Page"""
-    
-    # Locators
-    PAGE_TITLE = (By.CLASS_NAME, "title")
-    PRODUCT_ITEMS = (By.CLASS_NAME, "inventory_item")
-    SHOPPING_CART_BADGE = (By.CLASS_NAME, "shopping_cart_badge")
-    SHOPPING_CART_LINK = (By.CLASS_NAME, "shopping_cart_link")
-    HAMBURGER_MENU = (By.ID, "react-burger-menu-btn")
-    LOGOUT_LINK = (By.ID, "logout_sidebar_link")
-    PRODUCT_SORT = (By.CLASS_NAME, "product_sort_container")
-    
-    def is_home_page_loaded(self):
-        """Verify home page is loaded"""
-        return self.is_displayed(self.PAGE_TITLE)
-    
-    def get_page_title(self):
-        """Get page title text"""
-        return self.get_text(self.PAGE_TITLE)
-    
-    def get_product_count(self):
-        """Get number of products displayed"""
-        products = self.find_elements(self.PRODUCT_ITEMS)
-        return len(products)
-    
-    def add_product_to_cart_by_name(self, product_name):
-        """Add specific product to cart by name"""
-        add_button = (By.XPATH, f"//div[text()='{product_name}']/ancestor::div[@class='inventory_item']//button")
-        self.click(add_button)
-    
-    def get_cart_badge_count(self):
-        """Get shopping cart item count"""
-        try:
-            return self.get_text(self.SHOPPING_CART_BADGE)
-        except:
-            return "0"
-    
-    def click_shopping_cart(self):
-        """Click shopping cart icon"""
-        self.click(self.SHOPPING_CART_LINK)
-    
-    def logout(self):
-        """Logout from application"""
-        self.click(self.HAMBURGER_MENU)
-        self.click(self.LOGOUT_LINK)
-    
-    def get_product_names(self):
-        """Get list of all product names"""
-        products = self.find_elements((By.CLASS_NAME, "inventory_item_name"))
-        return [product.text for product in products]
-    
-    def get_product_prices(self):
-        """Get list of all product prices"""
-        prices = self.find_elements((By.CLASS_NAME, "inventory_item_price"))
-        return [price.text for price in prices]
\ No newline at end of file
+import re
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+class HomePage(BasePage):
+    """Page Object for Home/Products Page"""
+    
+    # Locators
+    PAGE_TITLE = (By.CLASS_NAME, "title")
+    INVENTORY_LIST = (By.CLASS_NAME, "inventory_list")
+    PRODUCT_ITEMS = (By.CLASS_NAME, "inventory_item")
+    PRODUCT_NAME = (By.CLASS_NAME, "inventory_item_name")
+    PRODUCT_PRICE = (By.CLASS_NAME, "inventory_item_price")
+    PRODUCT_BUTTON = (By.TAG_NAME, "button")
+    PRODUCT_TITLE_LINK = (By.CSS_SELECTOR, "a[id$='_title_link']")
+    SHOPPING_CART_BADGE = (By.CLASS_NAME, "shopping_cart_badge")
+    SHOPPING_CART_LINK = (By.CLASS_NAME, "shopping_cart_link")
+    HAMBURGER_MENU = (By.ID, "react-burger-menu-btn")
+    LOGOUT_LINK = (By.ID, "logout_sidebar_link")
+    PRODUCT_SORT = (By.CLASS_NAME, "product_sort_container")
+    
+    # Path relative to LoginPage.URL
+    INVENTORY_PATH = "inventory.html"
+    
+    def is_home_page_loaded(self):
+        """Verify home page is loaded"""
+        return self.is_displayed(self.PAGE_TITLE)
+    
+    def get_page_title(self):
+        """Get page title text"""
+        return self.get_text(self.PAGE_TITLE)
+    
+    def get_product_count(self):
+        """Get number of products displayed"""
+        products = self.find_elements(self.PRODUCT_ITEMS)
+        return len(products)
+    
+    def get_product_index(self, refresh=False):
+        """
+        Map product name to item id, button id and price for the products on the current page.
+        Read once per page load and reused while the list is unchanged.
+        Args:
+            refresh (bool): Read the products again even if the cached index is still current
+        Returns:
+            dict: Name -> {'item_id', 'button_id', 'slug', 'price'}
+        """
+        rows = self.index_items(
+            "products",
+            self.PRODUCT_ITEMS,
+            {
+                "name": (self.PRODUCT_NAME, "text"),
+                "price": (self.PRODUCT_PRICE, "text"),
+                "button_id": (self.PRODUCT_BUTTON, "id"),
+                "link_id": (self.PRODUCT_TITLE_LINK, "id"),
+            },
+            key="name",
+            container_locator=self.INVENTORY_LIST,
+            refresh=refresh,
+        )
+        return {name: self.product_entry(row) for name, row in rows.items()}
+    
+    def find_product(self, product_name):
+        """
+        Look up one product in the index, reading the page again once if it is not there
+        Args:
+            product_name (str): Product name as displayed
+        Returns:
+            dict: The product's index entry
+        """
+        product = self.get_product_index().get(product_name)
+        if product is None:
+            product = self.get_product_index(refresh=True).get(product_name)
+        if product is None:
+            raise ValueError(f"No product named {product_name!r} on the page")
+        return product
+    
+    def add_product_to_cart_by_name(self, product_name):
+        """Add specific product to cart by name"""
+        self.click((By.ID, f"add-to-cart-{self.find_product(product_name)['slug']}"))
+    
+    def get_product_price_by_name(self, product_name):
+        """Get the displayed price of a product by name"""
+        return self.find_product(product_name)["price"]
+    
+    @staticmethod
+    def product_entry(row):
+        """
+        Derive stable ids from a product row read off the page. Button ids switch between
+        'add-to-cart-<slug>' and 'remove-<slug>', so the slug is what stays valid.
+        Args:
+            row (dict): Row with 'price', 'button_id' and 'link_id' ('item_<id>_title_link')
+        Returns:
+            dict: {'item_id', 'button_id', 'slug', 'price'}
+        """
+        button_id = row["button_id"] or ""
+        match = re.match(r"item_(\d+)_title_link$", row.get("link_id") or "")
+        return {
+            "item_id": int(match.group(1)) if match else None,
+            "button_id": button_id,
+            "slug": re.sub(r"^(add-to-cart|remove)-", "", button_id),
+            "price": row["price"],
+        }
+    
+    def get_cart_badge_count(self):
+        """Get shopping cart item count, "0" when the badge is not shown"""
+        badge = self.find_optional(self.SHOPPING_CART_BADGE)
+        return badge.text if badge is not None else "0"
+    
+    def is_cart_badge_absent(self):
+        """Check that no cart badge is shown, without waiting for one"""
+        return self.is_absent(self.SHOPPING_CART_BADGE)
+    
+    def open_product(self, product_name):
+        """Open the detail page of a product by clicking its title"""
+        self.click((By.ID, f"item_{self.find_product(product_name)['item_id']}_title_link"))
+    
+    def click_shopping_cart(self):
+        """Click shopping cart icon"""
+        self.click(self.SHOPPING_CART_LINK)
+    
+    def logout(self):
+        """Logout from application"""
+        self.click(self.HAMBURGER_MENU)
+        self.click(self.LOGOUT_LINK)
+    
+    def get_inventory_snapshot(self):
+        """Get name, price and button id of every product in one round-trip"""
+        return self.read_items(
+            self.PRODUCT_ITEMS,
+            {
+                "name": (self.PRODUCT_NAME, "text"),
+                "price": (self.PRODUCT_PRICE, "text"),
+                "button_id": (self.PRODUCT_BUTTON, "id"),
+            },
+            container_locator=self.INVENTORY_LIST,
+        )
+    
+    def get_product_names(self):
+        """Get list of all product names"""
+        return [item["name"] for item in self.get_inventory_snapshot()]
+    
+    def get_product_prices(self):
+        """Get list of all product prices"""
+        return [item["price"] for item in self.get_inventory_snapshot()]
\ No newline at end of file
@@ -0,0 +1,562 @@
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urljoin, urlsplit, urlunsplit
+import urllib3
+from selenium.common.exceptions import (
+    InvalidSelectorException, NoSuchElementException, StaleElementReferenceException, WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+# Elements that never have children or an end tag
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "param", "source", "track", "wbr"}
+
+# Elements whose content is never rendered
+NON_RENDERED_TAGS = {"head", "script", "style", "title", "meta", "link", "template", "noscript"}
+
+# Elements rendered on their own line, used to approximate innerText
+BLOCK_TAGS = {"address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset",
+              "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main",
+              "nav", "ol", "p", "pre", "section", "table", "tr", "ul"}
+
+# Open elements a new start tag closes implicitly, e.g. <li>one<li>two
+IMPLIED_END_TAGS = {
+    "li": {"li"}, "option": {"option"}, "dt": {"dt", "dd"}, "dd": {"dt", "dd"},
+    "tr": {"tr", "td", "th"}, "td": {"td", "th"}, "th": {"td", "th"},
+}
+
+BOOLEAN_ATTRIBUTES = {"checked", "disabled", "hidden", "multiple", "readonly", "required", "selected"}
+
+# One compound selector: optional tag, then #id, .class and [attr op value] parts
+CSS_PART = re.compile(
+    r'#(?P<id>[\w-]+)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~^$*|]?=)\s*(?:"(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\'|(?P<bare>[^\]\s]+))\s*)?\]'
+)
+CSS_TAG = re.compile(r'\*|[a-zA-Z][\w-]*')
+
+
+class _Node:
+    """Element of the parsed document"""
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        # Form control state, changed by clear()/send_keys()/click()
+        self.value = attrs.get("value", "")
+        self.checked = "checked" in attrs or "selected" in attrs
+
+    def iter_descendants(self):
+        for child in self.children:
+            if isinstance(child, _Node):
+                yield child
+                yield from child.iter_descendants()
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def raw_text(self):
+        return "".join(child if isinstance(child, str) else child.raw_text() for child in self.children)
+
+
+class _DocumentParser(HTMLParser):
+    """Builds a _Node tree, tolerating the unclosed tags browsers tolerate"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#document", {}, None)
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        closes = IMPLIED_END_TAGS.get(tag, set())
+        if tag in BLOCK_TAGS and tag != "br":
+            closes = closes | {"p"}
+        while self._stack[-1].tag in closes:
+            self._stack.pop()
+        node = _Node(tag, {name: "" if value is None else value for name, value in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._stack.pop()
+
+    def handle_endtag(self, tag):
+        for index in range(len(self._stack) - 1, 0, -1):
+            if self._stack[index].tag == tag:
+                if tag == "textarea":
+                    self._stack[index].value = self._stack[index].raw_text()
+                del self._stack[index:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+def _parse_selector(selector):
+    """
+    Parse a CSS selector subset into groups of (combinator, compound) steps
+    Supported: tag, *, #id, .class, [attr] and [attr op "value"] with =, ~=, ^=, $=, *= or |=,
+    descendant and child combinators, and comma-separated groups
+    """
+    groups = []
+    for group in selector.split(","):
+        steps = []
+        combinator = " "
+        for token in re.findall(r'>|[^\s>]+(?:\[[^\]]*\])*[^\s>]*', group.strip()):
+            if token == ">":
+                combinator = ">"
+                continue
+            compound = {"tag": None, "parts": []}
+            tag = CSS_TAG.match(token)
+            position = 0
+            if tag:
+                compound["tag"] = None if tag.group() == "*" else tag.group().lower()
+                position = tag.end()
+            while position < len(token):
+                part = CSS_PART.match(token, position)
+                if part is None:
+                    raise InvalidSelectorException(f"CSS selector not supported without a browser: {selector}")
+                compound["parts"].append(part)
+                position = part.end()
+            steps.append((combinator, compound))
+            combinator = " "
+        if not steps:
+            raise InvalidSelectorException(f"Empty CSS selector: {selector}")
+        groups.append(steps)
+    return groups
+
+
+def _matches_compound(node, compound):
+    if compound["tag"] and node.tag != compound["tag"]:
+        return False
+    for part in compound["parts"]:
+        if part.group("id") is not None:
+            if node.attrs.get("id") != part.group("id"):
+                return False
+        elif part.group("cls") is not None:
+            if part.group("cls") not in node.attrs.get("class", "").split():
+                return False
+        else:
+            actual = node.attrs.get(part.group("attr"))
+            if actual is None:
+                return False
+            op = part.group("op")
+            expected = next((value for value in part.group("dq", "sq", "bare") if value is not None), None)
+            if op == "=" and actual != expected:
+                return False
+            if op == "~=" and expected not in actual.split():
+                return False
+            if op == "^=" and not actual.startswith(expected):
+                return False
+            if op == "$=" and not actual.endswith(expected):
+                return False
+            if op == "*=" and expected not in actual:
+                return False
+            if op == "|=" and actual != expected and not actual.startswith(expected + "-"):
+                return False
+    return True
+
+
+def _matches_steps(node, steps):
+    """Match right to left: the node against the last step, its ancestors against the rest"""
+    combinator, compound = steps[-1]
+    if not _matches_compound(node, compound):
+        return False
+    if len(steps) == 1:
+        return True
+    if combinator == ">":
+        return node.parent is not None and _matches_steps(node.parent, steps[:-1])
+    return any(_matches_steps(ancestor, steps[:-1]) for ancestor in node.ancestors())
+
+
+def _select(root, by, value):
+    """Return the descendants of root matching a (By, value) locator, in document order"""
+    if by == By.XPATH:
+        raise InvalidSelectorException(
+            "XPath locators need a browser; the HTTP backend supports ID, NAME, CLASS_NAME, TAG_NAME, "
+            "LINK_TEXT, PARTIAL_LINK_TEXT and simple CSS selectors"
+        )
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        links = [node for node in root.iter_descendants() if node.tag == "a"]
+        if by == By.LINK_TEXT:
+            return [node for node in links if _inner_text(node) == value]
+        return [node for node in links if value in _inner_text(node)]
+
+    if by == By.ID:
+        groups = [[(" ", {"tag": None, "parts": list(CSS_PART.finditer(f'[id="{value}"]'))})]]
+    elif by == By.NAME:
+        groups = [[(" ", {"tag": None, "parts": list(CSS_PART.finditer(f'[name="{value}"]'))})]]
+    elif by == By.CLASS_NAME:
+        groups = [[(" ", {"tag": None, "parts": list(CSS_PART.finditer(f".{value}"))})]]
+    elif by == By.TAG_NAME:
+        groups = [[(" ", {"tag": value.lower(), "parts": []})]]
+    elif by == By.CSS_SELECTOR:
+        groups = _parse_selector(value)
+    else:
+        raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+
+    return [node for node in root.iter_descendants() if any(_matches_steps(node, steps) for steps in groups)]
+
+
+def _inner_text(node):
+    """Approximate innerText: rendered text only, block elements on their own lines"""
+    chunks = []
+
+    def walk(current):
+        for child in current.children:
+            if isinstance(child, str):
+                chunks.append(child)
+            elif child.tag not in NON_RENDERED_TAGS and _is_rendered(child):
+                if child.tag in BLOCK_TAGS:
+                    chunks.append("\n")
+                walk(child)
+                if child.tag in BLOCK_TAGS:
+                    chunks.append("\n")
+
+    walk(node)
+    lines = (" ".join(line.split()) for line in "".join(chunks).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _is_rendered(node):
+    if "hidden" in node.attrs:
+        return False
+    if node.tag == "input" and node.attrs.get("type", "").lower() == "hidden":
+        return False
+    style = node.attrs.get("style", "").replace(" ", "").lower()
+    return "display:none" not in style and "visibility:hidden" not in style
+
+
+class HttpElement:
+    """WebElement look-alike backed by a node of a server-rendered page"""
+
+    def __init__(self, driver, node, document):
+        self._driver = driver
+        self._node = node
+        self._document = document
+
+    @property
+    def tag_name(self):
+        return self._current().tag
+
+    @property
+    def text(self):
+        return _inner_text(self._current())
+
+    def get_attribute(self, name):
+        node = self._current()
+        if name == "value" and node.tag in ("input", "textarea", "select", "option"):
+            return self._value(node)
+        if name in BOOLEAN_ATTRIBUTES:
+            if name in ("checked", "selected"):
+                return "true" if node.checked else None
+            return "true" if name in node.attrs else None
+        return node.attrs.get(name)
+
+    def get_dom_attribute(self, name):
+        return self._current().attrs.get(name)
+
+    def is_displayed(self):
+        node = self._current()
+        if node.tag in NON_RENDERED_TAGS:
+            return False
+        return all(_is_rendered(current) for current in [node, *node.ancestors()] if current.tag != "#document")
+
+    def is_enabled(self):
+        node = self._current()
+        if "disabled" in node.attrs:
+            return False
+        return not any(ancestor.tag == "fieldset" and "disabled" in ancestor.attrs for ancestor in node.ancestors())
+
+    def is_selected(self):
+        return self._current().checked
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element matches {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        return [HttpElement(self._driver, node, self._document) for node in _select(self._current(), by, value)]
+
+    def click(self):
+        """Follow links and submit forms; controls that need scripts do nothing"""
+        node = self._current()
+        if not self.is_enabled():
+            return
+        input_type = node.attrs.get("type", "").lower()
+        if node.tag == "a" and "href" in node.attrs:
+            self._driver.get(urljoin(self._driver.current_url, node.attrs["href"]))
+        elif (node.tag == "button" and input_type in ("", "submit")) or \
+                (node.tag == "input" and input_type in ("submit", "image")):
+            form = self._form(node)
+            if form is not None:
+                self._driver._submit(form, node)
+        elif node.tag == "input" and input_type == "checkbox":
+            node.checked = not node.checked
+        elif node.tag == "input" and input_type == "radio":
+            form = self._form(node) or self._document
+            for other in _select(form, By.NAME, node.attrs.get("name", "")):
+                other.checked = False
+            node.checked = True
+        elif node.tag == "option":
+            select = next((ancestor for ancestor in node.ancestors() if ancestor.tag == "select"), None)
+            if select is not None and "multiple" not in select.attrs:
+                for option in _select(select, By.TAG_NAME, "option"):
+                    option.checked = False
+            node.checked = True
+
+    def clear(self):
+        self._current().value = ""
+
+    def send_keys(self, *value):
+        node = self._current()
+        text = "".join(str(part) for part in value)
+        for char in text:
+            # Keys.RETURN / Keys.ENTER submit the form; other special keys are ignored
+            if char in ("\ue006", "\ue007"):
+                self.submit()
+                return
+            if "\ue000" <= char <= "\uf8ff":
+                continue
+            node.value += char
+
+    def submit(self):
+        form = self._form(self._current())
+        if form is None:
+            raise WebDriverException("Element is not inside a form")
+        self._driver._submit(form, None)
+
+    def _current(self):
+        if self._document is not self._driver._document:
+            raise StaleElementReferenceException("The page changed since the element was found")
+        return self._node
+
+    def _form(self, node):
+        return next((ancestor for ancestor in node.ancestors() if ancestor.tag == "form"), None)
+
+    @staticmethod
+    def _value(node):
+        if node.tag == "select":
+            options = _select(node, By.TAG_NAME, "option")
+            chosen = next((option for option in options if option.checked), options[0] if options else None)
+            return HttpElement._value(chosen) if chosen is not None else ""
+        if node.tag == "option" and "value" not in node.attrs:
+            return _inner_text(node)
+        return node.value
+
+
+class HttpDriver:
+    """
+    Browserless stand-in for WebDriver: fetches server-rendered pages over a pooled
+    HTTP client and applies the page objects' (By, value) locators to the parsed HTML.
+    Links are followed and forms submitted on click; nothing runs JavaScript, so it
+    only fits storefronts that render on the server, such as the local stand-in.
+    """
+
+    # Capability flags BasePage and the wait strategies check before using scripts
+    supports_javascript = False
+    supports_async_scripts = False
+
+    MAX_REDIRECTS = 10
+
+    _shared_pool = None
+    _shared_pool_lock = threading.Lock()
+
+    def __init__(self, pool=None, timeout=30):
+        """
+        Args:
+            pool (urllib3.PoolManager): Connection pool, defaults to one kept-alive pool shared by all drivers
+            timeout (float): Seconds per request
+        """
+        self._pool = pool or self.shared_pool()
+        self._timeout = timeout
+        self._cookies = {}
+        self._history = []
+        self._document = _Node("#document", {}, None)
+        self.current_url = "about:blank"
+        self.page_source = ""
+        # Counts document loads, so page objects can tell whether data cached from a page is current
+        self.page_loads = 0
+
+    @classmethod
+    def shared_pool(cls):
+        """Return the process-wide connection pool, so keep-alive connections outlive single tests"""
+        with cls._shared_pool_lock:
+            if cls._shared_pool is None:
+                cls._shared_pool = urllib3.PoolManager(num_pools=4, maxsize=16)
+            return cls._shared_pool
+
+    # -- navigation -------------------------------------------------------
+
+    def get(self, url):
+        self._navigate("GET", url)
+
+    def back(self):
+        if len(self._history) > 1:
+            self._history.pop()
+            self._navigate("GET", self._history.pop())
+
+    def refresh(self):
+        self._navigate("GET", self.current_url, record=False)
+
+    @property
+    def title(self):
+        titles = _select(self._document, By.TAG_NAME, "title")
+        return " ".join(titles[0].raw_text().split()) if titles else ""
+
+    # -- elements ---------------------------------------------------------
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element matches {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        document = self._document
+        return [HttpElement(self, node, document) for node in _select(document, by, value)]
+
+    # -- cookies ----------------------------------------------------------
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self._cookies.values()]
+
+    def get_cookie(self, name):
+        cookie = self._cookies.get(name)
+        return dict(cookie) if cookie else None
+
+    def add_cookie(self, cookie_dict):
+        self._cookies[cookie_dict["name"]] = {
+            "name": cookie_dict["name"],
+            "value": cookie_dict["value"],
+            "path": cookie_dict.get("path", "/"),
+        }
+
+    def delete_cookie(self, name):
+        self._cookies.pop(name, None)
+
+    def delete_all_cookies(self):
+        self._cookies.clear()
+
+    # -- browser-only features --------------------------------------------
+
+    def execute_script(self, script, *args):
+        raise WebDriverException("JavaScript is not available in the browserless HTTP backend")
+
+    def execute_async_script(self, script, *args):
+        raise WebDriverException("JavaScript is not available in the browserless HTTP backend")
+
+    def get_screenshot_as_png(self):
+        raise WebDriverException("Screenshots are not available in the browserless HTTP backend")
+
+    def quit(self):
+        self._cookies.clear()
+        self._document = _Node("#document", {}, None)
+        self.page_loads += 1
+
+    close = quit
+
+    # -- internals --------------------------------------------------------
+
+    def _submit(self, form, submitter):
+        """Submit a form the way a browser does without scripts"""
+        fields = []
+        for node in form.iter_descendants():
+            name = node.attrs.get("name")
+            if not name or "disabled" in node.attrs:
+                continue
+            input_type = node.attrs.get("type", "").lower()
+            if node.tag == "input":
+                if input_type in ("submit", "image", "button", "reset", "file"):
+                    continue
+                if input_type in ("checkbox", "radio") and not node.checked:
+                    continue
+                fields.append((name, node.value if input_type not in ("checkbox", "radio") else
+                               node.attrs.get("value", "on")))
+            elif node.tag in ("textarea", "select"):
+                fields.append((name, HttpElement._value(node)))
+        if submitter is not None and submitter.attrs.get("name"):
+            fields.append((submitter.attrs["name"], submitter.attrs.get("value", "")))
+
+        action = urljoin(self.current_url, form.attrs.get("action") or self.current_url)
+        if form.attrs.get("method", "get").lower() == "post":
+            self._navigate("POST", action, body=urlencode(fields))
+        else:
+            scheme, netloc, path, _, _ = urlsplit(action)
+            self._navigate("GET", urlunsplit((scheme, netloc, path, urlencode(fields), "")))
+
+    def _navigate(self, method, url, body=None, record=True):
+        for _ in range(self.MAX_REDIRECTS + 1):
+            headers = {}
+            cookie_header = self._cookie_header(url)
+            if cookie_header:
+                headers["Cookie"] = cookie_header
+            if body is not None:
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            response = self._pool.request(method, url, body=body, headers=headers, redirect=False,
+                                          retries=False, timeout=self._timeout)
+            self._store_cookies(response.headers.getlist("Set-Cookie"))
+
+            location = response.headers.get("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if response.status in (301, 302, 303):
+                    method, body = "GET", None
+                continue
+            break
+        else:
+            raise WebDriverException(f"Too many redirects loading {url}")
+
+        self.current_url = url
+        self.page_source = response.data.decode("utf-8", errors="replace")
+        parser = _DocumentParser()
+        if "html" in response.headers.get("Content-Type", "text/html"):
+            parser.feed(self.page_source)
+            parser.close()
+        self._document = parser.root
+        self.page_loads += 1
+        if record:
+            self._history.append(url)
+
+    def _cookie_header(self, url):
+        path = urlsplit(url).path or "/"
+        return "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in self._cookies.values()
+                         if path.startswith(cookie.get("path") or "/"))
+
+    def _store_cookies(self, headers):
+        for header in headers:
+            parsed = SimpleCookie()
+            parsed.load(header)
+            for name, morsel in parsed.items():
+                if self._expired(morsel):
+                    self._cookies.pop(name, None)
+                else:
+                    self._cookies[name] = {"name": name, "value": morsel.value, "path": morsel["path"] or "/"}
+
+    @staticmethod
+    def _expired(morsel):
+        if morsel["max-age"]:
+            try:
+                return int(morsel["max-age"]) <= 0
+            except ValueError:
+                return False
+        if morsel["expires"]:
+            try:
+                return parsedate_to_datetime(morsel["expires"]).timestamp() <= time.time()
+            except (TypeError, ValueError):
+                return False
+        return False
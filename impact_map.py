@@ -0,0 +1,357 @@
+import ast
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+from utils.artifacts import Artifacts
+from utils.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+class ImpactMap:
+    """
+    Which page-object methods and locator constants each test touched, recorded at runtime,
+    and selection of the tests affected by the changes made since they were recorded
+    """
+
+    FILE = ".test_impact.json"
+
+    # Changes to these files never affect test behaviour
+    IGNORED_SUFFIXES = (".md", ".txt", ".rst")
+
+    def __init__(self, path=FILE):
+        """
+        Args:
+            path (str): Impact map file, created on first save
+        """
+        self.path = path
+        self.entries = self._load(path)
+        self.current = {}
+        self._recording = None
+        self._locators = {}
+        self._page_files = {}
+        self._repo = None
+
+    def start(self, test_id, page_classes, commit):
+        """
+        Record every page-object call on this thread until stop()
+        Args:
+            test_id (str): pytest node id
+            page_classes (list): BasePage and its subclasses
+            commit (str): Commit checked out for this run, from head()
+        """
+        if not self._page_files:
+            self._index(page_classes)
+        self._recording = self.current.setdefault(test_id, {
+            "commit": commit, "symbols": set(), "complete": True,
+        })
+        sys.setprofile(self._profile)
+
+    def stop(self):
+        """Stop recording the current test"""
+        if self._recording is not None:
+            sys.setprofile(None)
+            self._recording = None
+
+    def mark_incomplete(self, test_id):
+        """A failed phase may have skipped code, so the recorded coverage cannot be trusted"""
+        if test_id in self.current:
+            self.current[test_id]["complete"] = False
+
+    def save(self):
+        """Merge this run's recordings into the map file"""
+        self.update(self._serializable(self.current))
+        self.current = {}
+        self._write()
+
+    def save_partial(self):
+        """
+        Write this worker's recordings next to its reports, for the parallel runner to merge
+        Returns:
+            str: Path of the partial file
+        """
+        path = os.path.join(Artifacts.directory("reports"), "impact.json")
+        with open(path, "w") as f:
+            json.dump(self._serializable(self.current), f)
+        return path
+
+    def merge_partials(self, pattern=os.path.join("reports", "gw*", "impact.json")):
+        """Fold every worker's partial file into the map and save it"""
+        paths = glob.glob(pattern)
+        for path in paths:
+            with open(path) as f:
+                self.update(json.load(f))
+            os.remove(path)
+        if paths:
+            self._write()
+
+    def update(self, recordings):
+        """
+        Replace the entries of the recorded tests
+        Args:
+            recordings (dict): node id -> {commit, symbols, complete}
+        """
+        self.entries.update(recordings)
+
+    def select(self, items, page_classes):
+        """
+        Split collected tests into affected and unaffected ones
+        Args:
+            items (list): Collected pytest items
+            page_classes (list): BasePage and its subclasses
+        Returns:
+            tuple: (selected items, deselected items, reason)
+        """
+        repo = self._repo_root(items)
+        if not self._page_files:
+            self._index(page_classes)
+        if repo is None:
+            return items, [], "not a git checkout, running everything"
+
+        changes = {}
+        for item in items:
+            entry = self.entries.get(item.nodeid)
+            if entry is None or not entry.get("complete") or not entry.get("commit"):
+                continue
+            commit = entry["commit"]
+            if commit not in changes:
+                changes[commit] = self.changed_symbols(repo, commit)
+
+        selected, deselected, stale = [], [], 0
+        for item in items:
+            entry = self.entries.get(item.nodeid)
+            if entry is None or not entry.get("complete") or not entry.get("commit"):
+                stale += 1
+                selected.append(item)
+                continue
+
+            changed = changes[entry["commit"]]
+            if changed is None:
+                return items, [], f"cannot diff against {entry['commit'][:10]} or non-page files changed, " \
+                                  "running everything"
+            test_file = os.path.relpath(os.path.realpath(str(item.path)), repo)
+            if test_file in changed["test_files"] or self._affected(entry["symbols"], changed["symbols"]):
+                selected.append(item)
+            else:
+                deselected.append(item)
+
+        return selected, deselected, f"{stale} test(s) without usable coverage"
+
+    def changed_symbols(self, repo, commit):
+        """
+        Work out what changed in the working tree since a commit
+        Args:
+            repo (str): Git top-level directory
+            commit (str): Commit the coverage was recorded at
+        Returns:
+            dict: {'symbols': set of 'file::Class.member' / 'file::Class' / 'file::', 'test_files': set},
+                  None when a change cannot be mapped to symbols and everything has to run
+        """
+        try:
+            names = self._git(repo, "diff", "--name-status", "--no-renames", commit).splitlines()
+            # Untracked run outputs (reports, histories) are not code; new modules are
+            untracked = [path for path in self._git(repo, "ls-files", "--others", "--exclude-standard").splitlines()
+                         if path.endswith(".py")]
+        except subprocess.CalledProcessError:
+            return None
+
+        page_files = set(self.page_files())
+        changed = {"symbols": set(), "test_files": set()}
+        for status, path in [line.split("\t", 1) for line in names] + [("A", path) for path in untracked]:
+            if path.endswith(self.IGNORED_SUFFIXES):
+                continue
+            if os.path.basename(path).startswith("test_") and path.endswith(".py"):
+                changed["test_files"].add(path)
+            elif path in page_files and status == "M":
+                changed["symbols"] |= self._changed_in_file(repo, commit, path)
+            else:
+                logger.info(f"Impact selection: {path} is not a page object, running everything")
+                return None
+        return changed
+
+    def page_files(self):
+        """Return the repo-relative page-object files seen in any recording"""
+        files = set()
+        for entry in self.entries.values():
+            files.update(symbol.split("::", 1)[0] for symbol in entry["symbols"])
+        return files | set(self._page_files.values())
+
+    def _profile(self, frame, event, arg):
+        if event != "call" or self._recording is None:
+            return
+        code = frame.f_code
+        path = self._page_files.get(code.co_filename)
+        if path is None:
+            return
+
+        symbols = self._recording["symbols"]
+        # Comprehensions and closures count as the method that defines them
+        symbols.add(f"{path}::{getattr(code, 'co_qualname', code.co_name).split('.<locals>', 1)[0]}")
+        for value in frame.f_locals.values():
+            for locator in self._locator_values(value):
+                symbols.update(self._locators.get(locator, ()))
+
+    @staticmethod
+    def _locator_values(value, depth=2):
+        """Yield (By, value) tuples passed as an argument, also inside read_items() field specs"""
+        if isinstance(value, tuple) and len(value) == 2 and all(isinstance(part, str) for part in value):
+            yield value
+        elif depth and isinstance(value, (tuple, list)):
+            for part in value:
+                yield from ImpactMap._locator_values(part, depth - 1)
+        elif depth and isinstance(value, dict):
+            for part in value.values():
+                yield from ImpactMap._locator_values(part, depth - 1)
+
+    def _index(self, page_classes):
+        """Map page files to repo paths and locator values to the constants holding them"""
+        for cls in page_classes:
+            source = sys.modules[cls.__module__].__file__
+            self._repo = self._repo or self._git_root(os.path.dirname(os.path.realpath(source)))
+            if self._repo is None:
+                return
+            path = os.path.relpath(os.path.realpath(source), self._repo)
+            self._page_files[source] = path
+            for name, value in vars(cls).items():
+                if name.isupper() and isinstance(value, tuple) and len(value) == 2 \
+                        and all(isinstance(part, str) for part in value):
+                    self._locators.setdefault(value, set()).add(f"{path}::{cls.__name__}.{name}")
+
+    @staticmethod
+    def head(page_classes):
+        """
+        Return the commit checked out in the repository of the page objects; resolved once per session
+        Args:
+            page_classes (list): BasePage and its subclasses
+        Returns:
+            str: Commit hash, None outside a git checkout
+        """
+        source = sys.modules[page_classes[0].__module__].__file__
+        repo = ImpactMap._git_root(os.path.dirname(os.path.realpath(source)))
+        if repo is None:
+            return None
+        try:
+            return ImpactMap._git(repo, "rev-parse", "HEAD").strip()
+        except subprocess.CalledProcessError:
+            return None
+
+    def _repo_root(self, items):
+        for item in items:
+            return self._git_root(os.path.dirname(os.path.realpath(str(item.path))))
+        return None
+
+    def _changed_in_file(self, repo, commit, path):
+        """Symbols of one modified page file whose lines changed, on either side of the diff"""
+        old_source = self._git(repo, "show", f"{commit}:{path}")
+        with open(os.path.join(repo, path)) as f:
+            new_source = f.read()
+
+        old_lines, new_lines = set(), set()
+        diff = self._git(repo, "diff", "-U0", commit, "--", path)
+        for match in re.finditer(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@", diff, re.MULTILINE):
+            old_start, old_count, new_start, new_count = match.groups()
+            old_lines.update(self._hunk_lines(int(old_start), old_count))
+            new_lines.update(self._hunk_lines(int(new_start), new_count))
+
+        return (self._symbols_at(old_source, old_lines, path) |
+                self._symbols_at(new_source, new_lines, path))
+
+    @staticmethod
+    def _hunk_lines(start, count):
+        count = 1 if count is None else int(count)
+        # A pure insertion (count 0) sits between two lines; both neighbours count as touched
+        return range(start, start + count) if count else (start, start + 1)
+
+    @staticmethod
+    def _symbols_at(source, lines, path):
+        """
+        Map changed line numbers to symbols: a method or class constant becomes 'file::Class.NAME';
+        other class-level lines, or constants that are not locators, affect the whole class ('file::Class');
+        module-level lines affect everything in the file ('file::')
+        """
+        symbols = set()
+        tree = ast.parse(source)
+        covered = set()
+        for node in tree.body:
+            span = set(range(node.lineno, node.end_lineno + 1))
+            if isinstance(node, ast.ClassDef):
+                for statement in node.body:
+                    statement_span = set(range(statement.lineno, statement.end_lineno + 1))
+                    if statement_span & lines:
+                        symbols.add(ImpactMap._class_member(path, node.name, statement))
+                    covered |= statement_span
+                header = set(range(node.lineno, node.body[0].lineno)) | {
+                    decorator.lineno for decorator in node.decorator_list}
+                if header & lines:
+                    symbols.add(f"{path}::{node.name}")
+                covered |= span
+            elif span & lines:
+                symbols.add(f"{path}::")
+                covered |= span
+        if lines - covered - {0}:
+            # Blank lines or comments outside classes are harmless, but be strict about anything else
+            source_lines = source.splitlines()
+            for number in lines - covered:
+                if 0 < number <= len(source_lines) and source_lines[number - 1].strip() \
+                        and not source_lines[number - 1].lstrip().startswith("#"):
+                    symbols.add(f"{path}::")
+        return symbols
+
+    @staticmethod
+    def _class_member(path, class_name, statement):
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return f"{path}::{class_name}.{statement.name}"
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                and isinstance(statement.targets[0], ast.Name):
+            value = statement.value
+            is_locator = (isinstance(value, ast.Tuple) and len(value.elts) == 2
+                          and isinstance(value.elts[0], ast.Attribute)
+                          and isinstance(value.elts[0].value, ast.Name) and value.elts[0].value.id == "By")
+            if is_locator:
+                return f"{path}::{class_name}.{statement.targets[0].id}"
+        return f"{path}::{class_name}"
+
+    @staticmethod
+    def _affected(recorded, changed):
+        for symbol in changed:
+            if symbol.endswith("::"):
+                if any(name.startswith(symbol) for name in recorded):
+                    return True
+            elif symbol in recorded:
+                return True
+            elif "." not in symbol.split("::", 1)[1]:
+                if any(name.startswith(symbol + ".") for name in recorded):
+                    return True
+        return False
+
+    @staticmethod
+    def _serializable(recordings):
+        return {test_id: dict(entry, symbols=sorted(entry["symbols"])) for test_id, entry in recordings.items()}
+
+    @staticmethod
+    def _git_root(directory):
+        try:
+            return ImpactMap._git(directory, "rev-parse", "--show-toplevel").strip()
+        except (subprocess.CalledProcessError, OSError):
+            return None
+
+    @staticmethod
+    def _git(repo, *args):
+        return subprocess.run(["git", "-C", repo, *args], capture_output=True, text=True, check=True).stdout
+
+    def _write(self):
+        with open(self.path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def _load(path):
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A corrupt map only costs selection, the run falls back to everything
+            return {}
@@ -0,0 +1,323 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from pages.login_page import LoginPage
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from pages.cart_page import CartPage
+from utils.browser_pool import BrowserPool
+from utils.driver_setup import DriverSetup
+from utils.logger import Logger
+from utils.storefront_server import StorefrontServer
+from utils.timing_stats import summarize
+
+logger = Logger.get_logger(__name__)
+
+class VirtualUser:
+    """One simulated shopper: its own random stream and a way to time the steps it performs"""
+
+    def __init__(self, generator, index, seed):
+        self.generator = generator
+        self.index = index
+        self.random = random.Random(seed + index)
+        self.scenario = None
+
+    def step(self, name, action):
+        """
+        Run and time one step of the current scenario
+        Args:
+            name (str): Step name, e.g. 'login'
+            action (callable): Performs the step
+        Returns:
+            The action's return value
+        """
+        started = time.perf_counter()
+        try:
+            result = action()
+        except Exception:
+            self.generator.record_step(self.scenario, name, time.perf_counter() - started, failed=True)
+            raise
+        self.generator.record_step(self.scenario, name, time.perf_counter() - started)
+        return result
+
+
+def browse_scenario(user, driver):
+    """Log in, read the catalogue and look at one product"""
+    login_page = LoginPage(driver)
+    user.step("login", lambda: login_page.login(user.generator.username, user.generator.password))
+    home_page = HomePage(driver)
+    products = user.step("get_product_index", home_page.get_product_index)
+    product = user.random.choice(sorted(products))
+    user.step("open_product", lambda: home_page.open_product(product))
+    product_page = ProductPage(driver)
+    user.step("get_product_price", product_page.get_product_price)
+    user.step("click_back_to_products", product_page.click_back_to_products)
+
+
+def add_to_cart_scenario(user, driver):
+    """Log in, add a few products, review the cart and remove one"""
+    login_page = LoginPage(driver)
+    user.step("login", lambda: login_page.login(user.generator.username, user.generator.password))
+    home_page = HomePage(driver)
+    catalog = sorted(user.step("get_product_index", home_page.get_product_index))
+    products = user.random.sample(catalog, user.random.randint(1, min(3, len(catalog))))
+    for product in products:
+        user.step("add_product_to_cart_by_name", lambda: home_page.add_product_to_cart_by_name(product))
+    user.step("click_shopping_cart", home_page.click_shopping_cart)
+    cart_page = CartPage(driver)
+    user.step("get_cart_item_names", cart_page.get_cart_item_names)
+    user.step("remove_item_by_name", lambda: cart_page.remove_item_by_name(products[0]))
+
+
+def checkout_scenario(user, driver):
+    """Log in, buy one product and finish the checkout"""
+    login_page = LoginPage(driver)
+    user.step("login", lambda: login_page.login(user.generator.username, user.generator.password))
+    home_page = HomePage(driver)
+    product = user.random.choice(sorted(user.step("get_product_index", home_page.get_product_index)))
+    user.step("add_product_to_cart_by_name", lambda: home_page.add_product_to_cart_by_name(product))
+    user.step("click_shopping_cart", home_page.click_shopping_cart)
+    cart_page = CartPage(driver)
+    user.step("click_checkout", cart_page.click_checkout)
+    user.step("fill_checkout_information", lambda: cart_page.fill_checkout_information("John", "Doe", "12345"))
+    user.step("click_continue_checkout", cart_page.click_continue_checkout)
+    user.step("get_total", cart_page.get_total)
+    user.step("click_finish", cart_page.click_finish)
+    if not cart_page.is_checkout_complete():
+        raise AssertionError("Checkout did not complete")
+
+
+SCENARIOS = {
+    "browse": browse_scenario,
+    "add_to_cart": add_to_cart_scenario,
+    "checkout": checkout_scenario,
+}
+
+
+class LoadGenerator:
+    """
+    Drives M concurrent virtual users through weighted scenarios. Users share a smaller
+    pool of browser sessions: a session is only held while a scenario runs and goes back
+    to the pool (reset) during think time, so one box sustains more users than browsers.
+    """
+
+    def __init__(self, base_url, users=10, browsers=None, duration=60, ramp_up=10, think_time=(1.0, 3.0),
+                 weights=None, username="standard_user", password="secret_sauce", seed=0,
+                 headless=True, fast_startup=False, network_policy="lean"):
+        """
+        Args:
+            base_url (str): Storefront to put load on
+            users (int): Concurrent virtual users
+            browsers (int): Browser sessions shared by the users, defaults to users
+            duration (float): Seconds of load after the first user started
+            ramp_up (float): Seconds over which user start times are spread
+            think_time (tuple): (min, max) seconds a user pauses between scenarios
+            weights (dict): Scenario name -> relative weight, defaults to equal weights
+            username (str): Login user
+            password (str): Login password
+            seed (int): Seed for scenario choice and think time
+            headless (bool): Run browsers in headless mode
+            fast_startup (bool): Launch browsers on the tuned start-up path
+            network_policy (str): Name from DriverSetup.NETWORK_POLICIES
+        """
+        weights = weights or {name: 1 for name in SCENARIOS}
+        unknown = set(weights) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        self.base_url = base_url.rstrip("/") + "/"
+        self.users = users
+        self.browsers = browsers or users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think_time = think_time
+        self.weights = weights
+        self.username = username
+        self.password = password
+        self.seed = seed
+        self.driver_factory = lambda: DriverSetup.get_driver(
+            headless=headless, fast_startup=fast_startup, network_policy=network_policy
+        )
+        self.steps = {}
+        self.scenarios = {}
+        self._lock = threading.Lock()
+        self._deadline = None
+
+    def run(self):
+        """
+        Ramp up the users, keep them busy until the duration is over and summarize
+        Returns:
+            dict: Results as produced by results()
+        """
+        LoginPage.URL = self.base_url
+        # Scenarios start with LoginPage(driver), so the reset skips navigating back
+        pool = BrowserPool(size=self.browsers, recycle_after=0, driver_factory=self.driver_factory)
+        started = time.monotonic()
+        self._deadline = started + self.duration
+        threads = [
+            threading.Thread(target=self._user_loop, args=(pool, VirtualUser(self, index, self.seed)),
+                             name=f"virtual-user-{index}", daemon=True)
+            for index in range(self.users)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            pool.close()
+        return self.results(time.monotonic() - started)
+
+    def record_step(self, scenario, step, duration, failed=False):
+        """Account one finished step (thread-safe)"""
+        with self._lock:
+            stats = self.steps.setdefault(f"{scenario}.{step}", {"durations": [], "errors": 0})
+            stats["durations"].append(duration)
+            if failed:
+                stats["errors"] += 1
+
+    def results(self, elapsed):
+        """
+        Summarize the run
+        Args:
+            elapsed (float): Wall-clock seconds the run took
+        Returns:
+            dict: Throughput, error rate and latency percentiles per scenario and step
+        """
+        def entry(stats):
+            count = len(stats["durations"])
+            return dict(summarize(stats["durations"]), errors=stats["errors"],
+                        error_rate=stats["errors"] / count if count else 0.0,
+                        throughput=count / elapsed if elapsed else 0.0)
+
+        completed = sum(len(stats["durations"]) for stats in self.scenarios.values())
+        failed = sum(stats["errors"] for stats in self.scenarios.values())
+        return {
+            "base_url": self.base_url,
+            "users": self.users,
+            "browsers": self.browsers,
+            "elapsed": elapsed,
+            "scenarios_per_second": completed / elapsed if elapsed else 0.0,
+            "error_rate": failed / completed if completed else 0.0,
+            "scenarios": {name: entry(stats) for name, stats in sorted(self.scenarios.items())},
+            "steps": {name: entry(stats) for name, stats in sorted(self.steps.items())},
+        }
+
+    @staticmethod
+    def format_results(results):
+        lines = [
+            f"{results['users']} users on {results['browsers']} browsers for {results['elapsed']:.0f}s: "
+            f"{results['scenarios_per_second']:.2f} scenarios/s, {results['error_rate']:.1%} failed",
+            f"{'scenario / step':45s} {'count':>6s} {'err %':>6s} {'/s':>7s} {'p50 s':>7s} {'p95 s':>7s} {'p99 s':>7s}",
+        ]
+        for section in ("scenarios", "steps"):
+            for name, stats in results[section].items():
+                if not stats["count"]:
+                    continue
+                lines.append(
+                    f"{name:45s} {stats['count']:6d} {stats['error_rate'] * 100:6.1f} {stats['throughput']:7.2f} "
+                    f"{stats['p50']:7.3f} {stats['p95']:7.3f} {stats['p99']:7.3f}"
+                )
+        return lines
+
+    def _user_loop(self, pool, user):
+        # Spread user start times evenly over the ramp-up period
+        if self.users > 1:
+            time.sleep(self.ramp_up * user.index / (self.users - 1))
+
+        names = list(self.weights)
+        weights = [self.weights[name] for name in names]
+        while time.monotonic() < self._deadline:
+            user.scenario = user.random.choices(names, weights)[0]
+            started = time.perf_counter()
+            failed = False
+
+            try:
+                driver = pool.acquire(timeout=max(1.0, self._deadline - time.monotonic()))
+            except TimeoutError:
+                break
+            except Exception as e:
+                # A browser that fails to launch costs this scenario, not the whole user
+                driver = None
+                failed = True
+                logger.warning(f"Virtual user {user.index} could not get a browser for {user.scenario}: {e}")
+            if driver is not None:
+                try:
+                    SCENARIOS[user.scenario](user, driver)
+                except Exception as e:
+                    failed = True
+                    logger.warning(f"Virtual user {user.index} failed {user.scenario}: {e}")
+                finally:
+                    pool.release(driver)
+
+            with self._lock:
+                stats = self.scenarios.setdefault(user.scenario, {"durations": [], "errors": 0})
+                stats["durations"].append(time.perf_counter() - started)
+                if failed:
+                    stats["errors"] += 1
+
+            # Think time is spent without holding a browser
+            pause = user.random.uniform(*self.think_time)
+            time.sleep(max(0.0, min(pause, self._deadline - time.monotonic())))
+
+
+def parse_weights(values):
+    """Parse ['browse=5', 'checkout=1'] into {'browse': 5.0, 'checkout': 1.0}"""
+    weights = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Put shopper load on a storefront with the page objects")
+    parser.add_argument("--base-url", default=LoginPage.URL, help="Storefront to put load on")
+    parser.add_argument("--local-storefront", action="store_true",
+                        help="Start the local stand-in storefront and put load on it")
+    parser.add_argument("--catalog-size", type=int, default=6, help="Products served by the local storefront")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--browsers", type=int, default=None, help="Browser sessions shared by the users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of load")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Seconds over which users start")
+    parser.add_argument("--think-time", type=float, nargs=2, default=[1.0, 3.0], metavar=("MIN", "MAX"))
+    parser.add_argument("--scenario", action="append", default=[], metavar="NAME=WEIGHT",
+                        help=f"Weighted scenario, repeatable; one of {', '.join(SCENARIOS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fast-startup", action="store_true")
+    parser.add_argument("--network-policy", choices=sorted(DriverSetup.NETWORK_POLICIES), default="lean")
+    parser.add_argument("--output", default=os.path.join("reports", "load.json"))
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if args.local_storefront:
+        server = StorefrontServer(catalog_size=args.catalog_size)
+        base_url = server.start()
+
+    try:
+        generator = LoadGenerator(
+            base_url, users=args.users, browsers=args.browsers, duration=args.duration, ramp_up=args.ramp_up,
+            think_time=tuple(args.think_time), weights=parse_weights(args.scenario) or None, seed=args.seed,
+            fast_startup=args.fast_startup, network_policy=args.network_policy,
+        )
+        results = generator.run()
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if server is not None:
+            server.stop()
+
+    for line in LoadGenerator.format_results(results):
+        print(line)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
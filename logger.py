@@ -1,47 +1,196 @@
-import logging
-import os
-from datetime import datetime
-
-class Logger:
-    """Custom logger for test execution"""
-    
-    @staticmethod
-    def get_logger(name=__name__):
-        """
-        Create and configure logger
-        Args:
-            name (str): Logger name
-        Returns:
-            Logger: Configured logger instance
-        """
-        logger = logging.getLogger(name)
-        logger.setLevel(logging.INFO)
-        
-        # Create logs directory if it doesn't exist
-        if not os.path.exists('logs'):
-            os.makedirs('logs')
-        
-        # File handler
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        fh = logging.FileHandler(f'logs/test_execution_{timestamp}.log')
-        fh.setLevel(logging.INFO)
-        
-        # Console handler
-        ch = logging.StreamHandler()
-        ch.setLevel(logging.INFO)
-        
-        # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        fh.setFormatter(formatter)
-        ch.setFormatter(formatter)
-        
-        # Add handlers if not already added
-        if not logger.handlers:
-            logger.addHandler(fh)
-            logger.addHandler(ch)
-        
-        return logger
\ No newline at end of file
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime
+from utils.artifacts import Artifacts
+
+class _ContextFilter(logging.Filter):
+    """Stamps every record with the worker, test and step it was emitted under"""
+
+    def filter(self, record):
+        record.worker = Artifacts.worker_id()
+        record.test_id = Logger._test_id.get()
+        record.phase = Logger._phase.get()
+        record.step = Logger._step.get()
+        return True
+
+
+class _ConsoleFilter(logging.Filter):
+    """Leaves records to the root logger's console handler (e.g. pytest's live logging) when there is one"""
+
+    CONSOLE_STREAMS = ("<stderr>", "<stdout>")
+
+    def filter(self, record):
+        for handler in logging.getLogger().handlers:
+            if type(handler).__name__.startswith("_LiveLogging"):
+                return False
+            stream = getattr(handler, "stream", None)
+            if isinstance(handler, logging.StreamHandler) and getattr(stream, "name", None) in self.CONSOLE_STREAMS:
+                return False
+        return True
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="microseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "worker": record.worker,
+            "test_id": record.test_id,
+            "phase": record.phase,
+            "step": record.step,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread doing only the minimum on the caller's thread"""
+
+    def prepare(self, record):
+        # Resolve args and exceptions now, since they may not be picklable or may change;
+        # all formatting happens on the writer thread
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class Logger:
+    """Run-scoped logging: every logger feeds one queue drained by a single background writer"""
+
+    # Environment defaults, overridden by --console-log-level / --run-log-level
+    CONSOLE_LEVEL = os.environ.get("TEST_LOG_CONSOLE_LEVEL", "INFO")
+    FILE_LEVEL = os.environ.get("TEST_LOG_FILE_LEVEL", "INFO")
+
+    _test_id = contextvars.ContextVar("test_id", default=None)
+    _phase = contextvars.ContextVar("phase", default=None)
+    _step = contextvars.ContextVar("step", default=None)
+
+    _lock = threading.Lock()
+    _queue_handler = None
+    _listener = None
+    _file_handler = None
+    _console_handler = None
+    _loggers = []
+
+    @staticmethod
+    def get_logger(name=__name__):
+        """
+        Return a logger that writes to this run's JSON-lines log and the console
+        Args:
+            name (str): Logger name
+        Returns:
+            Logger: Configured logger instance
+        """
+        logger = logging.getLogger(name)
+        handler = Logger._start()
+
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+            # Records still propagate to the root logger, where pytest captures them for caplog and reports
+            logger.setLevel(Logger._effective_level())
+            Logger._loggers.append(logger)
+
+        return logger
+
+    @staticmethod
+    def configure(console_level=None, file_level=None):
+        """
+        Change verbosity for the console and the run log
+        Args:
+            console_level (str): Level name for the console, e.g. 'WARNING'
+            file_level (str): Level name for the JSON-lines log, e.g. 'DEBUG'
+        """
+        Logger._start()
+        if console_level:
+            Logger.CONSOLE_LEVEL = console_level.upper()
+            Logger._console_handler.setLevel(Logger.CONSOLE_LEVEL)
+        if file_level:
+            Logger.FILE_LEVEL = file_level.upper()
+            Logger._file_handler.setLevel(Logger.FILE_LEVEL)
+
+        # Loggers drop records below both levels before they ever reach the queue
+        for logger in Logger._loggers:
+            logger.setLevel(Logger._effective_level())
+
+    @staticmethod
+    def set_test(test_id, phase=None):
+        """Attach subsequent log records to a test (None clears it)"""
+        Logger._test_id.set(test_id)
+        Logger._phase.set(phase)
+        Logger._step.set(None)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def step(name):
+        """Attach log records emitted inside the block to a named test step"""
+        token = Logger._step.set(name)
+        try:
+            yield
+        finally:
+            Logger._step.reset(token)
+
+    @staticmethod
+    def log_path():
+        """Return the JSON-lines log file of this worker and run"""
+        return os.path.join(Artifacts.directory('logs'), f'test_run_{Artifacts.run_id()}.jsonl')
+
+    @staticmethod
+    def shutdown():
+        """Drain the queue and close the run log"""
+        with Logger._lock:
+            if Logger._listener is not None:
+                Logger._listener.stop()
+                Logger._listener = None
+                Logger._file_handler.close()
+
+    @staticmethod
+    def _start():
+        with Logger._lock:
+            if Logger._queue_handler is None:
+                Logger._file_handler = logging.FileHandler(Logger.log_path(), delay=True)
+                Logger._file_handler.setLevel(Logger.FILE_LEVEL)
+                Logger._file_handler.setFormatter(_JsonLinesFormatter())
+
+                Logger._console_handler = logging.StreamHandler()
+                Logger._console_handler.setLevel(Logger.CONSOLE_LEVEL)
+                Logger._console_handler.addFilter(_ConsoleFilter())
+                Logger._console_handler.setFormatter(logging.Formatter(
+                    '%(asctime)s - %(worker)s - %(name)s - %(levelname)s - %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S'
+                ))
+
+                Logger._queue_handler = _QueueHandler(queue.SimpleQueue())
+                Logger._queue_handler.addFilter(_ContextFilter())
+                atexit.register(Logger.shutdown)
+
+            if Logger._listener is None:
+                # Also restarts the writer after shutdown(), e.g. for a second in-process session
+                Logger._listener = logging.handlers.QueueListener(
+                    Logger._queue_handler.queue, Logger._file_handler, Logger._console_handler,
+                    respect_handler_level=True
+                )
+                Logger._listener.start()
+
+            return Logger._queue_handler
+
+    @staticmethod
+    def _effective_level():
+        return min(logging.getLevelName(Logger.CONSOLE_LEVEL), logging.getLevelName(Logger.FILE_LEVEL))
@@ -1,49 +1,146 @@
-from selenium.webdriver.common.by import By
-from pages.base_page import BasePage
-
-class LoginPage(BasePage):
-    """Page Object for Login Page"""
-    
-    # Locators
-    USERNAME_INPUT = (By.ID, "user-name")
-    PASSWORD_INPUT = (By.ID, "password")
-    LOGIN_BUTTON = (By.ID, "login-button")
-    ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
-    ERROR_BUTTON = (By.CLASS_NAME, "error-button")
-    
-    # URL
-    URL = "https://www.saucedemo.com/"
-    
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.driver.get(self.URL)
-    
-    def enter_username(self, username):
-        """Enter username into username field"""
-        self.enter_text(self.USERNAME_INPUT, username)
-    
-    def enter_password(self, password):
-        """Enter password into password field"""
-        self.enter_text(self.PASSWORD_INPUT, password)
-    
-    def click_login_button(self):
-        """Click login button"""
-        self.click(self.LOGIN_BUTTON)
-    
-    def login(self, username, password):
-        """Complete login process"""
-        self.enter_username(username)
-        self.enter_password(password)
-        self.click_login_button()
-    
-    def is_error_displayed(self):
-        """Check if error message is displayed"""
-        return self.is_displayed(self.ERROR_MESSAGE, timeout=5)
-    
-    def get_error_message(self):
-        """Get error message text"""
-        return self.get_text(self.ERROR_MESSAGE)
-    
-    def is_login_page_loaded(self):
-        """Verify login page is loaded"""
+import os
+import time
+from urllib.parse import urljoin
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from pages.base_page import BasePage
+from pages.home_page import HomePage
+from utils.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+class LoginPage(BasePage):
+    """Page Object for Login Page"""
+    
+    # Locators
+    USERNAME_INPUT = (By.ID, "user-name")
+    PASSWORD_INPUT = (By.ID, "password")
+    LOGIN_BUTTON = (By.ID, "login-button")
+    ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
+    ERROR_BUTTON = (By.CLASS_NAME, "error-button")
+    
+    # URL, overridable with STOREFRONT_URL or --storefront-url to target e.g. the local stand-in
+    URL = os.environ.get("STOREFRONT_URL", "https://www.saucedemo.com/")
+    
+    # Captured login state per (username, password), shared by every test in this worker
+    _session_cache = {}
+    
+    CAPTURE_STORAGE_SCRIPT = """
+        return {
+            local: Object.assign({}, window.localStorage),
+            session: Object.assign({}, window.sessionStorage)
+        };
+    """
+    RESTORE_STORAGE_SCRIPT = """
+        var state = arguments[0];
+        Object.keys(state.local).forEach(function(key) { window.localStorage.setItem(key, state.local[key]); });
+        Object.keys(state.session).forEach(function(key) { window.sessionStorage.setItem(key, state.session[key]); });
+    """
+    
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.navigate(self.URL)
+    
+    def enter_username(self, username):
+        """Enter username into username field"""
+        self.enter_text(self.USERNAME_INPUT, username)
+    
+    def enter_password(self, password):
+        """Enter password into password field"""
+        self.enter_text(self.PASSWORD_INPUT, password)
+    
+    def click_login_button(self):
+        """Click login button"""
+        self.click(self.LOGIN_BUTTON)
+    
+    def login(self, username, password, typed=False):
+        """
+        Complete login process
+        Args:
+            username (str): Login user
+            password (str): Login password
+            typed (bool): Type the credentials key by key instead of filling the form in one script
+        """
+        self.fill_form({self.USERNAME_INPUT: username, self.PASSWORD_INPUT: password}, typed=typed)
+        self.click_login_button()
+    
+    def seed_session(self, username, password):
+        """
+        Start an authenticated session without going through the login form.
+        The first call per user logs in through the UI and caches the resulting
+        cookies and storage; later calls inject that state and open the inventory directly.
+        Cached state that has expired or that the storefront no longer accepts is replaced
+        by logging in through the UI again.
+        Args:
+            username (str): Username to log in with
+            password (str): Password to log in with
+        """
+        key = (username, password)
+        state = LoginPage._session_cache.get(key)
+        if state is not None and self._is_expired(state):
+            state = None
+        
+        if state is not None:
+            self.restore_session_state(state)
+            self.navigate(urljoin(self.URL, HomePage.INVENTORY_PATH))
+            if self._on_inventory_page():
+                return
+            logger.info(f"Cached session of {username} was not accepted, logging in again")
+            self.navigate(self.URL)
+        
+        LoginPage._session_cache.pop(key, None)
+        self.login(username, password)
+        self.wait_until(EC.url_contains(HomePage.INVENTORY_PATH), "inventory URL")
+        LoginPage._session_cache[key] = self.capture_session_state()
+    
+    def capture_session_state(self):
+        """Return cookies, localStorage and sessionStorage of the current session"""
+        if self._has_javascript():
+            state = self.driver.execute_script(self.CAPTURE_STORAGE_SCRIPT)
+        else:
+            state = {"local": {}, "session": {}}
+        state["cookies"] = self.driver.get_cookies()
+        return state
+    
+    def restore_session_state(self, state):
+        """Inject previously captured cookies and storage into the current session"""
+        for cookie in state["cookies"]:
+            self.driver.add_cookie(cookie)
+        if self._has_javascript():
+            self.driver.execute_script(self.RESTORE_STORAGE_SCRIPT, state)
+    
+    @staticmethod
+    def _is_expired(state):
+        """Check whether any captured cookie has passed its expiry time"""
+        now = time.time()
+        return any(cookie.get("expiry") is not None and cookie["expiry"] <= now for cookie in state["cookies"])
+    
+    def _on_inventory_page(self):
+        """Wait for the inventory or, when the session was rejected, the login form, and report which one loaded"""
+        try:
+            self.wait_until(
+                lambda driver: driver.find_elements(*HomePage.INVENTORY_LIST) or driver.find_elements(*self.LOGIN_BUTTON),
+                "inventory or login page"
+            )
+        except TimeoutException:
+            return False
+        return (HomePage.INVENTORY_PATH in self.driver.current_url
+                and bool(self.driver.find_elements(*HomePage.INVENTORY_LIST)))
+    
+    @classmethod
+    def clear_session_cache(cls):
+        """Forget every cached login state"""
+        cls._session_cache.clear()
+    
+    def is_error_displayed(self):
+        """Check if error message is displayed"""
+        return self.is_displayed(self.ERROR_MESSAGE, timeout=5)
+    
+    def get_error_message(self):
+        """Get error message text"""
+        return self.get_text(self.ERROR_MESSAGE)
+    
+    def is_login_page_loaded(self):
+        """Verify login page is loaded"""
         return self.is_displayed(self.LOGIN_BUTTON)
\ No newline at end of file
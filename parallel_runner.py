@@ -0,0 +1,220 @@
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from utils.artifacts import Artifacts
+from utils.duration_history import DurationHistory
+from utils.impact_map import ImpactMap
+from utils.command_recorder import CommandRecorder
+from utils.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+class ParallelRunner:
+    """Spreads collected tests across worker processes, each with its own driver and artifacts"""
+
+    # Env var pointing a worker at the file listing the node ids it must run
+    SHARD_ENV = "TEST_WORKER_SHARD"
+
+    # pytest exit codes that mean "nothing went wrong" for a single shard
+    OK_EXIT_CODES = (0, 5)
+
+    # pytest's final result line, e.g. "=== 3 passed, 1 failed in 2.10s ===" or "no tests ran in 0.01s"
+    RESULT_LINE = re.compile(r"^=*\s*(?P<result>(\d+ \w+.*|no tests ran) in [\d.]+s\b.*?)\s*=*$")
+
+    def __init__(self, args, workers, rootdir=".", schedule="duration", state_dir=None):
+        """
+        Args:
+            args (list): Original pytest command line arguments
+            workers (int): Number of worker processes
+            rootdir (str): Directory the workers are started in
+            schedule (str): 'duration' balances shards by predicted time, 'collection' deals round-robin
+            state_dir (str): Directory of the duration history and impact map (pytest's rootdir),
+                             defaults to rootdir
+        """
+        self.args = list(args)
+        self.workers = workers
+        self.rootdir = rootdir
+        self.schedule = schedule
+        self.state_dir = state_dir or rootdir
+        self.history = DurationHistory(os.path.join(self.state_dir, DurationHistory.FILE))
+        self.run_id = Artifacts.run_id()
+
+    def run(self):
+        """
+        Collect, shard, run and merge
+        Returns:
+            int: pytest exit code for the whole run
+        """
+        try:
+            node_ids = self.collect()
+        except subprocess.CalledProcessError as e:
+            return e.returncode
+        if not node_ids:
+            logger.warning("No tests collected, nothing to run in parallel")
+            return 5
+
+        shards = self.shard(node_ids)
+        logger.info(f"Running {len(node_ids)} tests on {len(shards)} workers")
+
+        workers = [f"gw{index}" for index in range(len(shards))]
+        self._clear_worker_artifacts()
+        processes = [self._start_worker(worker, shard) for worker, shard in zip(workers, shards)]
+        exit_codes = {worker: process.wait() for worker, process, _ in processes}
+        for _, _, output in processes:
+            output.close()
+
+        self.merge(workers)
+        self._print_summary(exit_codes)
+
+        failures = [code for code in exit_codes.values() if code not in self.OK_EXIT_CODES]
+        return max(failures) if failures else 0
+
+    def collect(self):
+        """
+        Collect the node ids selected by the original arguments. A failed collection
+        (usage or import error) raises CalledProcessError carrying the child's exit code.
+        Returns:
+            list: Node ids in collection order
+        """
+        command = [sys.executable, "-m", "pytest", *self.args,
+                   "--collect-only", "--verbosity=-1", "--workers", "1"]
+        result = subprocess.run(command, cwd=self.rootdir, capture_output=True, text=True)
+        if result.returncode not in self.OK_EXIT_CODES:
+            print(result.stdout + result.stderr, end="")
+            logger.error(f"Collection failed with exit code {result.returncode}")
+            raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+        return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+    def shard(self, node_ids):
+        """
+        Split node ids into at most one shard per worker
+        Args:
+            node_ids (list): Node ids to distribute
+        Returns:
+            list: One list of node ids per worker
+        """
+        if self.schedule == "duration":
+            return self.history.balance(node_ids, self.workers)
+        
+        shards = [node_ids[index::self.workers] for index in range(self.workers)]
+        return [shard for shard in shards if shard]
+
+    def merge(self, workers):
+        """
+        Merge per-worker logs, reports, durations and impact coverage into run-level files
+        Args:
+            workers (list): Names of the workers this run started, e.g. ['gw0', 'gw1']
+        """
+        self.history.merge_partials(os.path.join(self.rootdir, "reports", "gw*", "durations.json"))
+        ImpactMap(os.path.join(self.state_dir, ImpactMap.FILE)).merge_partials(
+            os.path.join(self.rootdir, "reports", "gw*", "impact.json"))
+        self._merge_logs()
+        self._merge_junit(workers)
+        self._index_screenshots(workers)
+        commands = CommandRecorder.merge_reports(
+            [os.path.join(self.rootdir, "reports", worker, "commands.json") for worker in workers],
+            os.path.join(self.rootdir, "reports", "commands.json"))
+        if commands is not None:
+            print("\n".join(CommandRecorder.format_summary(commands)))
+
+    def _clear_worker_artifacts(self):
+        """Remove worker reports and screenshots of earlier runs, which may have used more workers"""
+        for kind in ("reports", "screenshots"):
+            for path in glob.glob(os.path.join(self.rootdir, kind, "gw*")):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _start_worker(self, worker, shard):
+        report_dir = os.path.join(self.rootdir, "reports", worker)
+        os.makedirs(report_dir, exist_ok=True)
+
+        shard_file = os.path.join(report_dir, "shard.txt")
+        with open(shard_file, "w") as f:
+            f.write("\n".join(shard))
+
+        env = dict(os.environ)
+        env[Artifacts.WORKER_ENV] = worker
+        env[Artifacts.RUN_ENV] = self.run_id
+        env[self.SHARD_ENV] = os.path.abspath(shard_file)
+
+        command = [sys.executable, "-m", "pytest", *self.args,
+                   f"--junitxml={os.path.join('reports', worker, 'junit.xml')}"]
+        output = open(os.path.join(report_dir, "output.txt"), "w")
+        process = subprocess.Popen(command, cwd=self.rootdir, env=env,
+                                   stdout=output, stderr=subprocess.STDOUT)
+        logger.info(f"Started {worker} with {len(shard)} tests (pid {process.pid})")
+        return worker, process, output
+
+    def _merge_logs(self):
+        pattern = os.path.join(self.rootdir, "logs", "gw*", f"test_run_{self.run_id}.jsonl")
+        entries = []
+        for path in glob.glob(pattern):
+            with open(path) as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+
+        # ISO timestamps sort chronologically, interleaving the workers
+        entries.sort(key=lambda entry: entry["ts"])
+        merged = os.path.join(self.rootdir, "logs", f"test_run_{self.run_id}.jsonl")
+        with open(merged, "w") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+    def _merge_junit(self, workers):
+        merged = ET.Element("testsuites", name="parallel run")
+        for worker in workers:
+            path = os.path.join(self.rootdir, "reports", worker, "junit.xml")
+            if not os.path.exists(path):
+                continue
+            root = ET.parse(path).getroot()
+            suites = [root] if root.tag == "testsuite" else list(root)
+            merged.extend(suites)
+
+        ET.ElementTree(merged).write(os.path.join(self.rootdir, "reports", "junit.xml"),
+                                     encoding="utf-8", xml_declaration=True)
+
+    def _index_screenshots(self, workers):
+        index = {}
+        for worker in workers:
+            worker_dir = os.path.join(self.rootdir, "screenshots", worker)
+            if os.path.isdir(worker_dir):
+                index[worker] = sorted(os.listdir(worker_dir))
+
+        with open(os.path.join(self.rootdir, "reports", "screenshots.json"), "w") as f:
+            json.dump(index, f, indent=2)
+
+    def _print_summary(self, exit_codes):
+        for worker, code in sorted(exit_codes.items()):
+            summary = "no result line"
+            with open(os.path.join(self.rootdir, "reports", worker, "output.txt")) as f:
+                # Log records and warnings may follow pytest's own result line
+                for line in f:
+                    match = self.RESULT_LINE.match(line.strip())
+                    if match:
+                        summary = match.group("result")
+            print(f"[{worker}] exit {code}: {summary}")
+
+    @staticmethod
+    def select_shard(items, config):
+        """
+        Keep only the items listed in this worker's shard file, in shard order
+        Args:
+            items (list): Collected pytest items, modified in place
+            config: pytest config
+        """
+        shard_file = os.environ.get(ParallelRunner.SHARD_ENV)
+        if not shard_file:
+            return
+
+        with open(shard_file) as f:
+            order = {node_id: index for index, node_id in enumerate(f.read().splitlines())}
+
+        selected = [item for item in items if item.nodeid in order]
+        deselected = [item for item in items if item.nodeid not in order]
+        selected.sort(key=lambda item: order[item.nodeid])
+
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+import time
+from utils.artifacts import Artifacts
+from utils.driver_setup import DriverSetup
+from utils.logger import Logger
+
+try:
+    import psutil
+except ImportError:
+    # psutil is optional; without it nothing is sampled or reaped
+    psutil = None
+
+logger = Logger.get_logger(__name__)
+
+MB = 1024 * 1024
+
+class ResourceMonitor:
+    """
+    Samples RSS and CPU of the chromedriver/Chrome process tree behind each test's driver and
+    flags tests whose browser memory grows abnormally. Pooled browsers are attributed to whichever
+    test is using them at the time. In contexts mode the whole host browser is sampled, so with
+    several workers a test's numbers include the contexts of the tests running next to it.
+    """
+
+    FILE = "resources.json"
+
+    # Whether process trees can be measured at all
+    available = psutil is not None
+
+    def __init__(self, growth_limit_mb=100, interval=0.5):
+        """
+        Args:
+            growth_limit_mb (float): Flag a test whose browser RSS grows by more than this during the test
+            interval (float): Seconds between two samples
+        """
+        if psutil is None:
+            logger.warning("psutil is not installed, browser resources are not monitored")
+        self.growth_limit = growth_limit_mb * MB
+        self.interval = interval
+        self.tests = {}
+        self._running = {}
+
+    def start(self, test_id, driver):
+        """
+        Start sampling the browser of a test on a background thread
+        Args:
+            test_id (str): pytest node id
+            driver (WebDriver): The test's driver
+        """
+        root = self.driver_process(driver)
+        if root is None:
+            return
+        stop = threading.Event()
+        sample = {"start_rss": None, "peak_rss": 0, "end_rss": None, "start_cpu": None, "end_cpu": None}
+
+        def _sample():
+            while True:
+                rss, cpu = self.tree_usage(root)
+                if sample["start_rss"] is None:
+                    sample["start_rss"], sample["start_cpu"] = rss, cpu
+                sample["peak_rss"] = max(sample["peak_rss"], rss)
+                sample["end_rss"], sample["end_cpu"] = rss, cpu
+                if stop.wait(self.interval):
+                    return
+
+        thread = threading.Thread(target=_sample, name=f"resource-monitor-{test_id}", daemon=True)
+        self._running[test_id] = (thread, stop, root, sample)
+        thread.start()
+
+    def stop(self, test_id):
+        """Take a last sample, while the browser is still alive, and record the test's usage"""
+        running = self._running.pop(test_id, None)
+        if running is None:
+            return
+        thread, stop, root, sample = running
+        stop.set()
+        thread.join()
+        rss, cpu = self.tree_usage(root)
+        if rss:
+            sample["peak_rss"] = max(sample["peak_rss"], rss)
+            sample["end_rss"], sample["end_cpu"] = rss, cpu
+
+        growth = sample["end_rss"] - sample["start_rss"]
+        entry = {
+            "start_mb": sample["start_rss"] / MB,
+            "peak_mb": sample["peak_rss"] / MB,
+            "end_mb": sample["end_rss"] / MB,
+            "growth_mb": growth / MB,
+            "cpu_seconds": max(0.0, sample["end_cpu"] - sample["start_cpu"]),
+            "flagged": growth > self.growth_limit,
+        }
+        self.tests[test_id] = entry
+        if entry["flagged"]:
+            logger.warning(f"Browser memory grew by {entry['growth_mb']:.0f} MB during {test_id}")
+
+    def flagged(self):
+        """Return the node ids of tests whose browser memory grew past the limit"""
+        return [test_id for test_id, entry in self.tests.items() if entry["flagged"]]
+
+    def report(self, path=None):
+        """
+        Write per-test usage to this worker's reports folder
+        Returns:
+            str: Path of the report
+        """
+        path = path or os.path.join(Artifacts.directory("reports"), self.FILE)
+        with open(path, "w") as f:
+            json.dump(self.tests, f, indent=2)
+        return path
+
+    def summary_lines(self, limit=5):
+        """Lines for the terminal summary: flagged tests, then the heaviest browsers"""
+        lines = [f"{test_id}: +{self.tests[test_id]['growth_mb']:.0f} MB (over the growth limit)"
+                 for test_id in self.flagged()]
+        heaviest = sorted(self.tests.items(), key=lambda item: item[1]["peak_mb"], reverse=True)[:limit]
+        for test_id, entry in heaviest:
+            lines.append(f"{test_id}: peak {entry['peak_mb']:.0f} MB, {entry['growth_mb']:+.0f} MB, "
+                         f"{entry['cpu_seconds']:.1f}s CPU")
+        return lines
+
+    @staticmethod
+    def driver_process(driver):
+        """
+        Return the root of a driver's browser tree: its chromedriver, or for a session attached
+        to a context host (which is not in that chromedriver's tree) the host browser itself
+        Returns:
+            psutil.Process: None without psutil or for drivers that launched no process
+        """
+        if psutil is None:
+            return None
+        host_owner = getattr(driver, "_host_owner_pid", None)
+        if host_owner is not None:
+            return ResourceMonitor.browser_process(host_owner)
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is None:
+            return None
+        try:
+            return psutil.Process(process.pid)
+        except psutil.Error:
+            return None
+
+    @staticmethod
+    def browser_process(owner_pid):
+        """
+        Find the main process of a browser launched by the given owner
+        Args:
+            owner_pid (int): pid in the browser's DriverSetup.OWNER_SWITCH
+        Returns:
+            psutil.Process: None without psutil or when no such browser runs
+        """
+        if psutil is None:
+            return None
+        switch = f"{DriverSetup.OWNER_SWITCH}={owner_pid}"
+        for process in psutil.process_iter(["cmdline"]):
+            cmdline = process.info["cmdline"] or ()
+            # Renderer, GPU and utility processes carry --type=; the browser process does not
+            if switch in cmdline and not any(argument.startswith("--type=") for argument in cmdline):
+                return process
+        return None
+
+    @staticmethod
+    def tree_usage(root):
+        """
+        Sum RSS and CPU time over a process and all its descendants
+        Returns:
+            tuple: (RSS in bytes, CPU seconds); processes that exit meanwhile are skipped
+        """
+        rss, cpu = 0, 0.0
+        try:
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return rss, cpu
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system
+            except psutil.Error:
+                continue
+        return rss, cpu
+
+    @staticmethod
+    def driver_rss(driver):
+        """Return the RSS in bytes of a driver's process tree, 0 when it cannot be measured"""
+        root = ResourceMonitor.driver_process(driver)
+        return ResourceMonitor.tree_usage(root)[0] if root is not None else 0
+
+    @staticmethod
+    def reap_orphans(owner_pid=None):
+        """
+        Kill browsers left behind by this framework, together with their chromedriver.
+        A browser is recognised by DriverSetup.OWNER_SWITCH on its command line.
+        Args:
+            owner_pid (int): Kill this owner's browsers (leaked by a live run at its end);
+                             by default only browsers whose owner process is gone are killed
+        Returns:
+            int: Number of processes killed
+        """
+        if psutil is None:
+            # Reaping is on by default, so a missing optional package is not worth a warning on every run
+            logger.debug("psutil is not installed, orphaned browsers are not reaped")
+            return 0
+
+        prefix = f"{DriverSetup.OWNER_SWITCH}="
+        victims = {}
+        for process in psutil.process_iter(["pid", "cmdline"]):
+            owner = next((argument[len(prefix):] for argument in process.info["cmdline"] or ()
+                          if argument.startswith(prefix)), None)
+            if owner is None or not owner.isdigit():
+                continue
+            owner = int(owner)
+            if (owner_pid is not None and owner != owner_pid) or (owner_pid is None and psutil.pid_exists(owner)):
+                continue
+            try:
+                victims[process.pid] = process
+                for child in process.children(recursive=True):
+                    victims[child.pid] = child
+                parent = process.parent()
+                if parent is not None and "chromedriver" in parent.name().lower():
+                    victims[parent.pid] = parent
+            except psutil.Error:
+                continue
+
+        for process in victims.values():
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(list(victims.values()), timeout=5)
+        if victims:
+            logger.warning(f"Reaped {len(victims)} orphaned browser process(es)")
+        return len(victims)
@@ -0,0 +1,188 @@
+import csv
+import json
+import math
+import os
+import random
+import threading
+from array import array
+
+class ScenarioSource:
+    """
+    One JSONL or CSV data file, indexed by the byte offset of each record.
+    Only the offsets are kept in memory; a record is parsed when a test loads it.
+    CSV files need a header line and one record per line.
+    """
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): .jsonl or .csv file
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in (".jsonl", ".csv"):
+            raise ValueError(f"Unsupported scenario file (expected .jsonl or .csv): {path}")
+        self.path = path
+        self.format = extension[1:]
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.header = None
+        self._offsets = None
+
+    @classmethod
+    def open(cls, path):
+        """Return the shared source for a file, so each file is indexed once per process"""
+        path = os.path.abspath(path)
+        with cls._cache_lock:
+            if path not in cls._cache:
+                cls._cache[path] = cls(path)
+            return cls._cache[path]
+
+    def iter_offsets(self):
+        """
+        Stream the file and yield the byte offset of every record
+        Returns:
+            generator: Offsets, in file order
+        """
+        with open(self.path, "rb") as f:
+            if self.format == "csv":
+                self.header = next(csv.reader([f.readline().decode("utf-8")]), [])
+            offset = f.tell()
+            for line in f:
+                if line.strip():
+                    yield offset
+                offset += len(line)
+
+    @property
+    def offsets(self):
+        """Compact array of record offsets, built on first use"""
+        if self._offsets is None:
+            self._offsets = array("q", self.iter_offsets())
+        return self._offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def load(self, index):
+        """
+        Parse one record
+        Args:
+            index (int): Record number
+        Returns:
+            dict: The record
+        """
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[index])
+            line = f.readline().decode("utf-8")
+        if self.format == "jsonl":
+            return json.loads(line)
+        return dict(zip(self.header, next(csv.reader([line]))))
+
+    def find(self, case):
+        """
+        Parse the record whose 'case' field names it, for tests that need one specific record
+        Args:
+            case (str): Record name, e.g. 'locked_out'
+        Returns:
+            dict: The record
+        """
+        for index in range(len(self)):
+            record = self.load(index)
+            if record.get("case") == case:
+                return record
+        raise KeyError(f"No record with case {case!r} in {self.path}")
+
+
+class ScenarioCase:
+    """Reference to one combination of records; cheap to create, loaded only when a test runs"""
+
+    def __init__(self, sources, indexes):
+        self.sources = sources
+        self.indexes = indexes
+
+    @property
+    def id(self):
+        return "-".join(f"{name}{index}" for name, index in zip(self.sources, self.indexes))
+
+    def load(self):
+        """
+        Returns:
+            dict: Source name -> loaded record
+        """
+        return {name: source.load(index)
+                for (name, source), index in zip(self.sources.items(), self.indexes)}
+
+    def __repr__(self):
+        return f"ScenarioCase({self.id})"
+
+
+class ScenarioMatrix:
+    """
+    Cartesian product of named sources. Cases are addressed by their position in the
+    product, so sharding and sampling pick positions without enumerating the matrix.
+    """
+
+    def __init__(self, sources):
+        """
+        Args:
+            sources (dict): Name -> ScenarioSource, e.g. {'user': ..., 'form': ...}
+        """
+        self.sources = dict(sources)
+
+    # Largest shard that is run in full without an explicit limit or rate; every case becomes a test item
+    FULL_RUN_LIMIT = 1000
+
+    @property
+    def size(self):
+        return math.prod(len(source) for source in self.sources.values())
+
+    def shard_size(self, shard=0, shards=1):
+        """Number of cases in one shard before any sampling"""
+        return max(0, math.ceil((self.size - shard) / shards))
+
+    def cases(self, limit=None, rate=None, seed=0, shard=0, shards=1):
+        """
+        Generate the selected cases
+        Args:
+            limit (int): At most this many cases per shard
+            rate (float): Fraction of each shard to keep, e.g. 0.01
+            seed (int): Seed for the sample; the same seed always selects the same cases
+            shard (int): Zero-based shard to generate
+            shards (int): Total number of shards; shards split the matrix without overlap
+        Returns:
+            generator: ScenarioCase objects in matrix order
+        """
+        if not 0 <= shard < shards:
+            raise ValueError(f"Shard {shard} is outside 0..{shards - 1}")
+
+        # Positions shard, shard + shards, shard + 2 * shards, ...
+        shard_size = self.shard_size(shard, shards)
+        keep = shard_size
+        if rate is not None:
+            keep = min(keep, round(shard_size * rate))
+        if limit is not None:
+            keep = min(keep, limit)
+
+        if keep == shard_size:
+            positions = range(shard_size)
+        else:
+            # range() sampling is O(keep), whatever the size of the matrix
+            positions = sorted(random.Random(f"{seed}:{shard}/{shards}").sample(range(shard_size), keep))
+
+        for position in positions:
+            yield ScenarioCase(self.sources, self._indexes(position * shards + shard))
+
+    def _indexes(self, position):
+        """Decode a matrix position into one record index per source (mixed radix)"""
+        indexes = []
+        for source in reversed(list(self.sources.values())):
+            position, index = divmod(position, len(source))
+            indexes.append(index)
+        return tuple(reversed(indexes))
+
+
+def parse_shard(value):
+    """Parse 'i/n' (zero-based i) into (i, n)"""
+    shard, _, shards = value.partition("/")
+    return int(shard), int(shards or 1)
@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import sys
+import time
+from utils.driver_setup import DriverSetup
+from utils.timing_stats import summarize, regressions
+
+MODES = {
+    "default": {"headless": True, "fast_startup": False},
+    "fast": {"headless": True, "fast_startup": True},
+}
+
+def measure_launch(url, headless=True, fast_startup=False):
+    """
+    Time one browser start-up
+    Args:
+        url (str): Page opened as the first navigation
+        headless (bool): Run the browser in headless mode
+        fast_startup (bool): Use the tuned start-up path
+    Returns:
+        float: Seconds from requesting a driver until the first navigation finished
+    """
+    started = time.perf_counter()
+    driver = DriverSetup.get_driver(headless=headless, fast_startup=fast_startup)
+    try:
+        driver.get(url)
+        return time.perf_counter() - started
+    finally:
+        driver.quit()
+
+
+def run(url, launches, modes, warmup=1):
+    """
+    Measure time-to-first-navigation for each start-up mode
+    Args:
+        url (str): Page opened as the first navigation
+        launches (int): Measured launches per mode
+        modes (list): Names from MODES
+        warmup (int): Unmeasured launches per mode, e.g. to build the profile template
+    Returns:
+        dict: Mode name -> summary of the launch times
+    """
+    results = {}
+    for mode in modes:
+        for _ in range(warmup):
+            measure_launch(url, **MODES[mode])
+        samples = [measure_launch(url, **MODES[mode]) for _ in range(launches)]
+        results[mode] = summarize(samples)
+        results[mode]["samples"] = samples
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Chrome time-to-first-navigation per start-up mode")
+    parser.add_argument("--url", default="about:blank", help="Page opened as the first navigation")
+    parser.add_argument("--launches", type=int, default=10, help="Measured launches per mode")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured launches per mode")
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["default", "fast"])
+    parser.add_argument("--output", default=os.path.join("reports", "startup_benchmark.json"))
+    parser.add_argument("--baseline", help="Earlier output to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    results = run(args.url, args.launches, args.modes, args.warmup)
+
+    print(f"{'mode':10s} {'p50 s':>8s} {'p95 s':>8s} {'max s':>8s}")
+    for mode, stats in results.items():
+        print(f"{mode:10s} {stats['p50']:8.3f} {stats['p95']:8.3f} {stats['max']:8.3f}")
+    if "default" in results and "fast" in results:
+        gain = 1 - results["fast"]["p50"] / results["default"]["p50"]
+        print(f"fast start-up p50 is {gain:.0%} faster than default")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failed = False
+        for mode, stats in results.items():
+            if mode not in baseline:
+                continue
+            for key, before, after in regressions(stats, baseline[mode], tolerance=args.tolerance):
+                print(f"REGRESSION {mode} {key}: {before:.3f}s -> {after:.3f}s")
+                failed = True
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Products of the public storefront, keyed by the ids it stores in the cart
+CANONICAL_PRODUCTS = [
+    (0, "Sauce Labs Bike Light", 9.99,
+     "A red light isn't the desired state in testing but it sure helps when riding your bike at night."),
+    (1, "Sauce Labs Bolt T-Shirt", 15.99,
+     "Get your testing superhero on with the Sauce Labs bolt T-shirt."),
+    (2, "Sauce Labs Onesie", 7.99,
+     "Rib snap infant onesie for the junior automation engineer in development."),
+    (3, "Test.allTheThings() T-Shirt (Red)", 15.99,
+     "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests."),
+    (4, "Sauce Labs Backpack", 29.99,
+     "carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with "
+     "unequaled laptop and tablet protection."),
+    (5, "Sauce Labs Fleece Jacket", 49.99,
+     "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling "
+     "everything from a relaxing day outdoors to a busy day at the office."),
+]
+
+# Display order of the canonical products on the inventory page
+CANONICAL_ORDER = [4, 0, 1, 5, 2, 3]
+
+USERS = {"standard_user", "locked_out_user", "problem_user",
+         "performance_glitch_user", "error_user", "visual_user"}
+LOCKED_USERS = {"locked_out_user"}
+PASSWORD = "secret_sauce"
+
+SESSION_COOKIE = "session-username"
+CART_COOKIE = "cart-contents"
+TAX_RATE = 0.08
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Swag Labs</title>
+<script>window.localStorage.setItem("cart-contents", {cart_json});</script>
+</head>
+<body>
+{body}
+</body>
+</html>"""
+
+IMAGE_SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="160" height="160">'
+             '<rect width="160" height="160" fill="#e2231a"/></svg>')
+
+
+class Product:
+    """One catalog entry of the stand-in storefront"""
+
+    def __init__(self, product_id, name, price, description):
+        self.id = product_id
+        self.name = name
+        self.price = price
+        self.description = description
+
+    @property
+    def slug(self):
+        """Id suffix used by the storefront's add/remove buttons"""
+        return self.name.lower().replace(" ", "-")
+
+
+def build_catalog(size):
+    """
+    Build a deterministic catalog
+    Args:
+        size (int): Number of products; the first six are the public storefront's products
+    Returns:
+        list: Products in inventory display order
+    """
+    by_id = {pid: Product(pid, name, price, desc) for pid, name, price, desc in CANONICAL_PRODUCTS}
+    catalog = [by_id[pid] for pid in CANONICAL_ORDER][:size]
+    for pid in range(len(CANONICAL_PRODUCTS), size):
+        price = 5 + (pid * 7919 % 9500) / 100
+        catalog.append(Product(pid, f"Sauce Labs Item {pid:05d}", round(price, 2),
+                               f"Generated catalog item number {pid}."))
+    return catalog
+
+
+class StorefrontHandler(BaseHTTPRequestHandler):
+    """Serves the storefront pages with the DOM contract the page objects expect"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, keep-alive responses stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    # -- request plumbing -------------------------------------------------
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        server = self.server
+        server.inject_latency()
+        if server.should_fail():
+            self._send(500, "<h1>Injected server error</h1>")
+            return
+
+        parsed = urlparse(self.path)
+        self.query = parse_qs(parsed.query)
+        self.form = self._read_form() if method == "POST" else {}
+        self.cookies = SimpleCookie(self.headers.get("Cookie", ""))
+
+        routes = {
+            ("GET", "/"): self.login_page,
+            ("POST", "/"): self.submit_login,
+            ("GET", "/inventory.html"): self.inventory_page,
+            ("GET", "/inventory-item.html"): self.product_page,
+            ("GET", "/cart.html"): self.cart_page,
+            ("POST", "/cart/add"): self.add_to_cart,
+            ("POST", "/cart/remove"): self.remove_from_cart,
+            ("GET", "/checkout-step-one.html"): self.checkout_info_page,
+            ("POST", "/checkout-step-one.html"): self.submit_checkout_info,
+            ("GET", "/checkout-step-two.html"): self.checkout_overview_page,
+            ("POST", "/checkout/finish"): self.finish_checkout,
+            ("GET", "/checkout-complete.html"): self.checkout_complete_page,
+            ("GET", "/logout"): self.logout,
+        }
+        if parsed.path.startswith("/static/img/"):
+            self._send(200, IMAGE_SVG, content_type="image/svg+xml")
+            return
+
+        handler = routes.get((method, parsed.path))
+        if handler is None:
+            self._send(404, "<h1>Not found</h1>")
+            return
+        if parsed.path not in ("/", "/logout") and self.username is None:
+            self.login_page(error=f"Epic sadface: You can only access '{parsed.path}' when you are logged in.")
+            return
+        handler()
+
+    def _read_form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        return {key: values[0] for key, values in parse_qs(body, keep_blank_values=True).items()}
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", cookies=None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for cookie in cookies or []:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _redirect(self, location, cookies=None):
+        self.send_response(303)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        for cookie in cookies or []:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+
+    def _page(self, body, cart=None):
+        cart = self.cart if cart is None else cart
+        self._send(200, PAGE_TEMPLATE.format(cart_json=json.dumps(json.dumps(cart)), body=body))
+
+    # -- state ------------------------------------------------------------
+
+    @property
+    def username(self):
+        morsel = self.cookies.get(SESSION_COOKIE)
+        return morsel.value if morsel and morsel.value in USERS else None
+
+    @property
+    def cart(self):
+        # Comma-separated product ids, the same ids the public storefront keeps in localStorage
+        morsel = self.cookies.get(CART_COOKIE)
+        if not morsel or not morsel.value:
+            return []
+        ids = [int(value) for value in morsel.value.split(",") if value.strip().isdigit()]
+        return [pid for pid in ids if pid in self.server.products]
+
+    @staticmethod
+    def _cart_cookie(cart):
+        return f"{CART_COOKIE}={','.join(str(pid) for pid in cart)}; Path=/"
+
+    # -- fragments --------------------------------------------------------
+
+    def _header(self, title):
+        badge = f'<span class="shopping_cart_badge">{len(self.cart)}</span>' if self.cart else ""
+        return (
+            '<div class="primary_header">'
+            '<div class="bm-menu-wrap"><button id="react-burger-menu-btn" type="button">Open Menu</button>'
+            '<nav class="bm-item-list"><a id="inventory_sidebar_link" href="/inventory.html">All Items</a>'
+            '<a id="logout_sidebar_link" href="/logout">Logout</a></nav></div>'
+            '<div class="app_logo">Swag Labs</div>'
+            f'<div class="shopping_cart_container"><a class="shopping_cart_link" href="/cart.html">{badge}</a></div>'
+            '</div>'
+            f'<div class="header_secondary_container"><span class="title">{title}</span>'
+            '<select class="product_sort_container"><option value="az">Name (A to Z)</option></select></div>'
+        )
+
+    @staticmethod
+    def _button_form(action, button_id, label, fields=None, method="post"):
+        hidden = "".join(f'<input type="hidden" name="{name}" value="{html.escape(str(value))}">'
+                         for name, value in (fields or {}).items())
+        return (f'<form method="{method}" action="{action}">{hidden}'
+                f'<button type="submit" id="{button_id}" name="{button_id}">{label}</button></form>')
+
+    def _cart_button(self, product, next_path, detail=False):
+        in_cart = product.id in self.cart
+        prefix = "remove" if in_cart else "add-to-cart"
+        button_id = prefix if detail else f"{prefix}-{product.slug}"
+        action = "/cart/remove" if in_cart else "/cart/add"
+        label = "Remove" if in_cart else "Add to cart"
+        return self._button_form(action, button_id, label, {"id": product.id, "next": next_path})
+
+    def _cart_items(self, with_remove):
+        items = []
+        for pid in self.cart:
+            product = self.server.products[pid]
+            remove = self._cart_button(product, "/cart.html") if with_remove else ""
+            items.append(
+                '<div class="cart_item"><div class="cart_quantity">1</div><div class="cart_item_label">'
+                f'<a id="item_{product.id}_title_link" href="/inventory-item.html?id={product.id}">'
+                f'<div class="inventory_item_name">{html.escape(product.name)}</div></a>'
+                f'<div class="inventory_item_desc">{html.escape(product.description)}</div>'
+                f'<div class="item_pricebar"><div class="inventory_item_price">${product.price:.2f}</div>'
+                f'{remove}</div></div></div>'
+            )
+        return f'<div class="cart_list">{"".join(items)}</div>'
+
+    # -- pages ------------------------------------------------------------
+
+    def login_page(self, error=None, username=""):
+        error_html = ""
+        if error:
+            error_html = (f'<div class="error-message-container error"><h3 data-test="error">{html.escape(error)}'
+                          '<button class="error-button" type="button">x</button></h3></div>')
+        self._page(
+            '<div class="login_logo">Swag Labs</div>'
+            '<form method="post" action="/" class="login-box">'
+            f'<input id="user-name" name="user-name" type="text" placeholder="Username" value="{html.escape(username)}">'
+            '<input id="password" name="password" type="password" placeholder="Password">'
+            f'{error_html}'
+            '<input id="login-button" name="login-button" type="submit" value="Login">'
+            '</form>',
+            cart=[]
+        )
+
+    def submit_login(self):
+        username = self.form.get("user-name", "")
+        password = self.form.get("password", "")
+        if not username:
+            error = "Epic sadface: Username is required"
+        elif not password:
+            error = "Epic sadface: Password is required"
+        elif username not in USERS or password != PASSWORD:
+            error = "Epic sadface: Username and password do not match any user in this service"
+        elif username in LOCKED_USERS:
+            error = "Epic sadface: Sorry, this user has been locked out."
+        else:
+            self._redirect("/inventory.html", cookies=[f"{SESSION_COOKIE}={username}; Path=/"])
+            return
+        self.login_page(error=error, username=username)
+
+    def inventory_page(self):
+        items = []
+        for product in self.server.catalog:
+            items.append(
+                '<div class="inventory_item">'
+                f'<div class="inventory_item_img"><img class="inventory_item_img" alt="{html.escape(product.name)}" '
+                f'src="/static/img/{product.id}.svg" width="160" height="160"></div>'
+                '<div class="inventory_item_description"><div class="inventory_item_label">'
+                f'<a id="item_{product.id}_title_link" href="/inventory-item.html?id={product.id}">'
+                f'<div class="inventory_item_name">{html.escape(product.name)}</div></a>'
+                f'<div class="inventory_item_desc">{html.escape(product.description)}</div></div>'
+                f'<div class="pricebar"><div class="inventory_item_price">${product.price:.2f}</div>'
+                f'{self._cart_button(product, "/inventory.html")}</div></div></div>'
+            )
+        self._page(self._header("Products") + f'<div class="inventory_list">{"".join(items)}</div>')
+
+    def product_page(self):
+        try:
+            product = self.server.products[int(self.query.get("id", ["-1"])[0])]
+        except (KeyError, ValueError):
+            self._send(404, "<h1>Not found</h1>")
+            return
+        self._page(
+            self._header("")
+            + self._button_form("/inventory.html", "back-to-products", "Back to products", method="get")
+            + '<div class="inventory_details">'
+            f'<img class="inventory_details_img" alt="{html.escape(product.name)}" '
+            f'src="/static/img/{product.id}.svg" width="160" height="160">'
+            f'<div class="inventory_details_name">{html.escape(product.name)}</div>'
+            f'<div class="inventory_details_desc">{html.escape(product.description)}</div>'
+            f'<div class="inventory_details_price">${product.price:.2f}</div>'
+            f'{self._cart_button(product, f"/inventory-item.html?id={product.id}", detail=True)}'
+            '</div>'
+        )
+
+    def cart_page(self):
+        self._page(
+            self._header("Your Cart")
+            + self._cart_items(with_remove=True)
+            + self._button_form("/inventory.html", "continue-shopping", "Continue Shopping", method="get")
+            + self._button_form("/checkout-step-one.html", "checkout", "Checkout", method="get")
+        )
+
+    def add_to_cart(self):
+        self._update_cart(lambda cart, pid: cart if pid in cart else cart + [pid])
+
+    def remove_from_cart(self):
+        self._update_cart(lambda cart, pid: [item for item in cart if item != pid])
+
+    def _update_cart(self, change):
+        try:
+            pid = int(self.form.get("id", ""))
+        except ValueError:
+            pid = None
+        cart = change(self.cart, pid) if pid in self.server.products else self.cart
+        next_path = self.form.get("next", "/inventory.html")
+        if not next_path.startswith("/"):
+            next_path = "/inventory.html"
+        self._redirect(next_path, cookies=[self._cart_cookie(cart)])
+
+    def checkout_info_page(self, error=None, values=None):
+        values = values or {}
+        error_html = ""
+        if error:
+            error_html = (f'<div class="error-message-container error"><h3 data-test="error">{html.escape(error)}'
+                          '<button class="error-button" type="button">x</button></h3></div>')
+        fields = "".join(
+            f'<input id="{name}" name="{name}" type="text" placeholder="{placeholder}" '
+            f'value="{html.escape(values.get(name, ""))}">'
+            for name, placeholder in (("first-name", "First Name"), ("last-name", "Last Name"),
+                                      ("postal-code", "Zip/Postal Code"))
+        )
+        self._page(
+            self._header("Checkout: Your Information")
+            + f'<form method="post" action="/checkout-step-one.html">{fields}{error_html}'
+            '<input id="continue" name="continue" type="submit" value="Continue"></form>'
+            + self._button_form("/cart.html", "cancel", "Cancel", method="get")
+        )
+
+    def submit_checkout_info(self):
+        if not self.form.get("first-name"):
+            error = "Error: First Name is required"
+        elif not self.form.get("last-name"):
+            error = "Error: Last Name is required"
+        elif not self.form.get("postal-code"):
+            error = "Error: Postal Code is required"
+        else:
+            self._redirect("/checkout-step-two.html")
+            return
+        self.checkout_info_page(error=error, values=self.form)
+
+    def checkout_overview_page(self):
+        subtotal = sum(self.server.products[pid].price for pid in self.cart)
+        tax = round(subtotal * TAX_RATE, 2)
+        self._page(
+            self._header("Checkout: Overview")
+            + self._cart_items(with_remove=False)
+            + '<div class="summary_info">'
+            f'<div class="summary_subtotal_label">Item total: ${subtotal:.2f}</div>'
+            f'<div class="summary_tax_label">Tax: ${tax:.2f}</div>'
+            f'<div class="summary_total_label">Total: ${subtotal + tax:.2f}</div></div>'
+            + self._button_form("/inventory.html", "cancel", "Cancel", method="get")
+            + self._button_form("/checkout/finish", "finish", "Finish")
+        )
+
+    def finish_checkout(self):
+        self._redirect("/checkout-complete.html", cookies=[self._cart_cookie([])])
+
+    def checkout_complete_page(self):
+        self._page(
+            self._header("Checkout: Complete!")
+            + '<div class="checkout_complete_container">'
+            '<h2 class="complete-header">Thank you for your order!</h2>'
+            '<div class="complete-text">Your order has been dispatched, and will arrive just as fast '
+            'as the pony can get there!</div>'
+            + self._button_form("/inventory.html", "back-to-products", "Back Home", method="get")
+            + '</div>'
+        )
+
+    def logout(self):
+        self._redirect("/", cookies=[f"{SESSION_COOKIE}=; Path=/; Max-Age=0",
+                                     f"{CART_COOKIE}=; Path=/; Max-Age=0"])
+
+
+class StorefrontServer(ThreadingHTTPServer):
+    """Local stand-in for the public storefront with latency, error and catalog knobs"""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, latency_jitter=0.0,
+                 error_rate=0.0, catalog_size=len(CANONICAL_PRODUCTS), seed=0):
+        """
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free one
+            latency (float): Seconds added to every response
+            latency_jitter (float): Extra random seconds (uniform 0..jitter) added to every response
+            error_rate (float): Fraction of requests answered with HTTP 500
+            catalog_size (int): Number of products on the inventory page
+            seed (int): Seed for the latency and error generators
+        """
+        super().__init__((host, port), StorefrontHandler)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.catalog = build_catalog(catalog_size)
+        self.products = {product.id: product for product in self.catalog}
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the storefront, with trailing slash"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def inject_latency(self):
+        delay = self.latency
+        if self.latency_jitter:
+            with self._random_lock:
+                delay += self._random.uniform(0, self.latency_jitter)
+        if delay:
+            time.sleep(delay)
+
+    def should_fail(self):
+        if not self.error_rate:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    def start(self):
+        """Serve on a background thread and return the base URL"""
+        self._thread = threading.Thread(target=self.serve_forever, name="storefront-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local stand-in storefront")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Extra random seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--catalog-size", type=int, default=len(CANONICAL_PRODUCTS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StorefrontServer(args.host, args.port, args.latency, args.latency_jitter,
+                              args.error_rate, args.catalog_size, args.seed)
+    print(f"Serving stand-in storefront on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from utils.async_webdriver import AsyncConnectionPool
+
+class FakeDriverServer:
+    """
+    Keep-alive HTTP/1.1 server standing in for chromedriver. Each request takes the next
+    scripted reply: 'ok', 'ok-then-close' (answer, then close the idle connection),
+    'drop' (close without answering) or 'partial' (close halfway through the body).
+    """
+    
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+        self.connections = 0
+        self._server = None
+    
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+    
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+    
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                self.requests.append(request_line.split()[0].decode("ascii"))
+                
+                reply = self.replies.pop(0) if self.replies else "ok"
+                if reply == "drop":
+                    return
+                if reply == "partial":
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 20\r\n\r\n{\"value\"")
+                    await writer.drain()
+                    return
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 15\r\n\r\n{\"value\": null}")
+                await writer.drain()
+                if reply == "ok-then-close":
+                    return
+        finally:
+            writer.close()
+
+def exchange(replies, requests):
+    """
+    Send requests one after another through one pool
+    Returns:
+        tuple: (results, each a status or the exception raised; the server)
+    """
+    async def run():
+        server = FakeDriverServer(replies)
+        pool = AsyncConnectionPool("127.0.0.1", await server.start(), maxsize=1, timeout=5)
+        results = []
+        try:
+            for method in requests:
+                try:
+                    status, _ = await pool.request(method, "/session/1/url", {} if method == "POST" else None)
+                    results.append(status)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    results.append(e)
+                # Let the server's close reach the idle connection
+                await asyncio.sleep(0.05)
+        finally:
+            await pool.close()
+            await server.stop()
+        return results, server
+    return asyncio.run(run())
+
+class TestAsyncConnectionPool:
+    """Test cases for connection reuse and when a failed request is sent again"""
+    
+    def test_connection_is_kept_alive(self):
+        """Test that consecutive requests share one connection"""
+        results, server = exchange(["ok", "ok", "ok"], ["POST", "GET", "POST"])
+        
+        assert results == [200, 200, 200]
+        assert server.connections == 1
+    
+    def test_idle_connection_closed_by_the_driver_is_replaced(self):
+        """Test that a connection the driver closed while idle is not used, so even a POST goes through once"""
+        results, server = exchange(["ok-then-close", "ok"], ["GET", "POST"])
+        
+        assert results == [200, 200]
+        assert server.requests == ["GET", "POST"]
+        assert server.connections == 2
+    
+    def test_get_is_resent_when_a_reused_connection_drops(self):
+        """Test that a GET lost on a reused connection is retried on a fresh one"""
+        results, server = exchange(["ok", "drop", "ok"], ["GET", "GET"])
+        
+        assert results == [200, 200]
+        assert server.requests == ["GET", "GET", "GET"]
+        assert server.connections == 2
+    
+    def test_post_is_not_resent_when_a_reused_connection_drops(self):
+        """Test that a POST the driver may already have run is not sent twice"""
+        results, server = exchange(["ok", "drop"], ["GET", "POST"])
+        
+        assert results[0] == 200
+        assert isinstance(results[1], ConnectionError)
+        assert server.requests == ["GET", "POST"]
+    
+    def test_partial_response_is_not_resent(self):
+        """Test that nothing is retried once the driver started answering"""
+        results, server = exchange(["ok", "partial"], ["GET", "GET"])
+        
+        assert isinstance(results[1], asyncio.IncompleteReadError)
+        assert server.requests == ["GET", "GET"]
+    
+    @pytest.mark.parametrize("method", ["GET", "POST"])
+    def test_failure_on_a_fresh_connection_raises(self, method):
+        """Test that only reused connections are retried"""
+        results, server = exchange(["drop"], [method])
+        
+        assert isinstance(results[0], ConnectionError)
+        assert server.requests == [method]
\ No newline at end of file
@@ -0,0 +1,119 @@
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+from utils.element_cache import ElementCache
+
+class FakeElement:
+    """Element whose handle can be made stale, like one from a page that re-rendered"""
+    
+    def __init__(self, text):
+        self._text = text
+        self.stale = False
+    
+    @property
+    def text(self):
+        if self.stale:
+            raise StaleElementReferenceException("stale element reference")
+        return self._text
+    
+    def is_displayed(self):
+        if self.stale:
+            raise StaleElementReferenceException("stale element reference")
+        return True
+    
+    def clear(self):
+        pass
+    
+    def send_keys(self, *value):
+        pass
+
+class FakeDriver:
+    """Returns a new element per lookup; without JavaScript, so every wait checks the page once"""
+    
+    supports_javascript = False
+    
+    def __init__(self):
+        self.found = []
+    
+    def find_element(self, by=By.ID, value=None):
+        element = FakeElement(f"{value} #{len(self.found) + 1}")
+        self.found.append(element)
+        return element
+    
+    def get(self, url):
+        pass
+
+LOCATOR = (By.CLASS_NAME, "summary_total_label")
+
+@pytest.fixture
+def page(monkeypatch):
+    monkeypatch.setattr(BasePage, "cache_elements", True)
+    return BasePage(FakeDriver())
+
+class TestElementCache:
+    """Test cases for the per-driver element handle cache"""
+    
+    def test_repeated_reads_reuse_the_handle(self, page):
+        """Test that a second read on the same page skips the lookup"""
+        assert page.get_text(LOCATOR) == "summary_total_label #1"
+        assert page.get_text(LOCATOR) == "summary_total_label #1"
+        
+        cache = ElementCache.for_driver(page.driver)
+        assert len(page.driver.found) == 1
+        assert (cache.hits, cache.misses, cache.stale) == (1, 1, 0)
+    
+    def test_stale_handle_is_looked_up_again(self, page):
+        """Test that a handle gone stale is dropped and resolved again once"""
+        page.get_text(LOCATOR)
+        page.driver.found[0].stale = True
+        
+        assert page.get_text(LOCATOR) == "summary_total_label #2"
+        assert ElementCache.for_driver(page.driver).stale == 1
+        assert page.get_text(LOCATOR) == "summary_total_label #2", "The fresh handle was not cached"
+        assert len(page.driver.found) == 2
+    
+    def test_stale_handle_in_is_displayed_is_looked_up_again(self, page):
+        """Test that is_displayed drops a stale cached handle instead of raising"""
+        assert page.is_displayed(LOCATOR)
+        page.driver.found[0].stale = True
+        
+        assert page.is_displayed(LOCATOR)
+        assert len(page.driver.found) == 2
+        assert ElementCache.for_driver(page.driver).stale == 1
+    
+    def test_stale_handle_raises_with_cache_disabled(self, page, monkeypatch):
+        """Test that without the cache every read looks the element up and nothing is retried"""
+        monkeypatch.setattr(BasePage, "cache_elements", False)
+        page.get_text(LOCATOR)
+        page.get_text(LOCATOR)
+        assert len(page.driver.found) == 2
+        
+        page.driver.found[-1].stale = True
+        page.driver.find_element = lambda by=By.ID, value=None: page.driver.found[-1]
+        with pytest.raises(StaleElementReferenceException):
+            page.get_text(LOCATOR)
+    
+    def test_navigation_clears_the_cache(self, page):
+        """Test that navigate() forgets handles of the previous page"""
+        page.get_text(LOCATOR)
+        page.navigate("about:blank")
+        
+        assert page.get_text(LOCATOR) == "summary_total_label #2"
+    
+    def test_discard_of_unknown_locator_is_not_counted(self):
+        """Test that only handles actually dropped count as stale"""
+        cache = ElementCache()
+        cache.discard(LOCATOR)
+        cache.put(LOCATOR, FakeElement("x"))
+        cache.discard(LOCATOR)
+        
+        assert cache.stale == 1
+        assert cache.get(LOCATOR) is None
+    
+    def test_format_totals(self):
+        """Test the summary line, including a run without lookups"""
+        assert ElementCache.format_totals({"hits": 0, "misses": 0, "stale": 0}) == \
+            "0 element lookups: 0 cache hits (0%), 0 misses, 0 stale handles re-resolved"
+        assert ElementCache.format_totals({"hits": 3, "misses": 1, "stale": 2}) == \
+            "4 element lookups: 3 cache hits (75%), 1 misses, 2 stale handles re-resolved"
\ No newline at end of file
@@ -0,0 +1,134 @@
+import pytest
+import urllib3
+from selenium.common.exceptions import InvalidSelectorException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from utils.http_driver import HttpDriver
+
+URL = "http://storefront.test/"
+
+INVENTORY = """<!DOCTYPE html>
+<html><head><title>Swag Labs</title><style>.x { color: red }</style></head><body>
+<div id="inventory" class="inventory_list main">
+  <div class="inventory_item" data-test="item-backpack">
+    <a id="item_4_title_link" href="/item?id=4"><div class="inventory_item_name">Sauce Labs Backpack</div></a>
+    <div class="inventory_item_price">$29.99</div>
+    <button id="add-to-cart-backpack" name=add lang="en-US">Add to cart</button>
+  </div>
+  <div class="inventory_item" data-test="item-bike-light">
+    <p>Bike <span class="inventory_item_name">Light</span>
+    <div class="inventory_item_price">$9.99</div>
+    <button id="remove-bike-light" disabled>Remove</button>
+  </div>
+</div>
+<ul class="tags"><li class="tag">one<li class="tag">two</ul>
+<div style="display: none"><span class="note">hidden</span></div>
+</body></html>"""
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status = 200
+        self.data = body.encode("utf-8")
+        self.headers = urllib3.HTTPHeaderDict({"Content-Type": "text/html; charset=utf-8"})
+
+class FakePool:
+    """Serves fixed pages instead of a storefront"""
+    
+    def __init__(self, pages):
+        self.pages = pages
+    
+    def request(self, method, url, **kwargs):
+        return FakeResponse(self.pages[url])
+
+@pytest.fixture
+def driver():
+    driver = HttpDriver(pool=FakePool({URL: INVENTORY, URL + "item?id=4": "<h1 class='title'>Backpack</h1>"}))
+    driver.get(URL)
+    return driver
+
+def texts(elements):
+    return [element.text for element in elements]
+
+class TestHttpDriverLocators:
+    """Test cases for applying (By, value) locators to server-rendered HTML"""
+    
+    def test_basic_strategies(self, driver):
+        """Test ID, NAME, CLASS_NAME and TAG_NAME"""
+        assert driver.find_element(By.ID, "add-to-cart-backpack").text == "Add to cart"
+        assert driver.find_element(By.NAME, "add").get_attribute("id") == "add-to-cart-backpack"
+        assert texts(driver.find_elements(By.CLASS_NAME, "inventory_item_price")) == ["$29.99", "$9.99"]
+        assert len(driver.find_elements(By.TAG_NAME, "BUTTON")) == 2
+        assert driver.title == "Swag Labs"
+    
+    @pytest.mark.parametrize("selector, ids", [
+        ("button[id^='add-to-cart']", ["add-to-cart-backpack"]),
+        ("a[id$='_title_link']", ["item_4_title_link"]),
+        ('[data-test*="bike"] button', ["remove-bike-light"]),
+        ("[class~=main]", ["inventory"]),
+        ("[lang|='en']", ["add-to-cart-backpack"]),
+        ("button[disabled]", ["remove-bike-light"]),
+        ("div#inventory.inventory_list.main", ["inventory"]),
+        ("[data-test='item']", []),
+    ])
+    def test_attribute_selectors(self, driver, selector, ids):
+        """Test compound selectors and every attribute operator"""
+        assert [element.get_attribute("id") for element in driver.find_elements(By.CSS_SELECTOR, selector)] == ids
+    
+    def test_child_and_descendant_combinators(self, driver):
+        """Test that '>' only matches direct children"""
+        assert len(driver.find_elements(By.CSS_SELECTOR, ".inventory_list > .inventory_item")) == 2
+        assert driver.find_elements(By.CSS_SELECTOR, ".inventory_list > .inventory_item_name") == []
+        assert texts(driver.find_elements(By.CSS_SELECTOR, ".inventory_list .inventory_item_name")) == \
+            ["Sauce Labs Backpack", "Light"]
+        assert len(driver.find_elements(By.CSS_SELECTOR, ".inventory_item>*")) == 6
+    
+    def test_groups_are_returned_in_document_order(self, driver):
+        """Test that comma-separated groups match like one selector"""
+        matches = driver.find_elements(By.CSS_SELECTOR, ".inventory_item_price, #inventory")
+        
+        assert [element.get_attribute("id") or element.text for element in matches] == \
+            ["inventory", "$29.99", "$9.99"]
+    
+    def test_unclosed_tags_are_closed_like_a_browser_does(self, driver):
+        """Test implied end tags: <li> closes <li>, a block element closes <p>"""
+        assert texts(driver.find_elements(By.CSS_SELECTOR, "ul.tags > li")) == ["one", "two"]
+        assert len(driver.find_elements(By.CSS_SELECTOR, ".inventory_item > .inventory_item_price")) == 2
+    
+    def test_search_inside_an_element(self, driver):
+        """Test that element.find_elements only looks below the element"""
+        item = driver.find_elements(By.CLASS_NAME, "inventory_item")[1]
+        
+        assert texts(item.find_elements(By.CLASS_NAME, "inventory_item_name")) == ["Light"]
+        assert not item.find_element(By.TAG_NAME, "button").is_enabled()
+    
+    def test_link_text(self, driver):
+        """Test LINK_TEXT and PARTIAL_LINK_TEXT against the rendered text"""
+        assert driver.find_element(By.LINK_TEXT, "Sauce Labs Backpack").get_attribute("href") == "/item?id=4"
+        assert len(driver.find_elements(By.PARTIAL_LINK_TEXT, "Backpack")) == 1
+        assert driver.find_elements(By.LINK_TEXT, "Backpack") == []
+    
+    def test_hidden_content(self, driver):
+        """Test that display:none hides an element and its descendants from is_displayed and text"""
+        assert not driver.find_element(By.CLASS_NAME, "note").is_displayed()
+        assert "hidden" not in driver.find_element(By.TAG_NAME, "body").text
+        assert "color" not in driver.find_element(By.TAG_NAME, "html").text
+    
+    @pytest.mark.parametrize("by, value", [
+        (By.CSS_SELECTOR, "button:hover"),
+        (By.CSS_SELECTOR, "li:nth-child(2)"),
+        (By.CSS_SELECTOR, " , "),
+        (By.XPATH, "//button"),
+    ])
+    def test_unsupported_locators_raise(self, driver, by, value):
+        """Test that locators needing a browser fail loudly instead of matching nothing"""
+        with pytest.raises(InvalidSelectorException):
+            driver.find_elements(by, value)
+    
+    def test_elements_go_stale_after_navigation(self, driver):
+        """Test that a handle from the previous page raises like in a browser"""
+        link = driver.find_element(By.ID, "item_4_title_link")
+        link.click()
+        
+        assert driver.current_url == URL + "item?id=4"
+        assert driver.find_element(By.CLASS_NAME, "title").text == "Backpack"
+        with pytest.raises(StaleElementReferenceException):
+            link.text
\ No newline at end of file
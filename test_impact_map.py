@@ -0,0 +1,190 @@
+import subprocess
+import pytest
+from utils.impact_map import ImpactMap
+
+PAGE = "pages/cart_page.py"
+
+PAGE_SOURCE = '''from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+
+class CartPage(BasePage):
+    """Page Object for Shopping Cart Page"""
+    
+    CHECKOUT_BUTTON = (By.ID, "checkout")
+    TIMEOUT = 5
+    
+    def click_checkout(self):
+        self.click(self.CHECKOUT_BUTTON)
+    
+    def get_total(self):
+        return self.get_text(self.TOTAL)
+
+
+class CheckoutPage(BasePage):
+    """Page Object for the checkout form"""
+    
+    def finish(self):
+        self.click(self.FINISH)
+'''
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com",
+                           *args], capture_output=True, text=True, check=True).stdout
+
+class FakeItem:
+    """Just the parts of a pytest item that selection reads"""
+    
+    def __init__(self, repo, nodeid):
+        self.nodeid = nodeid
+        self.path = repo / nodeid.split("::", 1)[0]
+
+@pytest.fixture
+def repo(tmp_path):
+    """A git checkout with one page file, one helper module, one test file and a README"""
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "utils").mkdir()
+    (tmp_path / PAGE).write_text(PAGE_SOURCE)
+    (tmp_path / "utils" / "helper.py").write_text("VALUE = 1\n")
+    (tmp_path / "test_cart.py").write_text("def test_cart():\n    pass\n")
+    (tmp_path / "README.md").write_text("Readme\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "baseline")
+    return tmp_path
+
+@pytest.fixture
+def impact(repo):
+    """A map whose only recording touched CartPage.click_checkout and its locator"""
+    impact = ImpactMap(str(repo / ".test_impact.json"))
+    impact.update({
+        "test_cart.py::test_checkout": {
+            "commit": git(repo, "rev-parse", "HEAD").strip(),
+            "symbols": [f"{PAGE}::CartPage.click_checkout", f"{PAGE}::CartPage.CHECKOUT_BUTTON"],
+            "complete": True,
+        },
+    })
+    return impact
+
+def edit(repo, old, new, path=PAGE):
+    source = (repo / path).read_text()
+    assert old in source
+    (repo / path).write_text(source.replace(old, new))
+
+def changed(impact, repo):
+    return impact.changed_symbols(str(repo), git(repo, "rev-parse", "HEAD").strip())
+
+class TestChangedSymbols:
+    """Test cases for mapping a diff to page-object symbols"""
+    
+    def test_method_body(self, impact, repo):
+        """Test that a changed method maps to that method only"""
+        edit(repo, "return self.get_text(self.TOTAL)", "return self.get_text(self.TOTAL).strip()")
+        
+        assert changed(impact, repo) == {"symbols": {f"{PAGE}::CartPage.get_total"}, "test_files": set()}
+    
+    def test_locator_constant(self, impact, repo):
+        """Test that a changed locator maps to the constant holding it"""
+        edit(repo, '(By.ID, "checkout")', '(By.ID, "checkout-button")')
+        
+        assert changed(impact, repo)["symbols"] == {f"{PAGE}::CartPage.CHECKOUT_BUTTON"}
+    
+    def test_other_class_constant_falls_back_to_the_class(self, impact, repo):
+        """Test that a constant that is not a locator affects the whole class"""
+        edit(repo, "TIMEOUT = 5", "TIMEOUT = 10")
+        
+        assert changed(impact, repo)["symbols"] == {f"{PAGE}::CartPage"}
+    
+    def test_class_header_falls_back_to_the_class(self, impact, repo):
+        """Test that changing a base class affects the whole class"""
+        edit(repo, "class CheckoutPage(BasePage):", "class CheckoutPage(CartPage):")
+        
+        assert changed(impact, repo)["symbols"] == {f"{PAGE}::CheckoutPage"}
+    
+    def test_module_level_change_falls_back_to_the_file(self, impact, repo):
+        """Test that an import change affects everything in the file"""
+        edit(repo, "from pages.base_page import BasePage", "from pages.base_page import BasePage as Base")
+        
+        assert changed(impact, repo)["symbols"] == {f"{PAGE}::"}
+    
+    def test_deleted_method_maps_on_the_old_side(self, impact, repo):
+        """Test that a method only present before the change is still reported"""
+        edit(repo, "    def get_total(self):\n        return self.get_text(self.TOTAL)\n\n", "")
+        
+        assert f"{PAGE}::CartPage.get_total" in changed(impact, repo)["symbols"]
+    
+    def test_documentation_and_test_files(self, impact, repo):
+        """Test that documentation is ignored and test files are listed separately"""
+        (repo / "README.md").write_text("Changed\n")
+        (repo / "test_cart.py").write_text("def test_cart():\n    assert True\n")
+        
+        assert changed(impact, repo) == {"symbols": set(), "test_files": {"test_cart.py"}}
+    
+    def test_non_page_module_runs_everything(self, impact, repo):
+        """Test that a change outside the page objects cannot be mapped"""
+        (repo / "utils" / "helper.py").write_text("VALUE = 2\n")
+        
+        assert changed(impact, repo) is None
+    
+    def test_new_untracked_module_runs_everything(self, impact, repo):
+        """Test that a new module counts as a change even before it is added to git"""
+        (repo / "utils" / "new_helper.py").write_text("VALUE = 3\n")
+        
+        assert changed(impact, repo) is None
+    
+    def test_unknown_commit_runs_everything(self, impact, repo):
+        """Test that a recording made at a commit this checkout lacks cannot be diffed"""
+        assert impact.changed_symbols(str(repo), "0" * 40) is None
+
+class TestSelect:
+    """Test cases for picking the affected tests"""
+    
+    def test_only_affected_and_unrecorded_tests_run(self, impact, repo):
+        """Test that an unrelated change deselects the recorded test but keeps unrecorded ones"""
+        recorded = FakeItem(repo, "test_cart.py::test_checkout")
+        unrecorded = FakeItem(repo, "test_cart.py::test_new")
+        edit(repo, "return self.get_text(self.TOTAL)", "return self.get_text(self.TOTAL).strip()")
+        
+        selected, deselected, _ = impact.select([recorded, unrecorded], [])
+        
+        assert selected == [unrecorded]
+        assert deselected == [recorded]
+    
+    def test_changed_locator_selects_its_test(self, impact, repo):
+        """Test that a test is selected when a locator it used changes"""
+        item = FakeItem(repo, "test_cart.py::test_checkout")
+        edit(repo, '(By.ID, "checkout")', '(By.ID, "checkout-button")')
+        
+        selected, deselected, _ = impact.select([item], [])
+        
+        assert selected == [item]
+        assert deselected == []
+    
+    def test_unmappable_change_selects_everything(self, impact, repo):
+        """Test that one unmappable change turns selection off"""
+        item = FakeItem(repo, "test_cart.py::test_checkout")
+        (repo / "utils" / "helper.py").write_text("VALUE = 2\n")
+        
+        selected, deselected, reason = impact.select([item], [])
+        
+        assert selected == [item]
+        assert deselected == []
+        assert "running everything" in reason
+
+class TestAffected:
+    """Test cases for matching changed symbols against a recording"""
+    
+    RECORDED = [f"{PAGE}::CartPage.click_checkout", f"{PAGE}::CartPage.CHECKOUT_BUTTON"]
+    
+    @pytest.mark.parametrize("symbol, affected", [
+        (f"{PAGE}::CartPage.click_checkout", True),
+        (f"{PAGE}::CartPage.get_total", False),
+        (f"{PAGE}::CartPage", True),
+        (f"{PAGE}::Cart", False),
+        (f"{PAGE}::CheckoutPage", False),
+        (f"{PAGE}::", True),
+        ("pages/home_page.py::", False),
+    ])
+    def test_affected(self, symbol, affected):
+        """Test exact, whole-class and whole-file matches"""
+        assert ImpactMap._affected(self.RECORDED, {symbol}) is affected
\ No newline at end of file
@@ -0,0 +1,134 @@
+import json
+import pytest
+from utils.scenario_data import ScenarioMatrix, ScenarioSource, parse_shard
+
+def write_jsonl(path, count):
+    path.write_text("".join(json.dumps({"case": f"row{index}", "n": index}) + "\n" for index in range(count)))
+    return ScenarioSource(str(path))
+
+@pytest.fixture
+def matrix(tmp_path):
+    """A 5 x 4 matrix: 20 cases"""
+    return ScenarioMatrix({
+        "user": write_jsonl(tmp_path / "users.jsonl", 5),
+        "cart": write_jsonl(tmp_path / "carts.jsonl", 4),
+    })
+
+class TestScenarioSource:
+    """Test cases for the byte-offset index of one data file"""
+    
+    def test_jsonl_records_load_by_index(self, tmp_path):
+        """Test that blank lines are skipped and each record loads on its own"""
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"case": "a", "n": 1}\n\n{"case": "b", "n": "é"}\n')
+        source = ScenarioSource(str(path))
+        
+        assert len(source) == 2
+        assert source.load(1) == {"case": "b", "n": "é"}
+        assert source.find("a") == {"case": "a", "n": 1}
+    
+    def test_csv_records_use_the_header(self, tmp_path):
+        """Test that CSV rows are keyed by the header line"""
+        path = tmp_path / "forms.csv"
+        path.write_text("case,first_name,postal_code\nvalid,John,12345\nmissing,,\n")
+        source = ScenarioSource(str(path))
+        
+        assert len(source) == 2
+        assert source.load(1) == {"case": "missing", "first_name": "", "postal_code": ""}
+    
+    def test_unknown_case_raises(self, tmp_path):
+        """Test that find() names the missing case"""
+        source = write_jsonl(tmp_path / "rows.jsonl", 2)
+        with pytest.raises(KeyError, match="nope"):
+            source.find("nope")
+    
+    def test_unsupported_extension_raises(self, tmp_path):
+        """Test that only .jsonl and .csv are accepted"""
+        with pytest.raises(ValueError):
+            ScenarioSource(str(tmp_path / "rows.json"))
+
+class TestScenarioMatrix:
+    """Test cases for matrix positions, sharding and sampling"""
+    
+    def test_cases_follow_matrix_order(self, matrix):
+        """Test the mixed-radix decoding: the last source varies fastest"""
+        ids = [case.id for case in matrix.cases()]
+        
+        assert len(ids) == matrix.size == 20
+        assert ids[:5] == ["user0-cart0", "user0-cart1", "user0-cart2", "user0-cart3", "user1-cart0"]
+        assert ids[-1] == "user4-cart3"
+    
+    def test_case_loads_one_record_per_source(self, matrix):
+        """Test that a case loads the records its id names"""
+        case = list(matrix.cases())[6]
+        
+        assert case.id == "user1-cart2"
+        assert case.load() == {"user": {"case": "row1", "n": 1}, "cart": {"case": "row2", "n": 2}}
+    
+    @pytest.mark.parametrize("shards", [1, 3, 7, 20, 25])
+    def test_shards_split_the_matrix_without_overlap(self, matrix, shards):
+        """Test that the shards together cover every case exactly once"""
+        ids = []
+        for shard in range(shards):
+            cases = [case.id for case in matrix.cases(shard=shard, shards=shards)]
+            assert len(cases) == matrix.shard_size(shard, shards)
+            ids.extend(cases)
+        
+        assert sorted(ids) == sorted(case.id for case in matrix.cases())
+    
+    def test_shard_sizes(self, matrix):
+        """Test the ceiling arithmetic, including shards beyond the end of the matrix"""
+        assert [matrix.shard_size(shard, 3) for shard in range(3)] == [7, 7, 6]
+        assert matrix.shard_size(19, 25) == 1
+        assert matrix.shard_size(20, 25) == 0
+    
+    def test_shard_outside_range_raises(self, matrix):
+        """Test that shard i/n needs 0 <= i < n"""
+        with pytest.raises(ValueError):
+            list(matrix.cases(shard=3, shards=3))
+    
+    def test_limit_and_rate_bound_each_shard(self, matrix):
+        """Test that the smaller of limit and rate wins, and neither can exceed the shard"""
+        assert len(list(matrix.cases(limit=4))) == 4
+        assert len(list(matrix.cases(rate=0.5))) == 10
+        assert len(list(matrix.cases(limit=4, rate=0.5))) == 4
+        assert len(list(matrix.cases(limit=3, shard=1, shards=3))) == 3
+        assert len(list(matrix.cases(limit=100))) == 20
+        assert len(list(matrix.cases(rate=0.01))) == 0
+    
+    def test_sample_is_deterministic_and_sorted(self, matrix):
+        """Test that a seed always picks the same cases, in matrix order"""
+        first = [case.id for case in matrix.cases(limit=5, seed=7)]
+        again = [case.id for case in matrix.cases(limit=5, seed=7)]
+        order = [case.id for case in matrix.cases()]
+        
+        assert first == again
+        assert first == sorted(first, key=order.index)
+    
+    def test_sample_stays_inside_its_shard(self, matrix):
+        """Test that sampling a shard only returns positions of that shard"""
+        shard_ids = {case.id for case in matrix.cases(shard=2, shards=4)}
+        sampled = {case.id for case in matrix.cases(limit=3, seed=1, shard=2, shards=4)}
+        
+        assert len(sampled) == 3
+        assert sampled <= shard_ids
+    
+    def test_large_matrix_is_never_enumerated(self, tmp_path):
+        """Test that sampling a huge product is proportional to the sample, not the matrix"""
+        source = write_jsonl(tmp_path / "rows.jsonl", 1000)
+        matrix = ScenarioMatrix({"a": source, "b": source, "c": source})
+        
+        cases = list(matrix.cases(limit=3, seed=3, shard=5, shards=8))
+        
+        assert matrix.size == 10 ** 9
+        assert len(cases) == 3
+        assert len({case.id for case in cases}) == 3
+
+class TestParseShard:
+    """Test cases for the --scenario-shard value"""
+    
+    def test_parse_shard(self):
+        """Test 'i/n' and a bare index"""
+        assert parse_shard("2/8") == (2, 8)
+        assert parse_shard("0/1") == (0, 1)
+        assert parse_shard("3") == (3, 1)
\ No newline at end of file
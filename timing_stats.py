@@ -0,0 +1,56 @@
+import math
+
+def percentile(values, pct):
+    """
+    Return a percentile of a list of numbers using linear interpolation
+    Args:
+        values (list): Samples, in any order
+        pct (float): Percentile between 0 and 100
+    Returns:
+        float: The percentile, None for an empty list
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values):
+    """
+    Summarize timing samples
+    Args:
+        values (list): Durations in seconds
+    Returns:
+        dict: count, min, mean, p50, p95, p99 and max (None values when there are no samples)
+    """
+    return {
+        "count": len(values),
+        "min": min(values) if values else None,
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+def regressions(current, baseline, keys=("p50", "p95"), tolerance=0.2):
+    """
+    Compare two summaries produced by summarize()
+    Args:
+        current (dict): Summary of this run
+        baseline (dict): Summary to compare against
+        keys (tuple): Statistics to compare
+        tolerance (float): Allowed slowdown as a fraction, e.g. 0.2 for 20%
+    Returns:
+        list: (key, baseline value, current value) for every statistic slower than allowed
+    """
+    slower = []
+    for key in keys:
+        before, after = baseline.get(key), current.get(key)
+        if before is not None and after is not None and after > before * (1 + tolerance):
+            slower.append((key, before, after))
+    return slower
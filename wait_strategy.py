@@ -0,0 +1,172 @@
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from utils.command_recorder import CommandRecorder
+
+def locator_to_query(locator):
+    """
+    Translate a (By, value) locator into a query that in-page scripts can resolve
+    Returns:
+        dict: {'css': selector} or {'xpath': expression}, None if the strategy has no in-page equivalent
+    """
+    by, value = locator
+    if by == By.ID:
+        return {"css": f'[id="{value}"]'}
+    if by == By.CLASS_NAME:
+        return {"css": f".{value}"}
+    if by == By.NAME:
+        return {"css": f'[name="{value}"]'}
+    if by in (By.CSS_SELECTOR, By.TAG_NAME):
+        return {"css": value}
+    if by == By.XPATH:
+        return {"xpath": value}
+    return None
+
+
+class PollingWaitStrategy:
+    """Waits for elements by polling from Python with WebDriverWait"""
+
+    CONDITIONS = {
+        "present": EC.presence_of_element_located,
+        "visible": EC.visibility_of_element_located,
+        "clickable": EC.element_to_be_clickable,
+    }
+
+    def __init__(self, poll_frequency=0.5):
+        """
+        Args:
+            poll_frequency (float): Seconds between two checks
+        """
+        self.poll_frequency = poll_frequency
+
+    def wait_for(self, driver, locator, state, timeout):
+        """
+        Wait for an element to reach a state
+        Args:
+            driver (WebDriver): Driver to wait on
+            locator (tuple): Element locator
+            state (str): 'present', 'visible' or 'clickable'
+            timeout (float): Seconds before TimeoutException is raised
+        Returns:
+            WebElement: The matching element
+        """
+        wait = WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency)
+        with CommandRecorder.waiting(driver):
+            return wait.until(self.CONDITIONS[state](locator))
+
+
+class ObserverWaitStrategy:
+    """
+    Waits for elements inside the page with a MutationObserver, resolving in a single
+    async script call as soon as the locator matches. Falls back to polling when the
+    page navigates away mid-wait, the locator cannot be expressed, or scripts are unavailable.
+    """
+
+    WAIT_SCRIPT = """
+        var query = arguments[0], state = arguments[1], timeoutMs = arguments[2];
+        var done = arguments[arguments.length - 1];
+        function candidates() {
+            if (query.css) {
+                return document.querySelectorAll(query.css);
+            }
+            var result = document.evaluate(query.xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) {
+                nodes.push(result.snapshotItem(i));
+            }
+            return nodes;
+        }
+        function isVisible(element) {
+            var style = window.getComputedStyle(element);
+            if (style.display === 'none' || style.visibility === 'hidden' || parseFloat(style.opacity) === 0) {
+                return false;
+            }
+            var rect = element.getBoundingClientRect();
+            return rect.width > 0 && rect.height > 0;
+        }
+        function match() {
+            var nodes = candidates();
+            for (var i = 0; i < nodes.length; i++) {
+                var node = nodes[i];
+                if (state === 'present') {
+                    return node;
+                }
+                if (isVisible(node) && (state === 'visible' || !node.disabled)) {
+                    return node;
+                }
+            }
+            return null;
+        }
+        var found = match();
+        if (found) {
+            done(found);
+            return;
+        }
+        var finished = false;
+        function check() {
+            if (finished) {
+                return;
+            }
+            var element = match();
+            if (element) {
+                finish(element);
+            }
+        }
+        var observer = new MutationObserver(check);
+        // CSS transitions change visibility without a DOM mutation, so re-check cheaply in-page too
+        var recheck = state === 'present' ? null : setInterval(check, 50);
+        var timer = setTimeout(function() { finish(null); }, timeoutMs);
+        function finish(value) {
+            finished = true;
+            observer.disconnect();
+            clearTimeout(timer);
+            if (recheck) {
+                clearInterval(recheck);
+            }
+            done(value);
+        }
+        observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    """
+
+    def __init__(self, fallback=None):
+        """
+        Args:
+            fallback: Strategy used when the observer cannot be used, defaults to polling
+        """
+        self.fallback = fallback or PollingWaitStrategy()
+
+    def wait_for(self, driver, locator, state, timeout):
+        """
+        Wait for an element to reach a state
+        Args:
+            driver (WebDriver): Driver to wait on
+            locator (tuple): Element locator
+            state (str): 'present', 'visible' or 'clickable'
+            timeout (float): Seconds before TimeoutException is raised
+        Returns:
+            WebElement: The matching element
+        """
+        query = locator_to_query(locator)
+        if query is None or not getattr(driver, "supports_async_scripts", True):
+            return self.fallback.wait_for(driver, locator, state, timeout)
+
+        started = time.monotonic()
+        try:
+            with CommandRecorder.waiting(driver):
+                element = driver.execute_async_script(self.WAIT_SCRIPT, query, state, int(timeout * 1000))
+        except WebDriverException:
+            # Typically the document unloaded while waiting; poll for whatever time is left
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            return self.fallback.wait_for(driver, locator, state, remaining)
+
+        if element is None:
+            raise TimeoutException(f"Element {locator} not {state} after {timeout}s")
+        return element
+
+
+WAIT_STRATEGIES = {
+    "poll": PollingWaitStrategy,
+    "observer": ObserverWaitStrategy,
+}